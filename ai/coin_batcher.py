@@ -0,0 +1,105 @@
+"""
+Micro-batched per-coin CoinGecko lookups for Aura AI Backend
+Coalesces single-coin requests arriving within a short window into batched /coins/markets calls
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from config import Config
+from data_pipeline import OracleDataPipeline, cache
+from deadline import no_deadline, wait_within_deadline
+
+logger = logging.getLogger(__name__)
+
+class CoinBatcher:
+    """Gathers per-coin lookups into one ``/coins/markets`` request per window
+
+    The first lookup that misses the cache opens a window of ``window``
+    seconds; every coin requested until it closes is fetched together (split
+    into concurrent pages past CoinGecko's per-page limit) and each caller
+    gets its own coin back. A lookup for a coin that is already queued or
+    being fetched shares that result instead of asking again. The shared
+    fetch runs outside any one caller's deadline; each caller stops waiting
+    when its own budget runs out.
+    """
+
+    def __init__(self, window: float = Config.COIN_BATCH_WINDOW):
+        self.window = window
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._queued: List[str] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"lookups": 0, "cache_hits": 0, "coalesced": 0, "batches": 0, "coins_fetched": 0}
+
+    @staticmethod
+    def _cache_key(coin_id: str) -> str:
+        return f"coingecko_coin:{coin_id}"
+
+    async def get(self, coin_id: str) -> Optional[Dict]:
+        """Market data for ``coin_id`` in the multi-coin format, or None if CoinGecko has no such coin"""
+        self.stats["lookups"] += 1
+        cached = cache.get(self._cache_key(coin_id))
+        if cached:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = self._futures.get(coin_id)
+        if future is None or future.get_loop() is not loop:
+            future = loop.create_future()
+            self._futures[coin_id] = future
+            if not self._queued:
+                with no_deadline():
+                    task = loop.create_task(self._flush_after_window())
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            self._queued.append(coin_id)
+        else:
+            self.stats["coalesced"] += 1
+
+        # Shielded so one cancelled or timed-out caller does not fail the lookup for the others
+        return await wait_within_deadline(asyncio.shield(future))
+
+    async def _flush_after_window(self):
+        coin_ids: List[str] = []
+        try:
+            await asyncio.sleep(self.window)
+            coin_ids, self._queued = self._queued, []
+
+            try:
+                async with OracleDataPipeline() as pipeline:
+                    # Callers pick the ids, so their lookups only read the live indicators
+                    results = await pipeline.fetch_coingecko_markets(coin_ids, record=False)
+            except Exception as e:
+                logger.error(f"Error fetching batched coin data: {e}")
+                results = {}
+
+            self.stats["batches"] += 1
+            self.stats["coins_fetched"] += len(results)
+            logger.debug(f"Batched lookup for {len(coin_ids)} coins returned {len(results)}")
+
+            for coin_id in coin_ids:
+                coin_data = results.get(coin_id)
+                if coin_data:
+                    cache.set(self._cache_key(coin_id), coin_data)
+                future = self._futures.pop(coin_id, None)
+                if future is not None and not future.done():
+                    future.set_result(coin_data)
+        finally:
+            # Cancelled during the window or the fetch: fail every waiting caller instead of leaving it hanging
+            if not coin_ids:
+                coin_ids, self._queued = self._queued, []
+            for coin_id in coin_ids:
+                future = self._futures.pop(coin_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(RuntimeError("Batched coin lookup was cancelled"))
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "queued": len(self._queued), "window": self.window}
+
+# Global per-coin lookup batcher
+coin_batcher = CoinBatcher()
+
+async def get_batched_coin_data(coin_id: str) -> Optional[Dict]:
+    """Get market data for one coin through the shared lookup batcher"""
+    return await coin_batcher.get(coin_id)
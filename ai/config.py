@@ -15,6 +15,12 @@ class Config:
     # RPC Endpoints
     AVALANCHE_RPC_URL = os.getenv("AVALANCHE_RPC_URL", "https://api.avax.network/ext/bc/C/rpc")
     AVALANCHE_FUJI_RPC_URL = os.getenv("AVALANCHE_FUJI_RPC_URL", "https://api.avax-test.network/ext/bc/C/rpc")
+    RPC_FEE_HISTORY_BLOCKS = int(os.getenv("RPC_FEE_HISTORY_BLOCKS", "20"))
+    RPC_FEE_HISTORY_PERCENTILES = [
+        float(percentile)
+        for percentile in os.getenv("RPC_FEE_HISTORY_PERCENTILES", "25,50,75").split(",")
+        if percentile.strip()
+    ]
     
     # API Configuration
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
@@ -25,9 +31,108 @@ class Config:
     MODEL_RETRAIN_INTERVAL = int(os.getenv("MODEL_RETRAIN_INTERVAL", "3600"))
     VOLATILITY_THRESHOLD = float(os.getenv("VOLATILITY_THRESHOLD", "3.0"))
     BASE_FEE_RATE = float(os.getenv("BASE_FEE_RATE", "0.3"))
+    FEE_BATCH_MAX_ROWS = int(os.getenv("FEE_BATCH_MAX_ROWS", "5000"))
+    TREE_COMPILED_MAX_ROWS = int(os.getenv("TREE_COMPILED_MAX_ROWS", "256"))  # larger inputs use sklearn's predict
+    MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "True").lower() == "true"  # load in the background at startup, else on first use
     
     # Cache Configuration
     CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", "60"))
+    CACHE_SWR_ENABLED = os.getenv("CACHE_SWR_ENABLED", "False").lower() == "true"
+    CACHE_SWR_MAX_STALE = int(os.getenv("CACHE_SWR_MAX_STALE", "300"))
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # "memory" or "sqlite" (shared by all workers on a host)
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "data/shared_cache.db")
+    CACHE_LEASE_TTL = float(os.getenv("CACHE_LEASE_TTL", "15"))
+    CACHE_LEASE_WAIT = float(os.getenv("CACHE_LEASE_WAIT", "5"))
+    CACHE_SQLITE_BUSY_TIMEOUT = float(os.getenv("CACHE_SQLITE_BUSY_TIMEOUT", "0.05"))  # seconds to wait on another worker's write lock
+    
+    # Pyth Hermes price feeds
+    PYTH_HERMES_URL = os.getenv("PYTH_HERMES_URL", "https://hermes.pyth.network")
+    PYTH_SYMBOLS = [
+        symbol.strip().upper()
+        for symbol in os.getenv("PYTH_SYMBOLS", "AVAX/USD,BTC/USD,ETH/USD,SOL/USD").split(",")
+        if symbol.strip()
+    ]
+    PYTH_FEED_REGISTRY_PATH = os.getenv("PYTH_FEED_REGISTRY_PATH", "data/pyth_feeds.json")
+    PYTH_FEED_REGISTRY_TTL = int(os.getenv("PYTH_FEED_REGISTRY_TTL", "86400"))
+    PYTH_STREAM_ENABLED = os.getenv("PYTH_STREAM_ENABLED", "True").lower() == "true"
+    PYTH_STREAM_MAX_AGE = float(os.getenv("PYTH_STREAM_MAX_AGE", "10"))
+    PYTH_STREAM_MAX_BACKOFF = float(os.getenv("PYTH_STREAM_MAX_BACKOFF", "60"))
+    PYTH_STREAM_READ_TIMEOUT = float(os.getenv("PYTH_STREAM_READ_TIMEOUT", "30"))
+    
+    # Incremental indicators fed by live prices (bucketed like the hourly CoinGecko sparkline)
+    STREAMING_INDICATORS_ENABLED = os.getenv("STREAMING_INDICATORS_ENABLED", "True").lower() == "true"
+    STREAMING_BUCKET_SECONDS = float(os.getenv("STREAMING_BUCKET_SECONDS", "3600"))
+    STREAMING_VOLATILITY_WINDOW = int(os.getenv("STREAMING_VOLATILITY_WINDOW", "167"))
+    
+    # Server-sent event streams fed by market snapshots
+    STREAM_ENABLED = os.getenv("STREAM_ENABLED", "True").lower() == "true"
+    STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+    
+    # In-memory per-symbol history used for model features (seconds)
+    TIMESERIES_RESOLUTION = float(os.getenv("TIMESERIES_RESOLUTION", "300"))
+    TIMESERIES_RETENTION = float(os.getenv("TIMESERIES_RETENTION", str(7 * 24 * 3600)))
+    TIMESERIES_MIN_HISTORY = float(os.getenv("TIMESERIES_MIN_HISTORY", "3600"))
+    
+    # Background market snapshot refresher (per-source refresh intervals in seconds)
+    SNAPSHOT_REFRESH_ENABLED = os.getenv("SNAPSHOT_REFRESH_ENABLED", "True").lower() == "true"
+    SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", "900"))
+    SNAPSHOT_INTERVALS = {
+        "coingecko": float(os.getenv("SNAPSHOT_INTERVAL_COINGECKO", "60")),
+        "coingecko_global": float(os.getenv("SNAPSHOT_INTERVAL_COINGECKO_GLOBAL", "300")),
+        "pyth": float(os.getenv("SNAPSHOT_INTERVAL_PYTH", "10")),
+        "network": float(os.getenv("SNAPSHOT_INTERVAL_NETWORK", "15")),
+        "multi_coins": float(os.getenv("SNAPSHOT_INTERVAL_MULTI_COINS", "120"))
+    }
+    
+    # Shared HTTP connection pool
+    HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+    HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "30"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+    
+    # Per-endpoint latency budgets in seconds (longest matching path prefix; 0 means no budget)
+    REQUEST_BUDGET_DEFAULT = float(os.getenv("REQUEST_BUDGET_DEFAULT", "10"))
+    REQUEST_BUDGETS = {
+        "/recommend-fee": float(os.getenv("REQUEST_BUDGET_RECOMMEND_FEE", "3")),
+        "/market-data": float(os.getenv("REQUEST_BUDGET_MARKET_DATA", "4")),
+        "/market-analysis": float(os.getenv("REQUEST_BUDGET_MARKET_ANALYSIS", "5")),
+        "/scan-contract": float(os.getenv("REQUEST_BUDGET_SCAN_CONTRACT", "15")),
+        "/stream": 0.0
+    }
+    
+    # Per-upstream rate limits (requests per second and burst size)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMITS = {
+        "coingecko": float(os.getenv("RATE_LIMIT_COINGECKO", "0.5")),
+        "hermes": float(os.getenv("RATE_LIMIT_HERMES", "3")),
+        "rpc": float(os.getenv("RATE_LIMIT_RPC", "10")),
+        "snowtrace": float(os.getenv("RATE_LIMIT_SNOWTRACE", "2"))
+    }
+    RATE_LIMIT_BURSTS = {
+        "coingecko": float(os.getenv("RATE_LIMIT_BURST_COINGECKO", "5")),
+        "hermes": float(os.getenv("RATE_LIMIT_BURST_HERMES", "10")),
+        "rpc": float(os.getenv("RATE_LIMIT_BURST_RPC", "20")),
+        "snowtrace": float(os.getenv("RATE_LIMIT_BURST_SNOWTRACE", "5"))
+    }
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "2"))
+    RATE_LIMIT_MAX_RETRY_WAIT = float(os.getenv("RATE_LIMIT_MAX_RETRY_WAIT", "10"))
+    RATE_LIMIT_MAX_BACKOFF = float(os.getenv("RATE_LIMIT_MAX_BACKOFF", "60"))
+    
+    # Per-coin CoinGecko lookups arriving within the window share one /coins/markets call
+    COIN_BATCH_WINDOW = float(os.getenv("COIN_BATCH_WINDOW", "0.05"))
+    COINGECKO_MARKETS_PAGE_SIZE = int(os.getenv("COINGECKO_MARKETS_PAGE_SIZE", "250"))
+    # Only these CoinGecko ids feed the live indicators and price history (which are keyed by symbol)
+    TRACKED_COIN_IDS = [
+        coin_id.strip()
+        for coin_id in os.getenv("TRACKED_COIN_IDS", "avalanche-2,bitcoin,ethereum,solana").split(",")
+        if coin_id.strip()
+    ]
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
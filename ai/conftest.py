@@ -0,0 +1,18 @@
+"""
+Shared pytest fixtures for the Aura AI Backend tests
+"""
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+@asynccontextmanager
+async def serve(app):
+    """Run an aiohttp app on a free local port, yielding its base URL (no trailing slash)"""
+    async with TestServer(app) as server:
+        yield str(server.make_url("")).rstrip("/")
+
+@pytest.fixture
+def local_server():
+    """``async with local_server(app) as url`` serves a stand-in upstream for the duration of the block"""
+    return serve
@@ -10,12 +10,15 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import hashlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import subprocess
 import tempfile
 import os
 
 from config import Config
+from http_session import SessionOwner
+from rate_limiter import scheduler
+from deadline import DeadlineExceeded
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -43,12 +46,13 @@ class ContractAnalysis:
     audit_status: str
     recommendation: str
     timestamp: str
+    missing_sources: List[str] = field(default_factory=list)  # lookups that failed or ran out of time
 
-class LaunchpadScanner:
+class LaunchpadScanner(SessionOwner):
     """Main class for scanning and analyzing launchpad contracts"""
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.session = session
         
         # Risk patterns for static analysis
         self.risk_patterns = {
@@ -96,14 +100,6 @@ class LaunchpadScanner:
             }
         }
     
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
     async def fetch_contract_source(self, address: str) -> Optional[Dict]:
         """Fetch contract source code from Snowtrace API"""
         try:
@@ -115,7 +111,7 @@ class LaunchpadScanner:
                 "apikey": Config.SNOWTRACE_API_KEY
             }
             
-            async with self.session.get(url, params=params) as response:
+            async with scheduler.request(self.session, "snowtrace", "GET", url, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
                     
@@ -138,6 +134,8 @@ class LaunchpadScanner:
                     logger.error(f"Snowtrace API error: {response.status}")
                     return None
                     
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching contract source for {address}: {e}")
             return None
@@ -155,7 +153,7 @@ class LaunchpadScanner:
             }
             
             creation_info = {}
-            async with self.session.get(url, params=params) as response:
+            async with scheduler.request(self.session, "snowtrace", "GET", url, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
                     if data["status"] == "1" and data["result"]:
@@ -170,7 +168,7 @@ class LaunchpadScanner:
             }
             
             token_info = {}
-            async with self.session.get(url, params=token_params) as response:
+            async with scheduler.request(self.session, "snowtrace", "GET", url, params=token_params) as response:
                 if response.status == 200:
                     data = await response.json()
                     if data["status"] == "1" and data["result"]:
@@ -181,6 +179,8 @@ class LaunchpadScanner:
                 "token_info": token_info
             }
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching contract info for {address}: {e}")
             return None
@@ -379,9 +379,35 @@ class LaunchpadScanner:
         logger.info(f"Scanning contract: {address}")
         
         try:
-            # Fetch contract data
-            source_data = await self.fetch_contract_source(address)
-            contract_info = await self.fetch_contract_info(address)
+            # Fetch contract data concurrently; contract info is optional
+            source_data, contract_info = await asyncio.gather(
+                self.fetch_contract_source(address), self.fetch_contract_info(address), return_exceptions=True
+            )
+            missing_sources = []
+            if isinstance(contract_info, Exception) or not contract_info:
+                missing_sources.append("contract_info")
+                contract_info = None
+            if isinstance(source_data, DeadlineExceeded):
+                return ContractAnalysis(
+                    address=address,
+                    risk_score=0.5,
+                    flags=[SecurityFlag(
+                        severity="medium",
+                        category="analysis",
+                        description="Source code lookup timed out; contract not analyzed"
+                    )],
+                    contract_type="unknown",
+                    is_verified=False,
+                    has_proxy=False,
+                    owner_privileges=[],
+                    token_economics={},
+                    audit_status="timed_out",
+                    recommendation="UNKNOWN - Scan timed out, retry later",
+                    timestamp=datetime.now().isoformat(),
+                    missing_sources=["source_code"] + missing_sources
+                )
+            if isinstance(source_data, Exception):
+                raise source_data
             
             if not source_data:
                 return ContractAnalysis(
@@ -438,7 +464,8 @@ class LaunchpadScanner:
                 token_economics=token_economics,
                 audit_status="analyzed",
                 recommendation=recommendation,
-                timestamp=datetime.now().isoformat()
+                timestamp=datetime.now().isoformat(),
+                missing_sources=missing_sources
             )
             
         except Exception as e:
@@ -509,7 +536,8 @@ async def scan_contract_address(address: str) -> Dict:
             "owner_privileges": analysis.owner_privileges,
             "token_economics": analysis.token_economics,
             "recommendation": analysis.recommendation,
-            "timestamp": analysis.timestamp
+            "timestamp": analysis.timestamp,
+            "missing_sources": analysis.missing_sources
         }
 
 async def quick_risk_assessment(address: str) -> Dict:
@@ -0,0 +1,148 @@
+"""
+Cross-asset return correlation engine for Aura AI Backend
+Pearson, Spearman and rolling correlations for N coins' sparklines as whole-matrix NumPy operations
+"""
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from indicators import pct_returns, to_price_matrix
+
+logger = logging.getLogger(__name__)
+
+ROLLING_WINDOW = 24  # hourly returns, so one day per window
+MIN_OBSERVATIONS = 10
+
+def aligned_returns(series: Sequence[Optional[Sequence[float]]]) -> np.ndarray:
+    """Percentage returns for each coin restricted to the periods where every coin has one"""
+    returns = pct_returns(to_price_matrix(series))
+    complete = ~np.isnan(returns).any(axis=0)
+    return returns[:, complete]
+
+def pearson_matrix(returns: np.ndarray) -> np.ndarray:
+    """N x N Pearson correlation of the rows of ``returns`` (0 where a coin's returns are constant)"""
+    centered = returns - returns.mean(axis=1, keepdims=True)
+    norms = np.sqrt(np.einsum("ij,ij->i", centered, centered))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matrix = (centered @ centered.T) / np.outer(norms, norms)
+    matrix = np.nan_to_num(matrix)
+    np.fill_diagonal(matrix, 1.0)
+    return np.clip(matrix, -1.0, 1.0)
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """Average ranks along each row, ties sharing the mean of their positions"""
+    order = np.argsort(values, axis=1, kind="mergesort")
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    rows, width = values.shape
+
+    # Start index of each tie group, broadcast to every member of the group
+    new_group = np.ones((rows, width), dtype=bool)
+    new_group[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+    positions = np.broadcast_to(np.arange(width), (rows, width))
+    group_start = np.maximum.accumulate(np.where(new_group, positions, 0), axis=1)
+    # End index: reverse the same trick
+    new_group_end = np.ones((rows, width), dtype=bool)
+    new_group_end[:, :-1] = new_group[:, 1:]
+    group_end = np.minimum.accumulate(np.where(new_group_end, positions, width - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks = np.empty_like(values, dtype=float)
+    np.put_along_axis(ranks, order, (group_start + group_end) / 2.0 + 1, axis=1)
+    return ranks
+
+def spearman_matrix(returns: np.ndarray) -> np.ndarray:
+    """N x N Spearman rank correlation: Pearson over per-coin return ranks"""
+    return pearson_matrix(_ranks(returns))
+
+def rolling_correlation(returns: np.ndarray, reference: int, window: int = ROLLING_WINDOW) -> np.ndarray:
+    """Pearson correlation of every coin against ``returns[reference]`` over each sliding window
+
+    Returns an N x (T - window + 1) array; one row per coin, one column per window end.
+    """
+    if returns.shape[1] < window:
+        return np.empty((len(returns), 0))
+
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window, axis=1)  # N x W x window
+    centered = windows - windows.mean(axis=2, keepdims=True)
+    base = centered[reference]
+    covariance = np.einsum("nwk,wk->nw", centered, base)
+    norms = np.sqrt(np.einsum("nwk,nwk->nw", centered, centered)) * np.sqrt(np.einsum("wk,wk->w", base, base))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = covariance / norms
+    return np.clip(np.nan_to_num(result), -1.0, 1.0)
+
+def correlation_label(value: float) -> str:
+    if value >= 0.3:
+        return "positive"
+    if value <= -0.3:
+        return "negative"
+    return "neutral"
+
+def _fingerprint(coin_ids: List[str], series: List[Sequence[float]]) -> tuple:
+    """Cheap identity of the input: a new sparkline changes its length or end points"""
+    return tuple(
+        (coin_id, len(prices), prices[0] if prices else None, prices[-1] if prices else None)
+        for coin_id, prices in zip(coin_ids, series)
+    )
+
+class CorrelationEngine:
+    """Computes the correlation report for a set of sparklines, reusing it until the inputs change
+
+    Market snapshots are republished every few seconds but the sparklines
+    only change when the multi-coin source is refetched, so the matrices are
+    computed once per distinct multi-coin payload (a few recent payloads
+    are kept so different coin sets do not evict each other).
+    """
+
+    def __init__(self, rolling_window: int = ROLLING_WINDOW, max_reports: int = 8):
+        self.rolling_window = rolling_window
+        self.max_reports = max_reports
+        self._reports: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self.stats = {"computed": 0, "reused": 0}
+
+    def analyze(self, sparklines: Dict[str, Sequence[float]], reference: Optional[str] = None) -> Optional[Dict]:
+        """Correlation report for ``{coin_id: prices}``, or None with too little overlapping data"""
+        coin_ids = [coin_id for coin_id, prices in sparklines.items() if prices]
+        if len(coin_ids) < 2:
+            return None
+
+        series = [list(sparklines[coin_id]) for coin_id in coin_ids]
+        fingerprint = (_fingerprint(coin_ids, series), reference)
+        if fingerprint in self._reports:
+            self._reports.move_to_end(fingerprint)
+            self.stats["reused"] += 1
+            return self._reports[fingerprint]
+
+        returns = aligned_returns(series)
+        if returns.shape[1] < MIN_OBSERVATIONS:
+            logger.debug(f"Only {returns.shape[1]} overlapping returns, skipping correlation matrix")
+            return None
+
+        pearson = pearson_matrix(returns)
+        spearman = spearman_matrix(returns)
+        report = {
+            "coins": coin_ids,
+            "observations": int(returns.shape[1]),
+            "pearson": np.round(pearson, 4).tolist(),
+            "spearman": np.round(spearman, 4).tolist()
+        }
+
+        reference = reference if reference in coin_ids else coin_ids[0]
+        rolling = rolling_correlation(returns, coin_ids.index(reference), self.rolling_window)
+        if rolling.shape[1]:
+            report["rolling"] = {
+                "reference": reference,
+                "window": self.rolling_window,
+                "latest": {coin_id: round(float(rolling[i, -1]), 4) for i, coin_id in enumerate(coin_ids)},
+                "series": {coin_id: np.round(rolling[i], 4).tolist() for i, coin_id in enumerate(coin_ids)}
+            }
+
+        self._reports[fingerprint] = report
+        if len(self._reports) > self.max_reports:
+            self._reports.popitem(last=False)
+        self.stats["computed"] += 1
+        return report
+
+# Global correlation engine
+correlation_engine = CorrelationEngine()
@@ -15,15 +15,18 @@ import time
 import os
 
 from config import Config
+from http_session import SessionOwner
+from rate_limiter import background_priority, scheduler
 
 logger = logging.getLogger(__name__)
 
-class HistoricalDataCollector:
+class HistoricalDataCollector(SessionOwner):
     """Collects historical market data for ML training"""
     
-    def __init__(self, db_path: str = "data/historical_data.db"):
+    def __init__(self, db_path: str = "data/historical_data.db",
+                 session: Optional[aiohttp.ClientSession] = None):
         self.db_path = db_path
-        self.session = None
+        self.session = session
         
         # Create data directory
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -88,14 +91,6 @@ class HistoricalDataCollector:
         
         logger.info("Historical data database initialized")
     
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
     async def collect_historical_coingecko_data(self, 
                                               symbol: str = "avalanche-2", 
                                               days: int = 365) -> List[Dict]:
@@ -116,7 +111,7 @@ class HistoricalDataCollector:
             if Config.COINGECKO_API_KEY:
                 params["x_cg_demo_api_key"] = Config.COINGECKO_API_KEY
             
-            async with self.session.get(url, params=params) as response:
+            async with scheduler.request(self.session, "coingecko", "GET", url, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
                     
@@ -424,8 +419,9 @@ class HistoricalDataCollector:
         """Collect and store all historical data"""
         logger.info("Starting comprehensive data collection...")
         
-        # Collect market data
-        market_data = await self.collect_historical_coingecko_data(days=days)
+        # Collect market data (backfills yield to interactive requests)
+        with background_priority():
+            market_data = await self.collect_historical_coingecko_data(days=days)
         self.store_market_data(market_data)
         
         # Collect network data
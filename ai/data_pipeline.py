@@ -5,60 +5,428 @@ Integrates with Pyth, CoinGecko, and Avalanche RPC
 import aiohttp
 import asyncio
 import time
-from typing import Dict, Optional, List
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional, List, Tuple
 import json
 import logging
 from datetime import datetime, timedelta
 
 from config import Config
+from http_session import SessionOwner
+from pyth_feeds import feed_registry, fetch_latest_prices
+from pyth_stream import price_stream
+from rate_limiter import background_priority, scheduler
+from deadline import DeadlineExceeded, no_deadline, wait_within_deadline
+from shared_cache import create_cache_backend
+from indicators import compute_indicators
+from streaming_indicators import streaming_indicators
+from timeseries import timeseries_store
+from derived_analytics import AnalyticsStage
+from correlation import correlation_engine, correlation_label
+from rpc_client import JsonRpcBatchClient, JsonRpcError, hex_to_int
+
+# Pairwise correlation entries are listed for at most this many coins; the matrix covers all of them
+MAX_PAIR_COINS = 20
 
 # Setup logging
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL), format=Config.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 class DataCache:
-    """Simple in-memory cache for API responses"""
-    def __init__(self, ttl: int = Config.CACHE_TTL):
-        self.cache = {}
+    """Bounded in-memory LRU cache with TTL expiry for API responses
+
+    Keys are namespaced as ``"<namespace>:<id>"`` (keys without a colon are
+    their own namespace) so hit/miss/eviction counters can be reported per
+    upstream source. With a non-zero ``max_stale`` expired entries are kept
+    for that many extra seconds so they can be served stale-while-revalidate.
+    An optional shared ``backend`` is written through on every set and read
+    when the local copy is missing or expired, so one worker's fetch serves
+    every worker on the host.
+    """
+    def __init__(self, ttl: int = Config.CACHE_TTL,
+                 max_entries: int = Config.CACHE_MAX_ENTRIES,
+                 max_bytes: int = Config.CACHE_MAX_BYTES,
+                 sweep_interval: int = Config.CACHE_SWEEP_INTERVAL,
+                 max_stale: int = Config.CACHE_SWR_MAX_STALE if Config.CACHE_SWR_ENABLED else 0,
+                 backend=None):
+        self.cache = OrderedDict()  # key -> (value, timestamp, size)
+        self.backend = backend
         self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.total_bytes = 0
+        self._last_sweep = time.time()
+        self._backend_sweep_cutoff: Optional[float] = None  # pending shared-backend sweep, run outside the lock
+        self._lock = threading.RLock()
+        self._stats = defaultdict(lambda: {"hits": 0, "stale_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "expirations": 0})
+    
+    @staticmethod
+    def _namespace(key: str) -> str:
+        return key.split(":", 1)[0]
+    
+    @staticmethod
+    def _serialize(value) -> Tuple[Optional[str], int]:
+        """JSON text of a cached value (None if not serializable) and its approximate size in bytes"""
+        try:
+            payload = json.dumps(value, default=str)
+            return payload, len(payload)
+        except (TypeError, ValueError):
+            return None, sys.getsizeof(value)
+    
+    def _remove(self, key: str, reason: str):
+        _, _, size = self.cache.pop(key)
+        self.total_bytes -= size
+        self._stats[self._namespace(key)][reason] += 1
+    
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+    
+    def _sweep(self, now: float):
+        max_age = self.ttl + self.max_stale
+        expired = [key for key, (_, timestamp, _) in self.cache.items() if now - timestamp >= max_age]
+        for key in expired:
+            self._remove(key, "expirations")
+        self._last_sweep = now
+        if self.backend is not None:
+            self._backend_sweep_cutoff = now - max_age
+        if expired:
+            logger.debug(f"Cache sweep removed {len(expired)} expired entries")
+    
+    def _sweep_backend(self):
+        """Apply a sweep recorded under the lock to the shared backend; called without the lock held"""
+        cutoff, self._backend_sweep_cutoff = self._backend_sweep_cutoff, None
+        if cutoff is not None:
+            self.backend.delete_older_than(cutoff)
+    
+    def sweep(self) -> int:
+        """Drop every expired entry, returning the number removed"""
+        with self._lock:
+            before = len(self.cache)
+            self._sweep(time.time())
+            removed = before - len(self.cache)
+        self._sweep_backend()
+        return removed
     
     def get(self, key: str):
-        if key in self.cache:
-            data, timestamp = self.cache[key]
-            if time.time() - timestamp < self.ttl:
-                return data
-            else:
-                del self.cache[key]
-        return None
+        data, is_fresh = self.lookup(key)
+        return data if is_fresh else None
+    
+    def lookup(self, key: str, allow_stale: bool = False) -> Tuple[Optional[object], bool]:
+        """Return ``(value, is_fresh)``; stale values are only returned when allowed"""
+        with self._lock:
+            now = time.time()
+            self._maybe_sweep(now)
+            entry = self.cache.get(key)
+        
+        if self.backend is not None and (entry is None or now - entry[1] >= self.ttl):
+            self._load_shared(key, now)
+            self._sweep_backend()
+        
+        with self._lock:
+            stats = self._stats[self._namespace(key)]
+            entry = self.cache.get(key)
+            if entry is not None:
+                data, timestamp, _ = entry
+                age = now - timestamp
+                if age < self.ttl:
+                    self.cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return data, True
+                if age < self.ttl + self.max_stale:
+                    if allow_stale:
+                        self.cache.move_to_end(key)
+                        stats["stale_hits"] += 1
+                        return data, False
+                else:
+                    self._remove(key, "expirations")
+            
+            stats["misses"] += 1
+            return None, False
+    
+    def get_recent(self, key: str, max_age: float):
+        """Return the cached value only if it was stored less than ``max_age`` seconds ago"""
+        with self._lock:
+            now = time.time()
+            entry = self.cache.get(key)
+        
+        if self.backend is not None and (entry is None or now - entry[1] >= max_age):
+            self._load_shared(key, now)
+            self._sweep_backend()
+        
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None and now - entry[1] < max_age:
+                return entry[0]
+            return None
+    
+    def _load_shared(self, key: str, now: float):
+        """Adopt the shared backend's entry for ``key`` if it is newer than the local one
+        
+        Called without ``self._lock`` held: the backend read (and a wait on
+        another worker's write) must not block this process's other lookups.
+        """
+        row = self.backend.get(key)
+        if row is None or now - row[1] >= self.ttl + self.max_stale:
+            return
+        payload, stored_at = row
+        
+        try:
+            value = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring undecodable shared cache entry for {key}")
+            return
+        
+        with self._lock:
+            # Another caller may have stored a newer value meanwhile
+            local = self.cache.get(key)
+            if local is not None and local[1] >= stored_at:
+                return
+            self._store(key, value, stored_at, len(payload))
+            self._stats[self._namespace(key)]["shared_hits"] += 1
     
     def set(self, key: str, value):
-        self.cache[key] = (value, time.time())
+        with self._lock:
+            now = time.time()
+            payload, size = self._serialize(value)
+            
+            if size > self.max_bytes:
+                logger.warning(f"Not caching {key}: {size} bytes exceeds cache byte budget")
+                return
+            
+            self._store(key, value, now, size)
+        
+        if self.backend is not None:
+            if payload is not None:
+                self.backend.set(key, payload, now)
+            self._sweep_backend()
+    
+    def _store(self, key: str, value, timestamp: float, size: int):
+        """Insert into the local LRU without writing through to the shared backend"""
+        if size > self.max_bytes:
+            return
+        
+        if key in self.cache:
+            _, _, old_size = self.cache.pop(key)
+            self.total_bytes -= old_size
+        
+        self.cache[key] = (value, timestamp, size)
+        self.total_bytes += size
+        
+        self._maybe_sweep(time.time())
+        
+        # Evict least recently used entries until back within budget
+        while len(self.cache) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest_key = next(iter(self.cache))
+            self._remove(oldest_key, "evictions")
+    
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self.total_bytes = 0
+            if self.backend is not None:
+                self.backend.clear()
+    
+    def try_lease(self, key: str) -> bool:
+        """Claim the cross-worker right to fetch ``key``; always granted without a shared backend"""
+        return self.backend is None or self.backend.try_lease(key)
+    
+    def release_lease(self, key: str):
+        if self.backend is not None:
+            self.backend.release_lease(key)
+    
+    def get_stats(self) -> Dict:
+        """Cache occupancy plus per-namespace hit/miss/eviction counters"""
+        with self._lock:
+            entries_by_namespace = defaultdict(int)
+            for key in self.cache:
+                entries_by_namespace[self._namespace(key)] += 1
+            
+            namespaces = {}
+            for namespace in set(self._stats) | set(entries_by_namespace):
+                counters = dict(self._stats[namespace])
+                lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+                counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+                counters["entries"] = entries_by_namespace.get(namespace, 0)
+                namespaces[namespace] = counters
+            
+            return {
+                "entries": len(self.cache),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "max_stale": self.max_stale,
+                "backend": self.backend.get_stats() if self.backend is not None else {"backend": "memory"},
+                "namespaces": namespaces
+            }
 
-# Global cache instance
-cache = DataCache()
+class SingleFlight:
+    """Coalesces concurrent fetches for the same key into one upstream request
 
-class OracleDataPipeline:
-    """Main class for fetching real-time market data"""
-    
+    The first caller for a key starts the fetch as a task; callers arriving
+    while it is running await the same task and share its result. The task
+    is shielded so a cancelled caller does not abort the fetch for the rest.
+    """
     def __init__(self):
-        self.session = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"flights": 0, "coalesced": 0}
     
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
+    async def do(self, key: str, fetch):
+        """Result of the shared fetch, waited for no longer than the caller's request deadline"""
+        return await wait_within_deadline(asyncio.shield(self.start(key, fetch)))
     
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+    def start(self, key: str, fetch) -> asyncio.Task:
+        """Start the fetch for ``key`` unless one is already running, returning its task
+        
+        The fetch runs outside the starting caller's deadline: other callers
+        share it, and one that finishes late still fills the cache.
+        """
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            with no_deadline():
+                task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.stats["flights"] += 1
+        else:
+            self.stats["coalesced"] += 1
+            logger.debug(f"Joining in-flight fetch for {key}")
+        
+        return task
     
-    async def fetch_coingecko_data(self, coin_id: str = "avalanche-2") -> Optional[Dict]:
-        """Fetch comprehensive live market data from CoinGecko API"""
-        cache_key = f"coingecko_{coin_id}"
-        cached_data = cache.get(cache_key)
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, "in_flight": len(self._inflight)}
+
+# Global cache and in-flight request registry
+cache = DataCache(backend=create_cache_backend())
+inflight = SingleFlight()
+
+# Global derived analytics stage (indicators, cross-asset analysis, regime, sentiment)
+analytics_stage = AnalyticsStage()
+
+# Pyth ticks keep the live indicators moving between CoinGecko fetches
+price_stream.add_listener(streaming_indicators.on_price_update)
+price_stream.add_listener(timeseries_store.on_price_update)
+
+class FetchPlan:
+    """The market sources a response needs, each fetched once and all concurrently
+
+    Plans combine with ``|`` so composite endpoints can merge the needs of
+    their parts; a source named twice is still fetched once, and concurrent
+    plans share in-flight fetches through the single-flight registry.
+    """
+    
+    def __init__(self, *sources: str):
+        self.sources = tuple(dict.fromkeys(sources))
+    
+    def __or__(self, other: "FetchPlan") -> "FetchPlan":
+        return FetchPlan(*self.sources, *other.sources)
+    
+    async def run(self, pipeline: "OracleDataPipeline") -> Dict[str, Optional[object]]:
+        """Fetch every source through ``pipeline``; a failed or late source maps to None
+        
+        Under a request deadline each source is waited for only until the
+        deadline, so the plan returns with whatever finished in time.
+        """
+        results = await asyncio.gather(*[pipeline.fetch_source(name) for name in self.sources], return_exceptions=True)
+        sources = {}
+        for name, result in zip(self.sources, results):
+            if isinstance(result, DeadlineExceeded):
+                logger.warning(f"Source {name} missed the request deadline")
+                result = None
+            elif isinstance(result, Exception):
+                logger.warning(f"Source {name} failed: {result}")
+                result = None
+            sources[name] = result
+        return sources
+
+class OracleDataPipeline(SessionOwner):
+    """Main class for fetching real-time market data"""
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.session = session
+    
+    async def _cached_fetch(self, cache_key: str, fetcher, *args):
+        """Serve from cache, otherwise join (or lead) the single upstream fetch for this key
+
+        In stale-while-revalidate mode an expired entry younger than the
+        max-staleness cutoff is returned immediately while a background
+        refresh runs; past the cutoff callers wait for the refresh.
+        """
+        cached_data, is_fresh = cache.lookup(cache_key, allow_stale=True)
+        if cached_data and is_fresh:
+            logger.debug(f"Using cached data for {cache_key}")
+            return cached_data
+        
         if cached_data:
-            logger.debug(f"Using cached CoinGecko data for {coin_id}")
+            logger.debug(f"Serving stale data for {cache_key} while revalidating")
+            inflight.start(cache_key, lambda: self._revalidate(cache_key, fetcher, *args))
             return cached_data
         
+        async def fetch():
+            # A flight that finished just before this one started may already have filled the cache
+            cached_data = cache.get(cache_key)
+            if cached_data:
+                return cached_data
+            return await self._leased_fetch(cache_key, fetcher, *args, max_age=cache.ttl)
+        
+        return await inflight.do(cache_key, fetch)
+    
+    async def _leased_fetch(self, cache_key: str, fetcher, *args, max_age: Optional[float] = None):
+        """Call the upstream fetcher unless another worker is already fetching ``cache_key``
+
+        With a shared cache backend only the worker holding the key's lease
+        fetches; the others poll the shared cache for its result (anything
+        younger than ``max_age``, or stored after they started waiting) and
+        fall back to fetching themselves if the lease holder takes too long.
+        """
+        started = time.time()
+        while not cache.try_lease(cache_key):
+            await asyncio.sleep(0.1)
+            shared = cache.get_recent(cache_key, max_age if max_age is not None else time.time() - started)
+            if shared:
+                logger.debug(f"Using {cache_key} fetched by another worker")
+                return shared
+            if time.time() - started >= Config.CACHE_LEASE_WAIT:
+                logger.warning(f"Timed out waiting for another worker to fetch {cache_key}, fetching directly")
+                break
+        
+        try:
+            if max_age is not None:
+                # The previous lease holder may have finished between our cache check and taking the lease
+                shared = cache.get_recent(cache_key, max_age)
+                if shared:
+                    return shared
+            return await fetcher(cache_key, *args)
+        finally:
+            cache.release_lease(cache_key)
+    
+    @staticmethod
+    async def _revalidate(cache_key: str, fetcher, *args):
+        """Background refresh on its own pipeline so it outlives the request that triggered it"""
+        try:
+            with background_priority():
+                async with OracleDataPipeline() as pipeline:
+                    return await pipeline._leased_fetch(cache_key, fetcher.__func__.__get__(pipeline), *args)
+        except Exception as e:
+            logger.warning(f"Background revalidation of {cache_key} failed: {e}")
+            return None
+    
+    async def fetch_coingecko_data(self, coin_id: str = "avalanche-2") -> Optional[Dict]:
+        """Fetch comprehensive live market data from CoinGecko API"""
+        return await self._cached_fetch(f"coingecko:{coin_id}", self._fetch_coingecko_data, coin_id)
+    
+    async def _fetch_coingecko_data(self, cache_key: str, coin_id: str) -> Optional[Dict]:
+        """Fetch comprehensive live market data from CoinGecko API"""
         try:
             url = f"{Config.COINGECKO_BASE_URL}/coins/{coin_id}"
             headers = {
@@ -78,7 +446,7 @@ class OracleDataPipeline:
             if Config.COINGECKO_API_KEY:
                 headers["x-cg-demo-api-key"] = Config.COINGECKO_API_KEY
             
-            async with self.session.get(url, params=params, headers=headers) as response:
+            async with scheduler.request(self.session, "coingecko", "GET", url, params=params, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
                     market_data_raw = data.get("market_data", {})
@@ -86,6 +454,7 @@ class OracleDataPipeline:
                     # Extract comprehensive market data
                     market_data = {
                         # Basic price data
+                        "symbol": data.get("symbol", "").upper(),
                         "price_usd": market_data_raw.get("current_price", {}).get("usd", 0),
                         "price_change_1h": market_data_raw.get("price_change_percentage_1h", 0),
                         "price_change_24h": market_data_raw.get("price_change_percentage_24h", 0),
@@ -111,8 +480,7 @@ class OracleDataPipeline:
                         
                         # Technical indicators
                         "volatility": abs(market_data_raw.get("price_change_percentage_24h", 0)),
-                        "price_volatility_7d": self._calculate_price_volatility(market_data_raw.get("sparkline_7d", {}).get("price", [])),
-                        "rsi_14": self._calculate_rsi(market_data_raw.get("sparkline_7d", {}).get("price", [])),
+                        **compute_indicators({coin_id: market_data_raw.get("sparkline_7d", {}).get("price", [])})[coin_id],
                         "volume_to_market_cap": self._calculate_volume_ratio(
                             market_data_raw.get("total_volume", {}).get("usd", 0),
                             market_data_raw.get("market_cap", {}).get("usd", 0)
@@ -134,6 +502,13 @@ class OracleDataPipeline:
                         "data_source": "coingecko"
                     }
                     
+                    # Keep the live indicators current and prefer them once warmed up
+                    if coin_id in Config.TRACKED_COIN_IDS:
+                        streaming_indicators.observe(market_data["symbol"], market_data["price_usd"],
+                                                     market_data_raw.get("sparkline_7d", {}).get("price", []))
+                        market_data = streaming_indicators.overlay(market_data)
+                        self._record_history(market_data)
+                    
                     # Add derived metrics
                     market_data.update(self._calculate_derived_metrics(market_data))
                     
@@ -152,62 +527,6 @@ class OracleDataPipeline:
             logger.error(f"Error fetching CoinGecko data: {e}")
             return self._get_fallback_coingecko_data()
     
-    def _calculate_price_volatility(self, price_data: List[float]) -> float:
-        """Calculate price volatility from sparkline data"""
-        if not price_data or len(price_data) < 2:
-            return 0.0
-        
-        try:
-            import numpy as np
-            returns = [((price_data[i] - price_data[i-1]) / price_data[i-1]) * 100 
-                      for i in range(1, len(price_data)) if price_data[i-1] != 0]
-            return float(np.std(returns)) if returns else 0.0
-        except:
-            # Fallback calculation without numpy
-            if len(price_data) < 2:
-                return 0.0
-            returns = [((price_data[i] - price_data[i-1]) / price_data[i-1]) * 100 
-                      for i in range(1, len(price_data)) if price_data[i-1] != 0]
-            if not returns:
-                return 0.0
-            mean_return = sum(returns) / len(returns)
-            variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-            return variance ** 0.5
-    
-    def _calculate_rsi(self, price_data: List[float], period: int = 14) -> float:
-        """Calculate RSI (Relative Strength Index)"""
-        if not price_data or len(price_data) < period + 1:
-            return 50.0  # Neutral RSI
-        
-        try:
-            gains = []
-            losses = []
-            
-            for i in range(1, len(price_data)):
-                change = price_data[i] - price_data[i-1]
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-            
-            if len(gains) < period:
-                return 50.0
-            
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-            
-            if avg_loss == 0:
-                return 100.0
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return max(0, min(100, rsi))
-            
-        except:
-            return 50.0
-    
     def _calculate_volume_ratio(self, volume_24h: float, market_cap: float) -> float:
         """Calculate volume to market cap ratio"""
         if market_cap == 0:
@@ -289,12 +608,41 @@ class OracleDataPipeline:
         if coin_ids is None:
             coin_ids = ["avalanche-2", "bitcoin", "ethereum", "solana"]
         
-        cache_key = f"coingecko_multi_{'-'.join(coin_ids)}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.debug("Using cached CoinGecko multi-coin data")
-            return cached_data
+        cache_key = f"coingecko_multi:{'-'.join(coin_ids)}"
+        return await self._cached_fetch(cache_key, self._fetch_coingecko_multi_coins, coin_ids)
+    
+    async def _fetch_coingecko_multi_coins(self, cache_key: str, coin_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch data for multiple coins efficiently using batch API"""
+        multi_coin_data = await self.fetch_coingecko_markets(coin_ids)
+        if multi_coin_data:
+            cache.set(cache_key, multi_coin_data)
+            logger.info(f"Fetched multi-coin data for {len(multi_coin_data)} coins")
+        return multi_coin_data
+    
+    async def fetch_coingecko_markets(self, coin_ids: List[str], record: bool = True) -> Dict[str, Dict]:
+        """Uncached ``/coins/markets`` lookup for any number of coins
         
+        Id lists longer than CoinGecko's per-page limit are split into
+        pages that are fetched concurrently; indicators are then computed
+        in one vectorized pass over every returned coin. With ``record``,
+        tracked coins also feed the live indicators and price history.
+        """
+        page_size = Config.COINGECKO_MARKETS_PAGE_SIZE
+        pages = [coin_ids[i:i + page_size] for i in range(0, len(coin_ids), page_size)]
+        results = await asyncio.gather(*(self._fetch_markets_page(page) for page in pages))
+        coins = [coin for page in results for coin in page]
+        
+        coin_indicators = compute_indicators({
+            coin.get("id", "unknown"): coin.get("sparkline_in_7d", {}).get("price", [])
+            for coin in coins
+        })
+        return {
+            coin.get("id", "unknown"): self._parse_markets_coin(coin, coin_indicators[coin.get("id", "unknown")], record)
+            for coin in coins
+        }
+    
+    async def _fetch_markets_page(self, coin_ids: List[str]) -> List[Dict]:
+        """Raw ``/coins/markets`` rows for one page of coin ids (empty on error)"""
         try:
             url = f"{Config.COINGECKO_BASE_URL}/coins/markets"
             headers = {
@@ -315,64 +663,70 @@ class OracleDataPipeline:
             if Config.COINGECKO_API_KEY:
                 headers["x-cg-demo-api-key"] = Config.COINGECKO_API_KEY
             
-            async with self.session.get(url, params=params, headers=headers) as response:
+            async with scheduler.request(self.session, "coingecko", "GET", url, params=params, headers=headers) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    
-                    multi_coin_data = {}
-                    for coin in data:
-                        coin_id = coin.get("id", "unknown")
-                        multi_coin_data[coin_id] = {
-                            "symbol": coin.get("symbol", "").upper(),
-                            "name": coin.get("name", ""),
-                            "price_usd": coin.get("current_price", 0),
-                            "price_change_1h": coin.get("price_change_percentage_1h", 0),
-                            "price_change_24h": coin.get("price_change_percentage_24h", 0),
-                            "price_change_7d": coin.get("price_change_percentage_7d", 0),
-                            "price_change_30d": coin.get("price_change_percentage_30d", 0),
-                            "volume_24h": coin.get("total_volume", 0),
-                            "market_cap": coin.get("market_cap", 0),
-                            "market_cap_rank": coin.get("market_cap_rank", 0),
-                            "high_24h": coin.get("high_24h", 0),
-                            "low_24h": coin.get("low_24h", 0),
-                            "circulating_supply": coin.get("circulating_supply", 0),
-                            "total_supply": coin.get("total_supply", 0),
-                            "max_supply": coin.get("max_supply", 0),
-                            "ath": coin.get("ath", 0),
-                            "ath_change_percentage": coin.get("ath_change_percentage", 0),
-                            "volatility": abs(coin.get("price_change_percentage_24h", 0)),
-                            "volume_to_market_cap": self._calculate_volume_ratio(
-                                coin.get("total_volume", 0),
-                                coin.get("market_cap", 0)
-                            ),
-                            "price_volatility_7d": self._calculate_price_volatility(
-                                coin.get("sparkline_in_7d", {}).get("price", [])
-                            ),
-                            "last_updated": coin.get("last_updated", ""),
-                            "timestamp": datetime.now().isoformat(),
-                            "data_source": "coingecko_markets"
-                        }
-                    
-                    cache.set(cache_key, multi_coin_data)
-                    logger.info(f"Fetched multi-coin data for {len(multi_coin_data)} coins")
-                    return multi_coin_data
-                    
-                else:
-                    logger.error(f"CoinGecko markets API error: {response.status}")
-                    return {}
+                    return await response.json()
+                
+                logger.error(f"CoinGecko markets API error: {response.status}")
+                return []
                     
         except Exception as e:
             logger.error(f"Error fetching multi-coin data: {e}")
-            return {}
+            return []
+    
+    def _parse_markets_coin(self, coin: Dict, indicators: Dict, record: bool = True) -> Dict:
+        """One ``/coins/markets`` row in the pipeline's coin data format, with live indicators overlaid"""
+        coin_data = {
+            "symbol": coin.get("symbol", "").upper(),
+            "name": coin.get("name", ""),
+            "price_usd": coin.get("current_price", 0),
+            "price_change_1h": coin.get("price_change_percentage_1h", 0),
+            "price_change_24h": coin.get("price_change_percentage_24h", 0),
+            "price_change_7d": coin.get("price_change_percentage_7d", 0),
+            "price_change_30d": coin.get("price_change_percentage_30d", 0),
+            "volume_24h": coin.get("total_volume", 0),
+            "market_cap": coin.get("market_cap", 0),
+            "market_cap_rank": coin.get("market_cap_rank", 0),
+            "high_24h": coin.get("high_24h", 0),
+            "low_24h": coin.get("low_24h", 0),
+            "circulating_supply": coin.get("circulating_supply", 0),
+            "total_supply": coin.get("total_supply", 0),
+            "max_supply": coin.get("max_supply", 0),
+            "ath": coin.get("ath", 0),
+            "ath_change_percentage": coin.get("ath_change_percentage", 0),
+            "volatility": abs(coin.get("price_change_percentage_24h", 0)),
+            "volume_to_market_cap": self._calculate_volume_ratio(
+                coin.get("total_volume", 0),
+                coin.get("market_cap", 0)
+            ),
+            **indicators,
+            "sparkline_7d": coin.get("sparkline_in_7d", {}).get("price", []),
+            "last_updated": coin.get("last_updated", ""),
+            "timestamp": datetime.now().isoformat(),
+            "data_source": "coingecko_markets"
+        }
+        # Live state is keyed by symbol, which any coin can share: only tracked ids may touch it
+        if coin.get("id") not in Config.TRACKED_COIN_IDS:
+            return coin_data
+        if record:
+            streaming_indicators.observe(coin_data["symbol"], coin_data["price_usd"], coin_data["sparkline_7d"])
+        coin_data = streaming_indicators.overlay(coin_data)
+        if record:
+            self._record_history(coin_data)
+        return coin_data
+    
+    @staticmethod
+    def _record_history(coin_data: Dict):
+        """Append a fetched coin's price, volume and volatility to its in-memory history"""
+        timeseries_store.record(coin_data.get("symbol"), price=coin_data.get("price_usd") or None,
+                                volume=coin_data.get("volume_24h") or None, volatility=coin_data.get("volatility"))
     
     async def fetch_coingecko_global_data(self) -> Optional[Dict]:
         """Fetch global cryptocurrency market data"""
-        cache_key = "coingecko_global"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.debug("Using cached CoinGecko global data")
-            return cached_data
-        
+        return await self._cached_fetch("coingecko_global", self._fetch_coingecko_global_data)
+    
+    async def _fetch_coingecko_global_data(self, cache_key: str) -> Optional[Dict]:
+        """Fetch global cryptocurrency market data"""
         try:
             url = f"{Config.COINGECKO_BASE_URL}/global"
             headers = {
@@ -383,7 +737,7 @@ class OracleDataPipeline:
             if Config.COINGECKO_API_KEY:
                 headers["x-cg-demo-api-key"] = Config.COINGECKO_API_KEY
             
-            async with self.session.get(url, headers=headers) as response:
+            async with scheduler.request(self.session, "coingecko", "GET", url, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
                     global_data_raw = data.get("data", {})
@@ -437,186 +791,296 @@ class OracleDataPipeline:
 
     async def fetch_pyth_price_data(self, symbol: str = "AVAX/USD") -> Optional[Dict]:
         """Fetch real-time price data from Pyth Network using modern v2 API"""
-        cache_key = f"pyth_{symbol}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.debug(f"Using cached Pyth data for {symbol}")
-            return cached_data
+        symbol = symbol.upper()
+        streamed = price_stream.get_price(symbol)
+        if streamed:
+            return streamed
+        return await self._cached_fetch(f"pyth:{symbol}", self._fetch_pyth_price_data, symbol)
+    
+    async def _fetch_pyth_price_data(self, cache_key: str, symbol: str) -> Optional[Dict]:
+        """Fetch one Pyth price; the configured symbols ride along in the same batch request"""
+        streamed = price_stream.get_price(symbol)
+        if streamed:
+            return streamed
+        
+        prices = await self._fetch_pyth_batch([symbol] + Config.PYTH_SYMBOLS)
+        pyth_data = prices.get(symbol)
+        if not pyth_data:
+            logger.error(f"{symbol} price not available from Pyth")
+        return pyth_data
+    
+    async def fetch_pyth_multi_prices(self, symbols: List[str] = None) -> Dict[str, Dict]:
+        """Fetch Pyth prices for many symbols, requesting only the uncached ones in a single batch"""
+        symbols = [symbol.upper() for symbol in (symbols or Config.PYTH_SYMBOLS)]
+        
+        prices = {}
+        missing = []
+        for symbol in symbols:
+            cached_data = price_stream.get_price(symbol) or cache.get(f"pyth:{symbol}")
+            if cached_data:
+                prices[symbol] = cached_data
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            batch_key = f"pyth_batch:{','.join(sorted(missing))}"
+            fetched = await inflight.do(batch_key, lambda: self._fetch_pyth_batch(missing))
+            prices.update({symbol: fetched[symbol] for symbol in missing if symbol in fetched})
         
+        return prices
+    
+    async def _fetch_pyth_batch(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Resolve feed ids from the cached registry and fetch all prices in one ``ids[]`` request"""
         try:
-            # Step 1: Get AVAX price feed ID from the v2/price_feeds endpoint
-            feeds_url = "https://hermes.pyth.network/v2/price_feeds"
-            params = {
-                "query": "AVAX",
-                "asset_type": "crypto"
-            }
+            symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+            feeds = await feed_registry.resolve(self.session, symbols)
+            
+            unknown = [symbol for symbol in symbols if symbol not in feeds]
+            if unknown:
+                logger.warning(f"No Pyth price feed found for: {', '.join(unknown)}")
+            
+            prices = await fetch_latest_prices(self.session, feeds)
+            for symbol, pyth_data in prices.items():
+                cache.set(f"pyth:{symbol}", pyth_data)
+            
+            if prices:
+                logger.info(f"Fetched Pyth prices for {len(prices)} feeds: " + ", ".join(
+                    f"{symbol} ${data['price']:.4f}" for symbol, data in prices.items()
+                ))
+            return prices
             
-            async with self.session.get(feeds_url, params=params) as response:
-                if response.status == 200:
-                    feeds = await response.json()
-                    
-                    # Find AVAX/USD feed
-                    avax_feed = None
-                    for feed in feeds:
-                        attrs = feed.get("attributes", {})
-                        base = attrs.get("base", "").upper()
-                        quote = attrs.get("quote_currency", "").upper()
-                        if "AVAX" in base and "USD" in quote:
-                            avax_feed = feed
-                            break
-                    
-                    if not avax_feed:
-                        logger.error("AVAX/USD feed not found in Pyth price feeds")
-                        return None
-                    
-                    feed_id = avax_feed["id"]
-                    
-                    # Step 2: Get latest price data using the feed ID
-                    price_url = "https://hermes.pyth.network/v2/updates/price/latest"
-                    price_params = {
-                        "ids[]": feed_id,
-                        "encoding": "hex"
-                    }
-                    
-                    async with self.session.get(price_url, params=price_params) as price_response:
-                        if price_response.status == 200:
-                            price_data = await price_response.json()
-                            
-                            if price_data and "parsed" in price_data and len(price_data["parsed"]) > 0:
-                                parsed_feed = price_data["parsed"][0]
-                                price_info = parsed_feed["price"]
-                                
-                                price = int(price_info["price"])
-                                expo = int(price_info["expo"])
-                                confidence = int(price_info["conf"])
-                                
-                                # Calculate actual price (Pyth prices use scaled integers)
-                                actual_price = price * (10 ** expo)
-                                confidence_interval = confidence * (10 ** expo)
-                                
-                                pyth_data = {
-                                    "symbol": symbol,
-                                    "price": actual_price,
-                                    "confidence": confidence_interval,
-                                    "confidence_ratio": confidence_interval / abs(actual_price) if actual_price != 0 else 0,
-                                    "publish_time": price_info["publish_time"],
-                                    "feed_id": feed_id,
-                                    "base": avax_feed["attributes"].get("base", "AVAX"),
-                                    "quote": avax_feed["attributes"].get("quote_currency", "USD"),
-                                    "timestamp": datetime.now().isoformat()
-                                }
-                                
-                                cache.set(cache_key, pyth_data)
-                                logger.info(f"Fetched Pyth data for {symbol}: ${actual_price:.4f} (±{confidence_interval:.4f})")
-                                return pyth_data
-                            else:
-                                logger.error("No parsed price data in Pyth response")
-                                return None
-                        else:
-                            logger.error(f"Pyth price API error: {price_response.status}")
-                            return None
-                else:
-                    logger.error(f"Pyth feeds API error: {response.status}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"Error fetching Pyth data: {e}")
-            return None
+            return {}
     
     async def fetch_avalanche_network_stats(self) -> Optional[Dict]:
         """Fetch Avalanche network statistics via RPC"""
-        cache_key = "avalanche_stats"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.debug("Using cached Avalanche network stats")
-            return cached_data
-        
+        return await self._cached_fetch("avalanche_stats", self._fetch_avalanche_network_stats)
+    
+    async def _fetch_avalanche_network_stats(self, cache_key: str) -> Optional[Dict]:
+        """Fetch block number, gas price, fee history and the latest block in one batched RPC request"""
         try:
-            # Fetch basic network info
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "eth_blockNumber",
-                "params": [],
-                "id": 1
-            }
+            client = JsonRpcBatchClient(self.session)
+            block_number, gas_price, fee_history, latest_block = await client.batch([
+                ("eth_blockNumber", []),
+                ("eth_gasPrice", []),
+                ("eth_feeHistory", [hex(Config.RPC_FEE_HISTORY_BLOCKS), "latest", Config.RPC_FEE_HISTORY_PERCENTILES]),
+                ("eth_getBlockByNumber", ["latest", False])
+            ])
             
-            async with self.session.post(Config.AVALANCHE_RPC_URL, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    block_number = int(data["result"], 16)
-                    
-                    # Fetch gas price
-                    gas_payload = {
-                        "jsonrpc": "2.0",
-                        "method": "eth_gasPrice",
-                        "params": [],
-                        "id": 2
-                    }
-                    
-                    async with self.session.post(Config.AVALANCHE_RPC_URL, json=gas_payload) as gas_response:
-                        gas_data = await gas_response.json()
-                        gas_price = int(gas_data["result"], 16)
-                        
-                        network_stats = {
-                            "block_number": block_number,
-                            "gas_price_wei": gas_price,
-                            "gas_price_gwei": gas_price / 1e9,
-                            "network_congestion": "low" if gas_price < 25e9 else "high",
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        
-                        cache.set(cache_key, network_stats)
-                        logger.info(f"Fetched Avalanche stats: Block {block_number}, Gas {network_stats['gas_price_gwei']:.2f} GWEI")
-                        return network_stats
-                else:
-                    logger.error(f"Avalanche RPC error: {response.status}")
-                    return None
+            # Block number and gas price are required; fee history and block details only enrich
+            for result in (block_number, gas_price):
+                if isinstance(result, JsonRpcError):
+                    raise result
+            if isinstance(fee_history, JsonRpcError):
+                logger.warning(f"eth_feeHistory unavailable: {fee_history}")
+                fee_history = None
+            if isinstance(latest_block, JsonRpcError):
+                logger.warning(f"Latest block unavailable: {latest_block}")
+                latest_block = None
+            
+            network_stats = self._build_network_stats(hex_to_int(block_number), hex_to_int(gas_price), fee_history, latest_block)
+            
+            # Avalanche C-Chain gas is priced in AVAX, so it lives in the AVAX history
+            timeseries_store.record("AVAX", gas=network_stats.get("gas_price_gwei") or None)
+            cache.set(cache_key, network_stats)
+            logger.info(f"Fetched Avalanche stats: Block {network_stats['block_number']}, Gas {network_stats['gas_price_gwei']:.2f} GWEI, "
+                        f"congestion {network_stats['congestion_score']:.0f}/100")
+            return network_stats
         except Exception as e:
             logger.error(f"Error fetching Avalanche stats: {e}")
             return None
     
-    async def get_comprehensive_market_data(self) -> Dict:
-        """Fetch all market data concurrently with enhanced CoinGecko integration"""
-        try:
-            # Fetch all data sources concurrently
-            tasks = [
-                self.fetch_coingecko_data(),
-                self.fetch_coingecko_global_data(),
-                self.fetch_pyth_price_data(),
-                self.fetch_avalanche_network_stats(),
-                self.fetch_coingecko_multi_coins(["avalanche-2", "bitcoin", "ethereum"])
-            ]
-            
-            (coingecko_data, global_data, pyth_data, 
-             network_stats, multi_coin_data) = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Combine data, handling exceptions
-            combined_data = {
-                "timestamp": datetime.now().isoformat(),
-                "coingecko": coingecko_data if not isinstance(coingecko_data, Exception) else None,
-                "coingecko_global": global_data if not isinstance(global_data, Exception) else None,
-                "multi_coins": multi_coin_data if not isinstance(multi_coin_data, Exception) else {},
-                "pyth": pyth_data if not isinstance(pyth_data, Exception) else None,
-                "network": network_stats if not isinstance(network_stats, Exception) else None
-            }
-            
-            # Calculate enhanced market indicators
-            if combined_data["coingecko"]:
-                combined_data["market_indicators"] = self._calculate_enhanced_market_indicators(combined_data)
+    def _build_network_stats(self, block_number: int, gas_price: int,
+                             fee_history: Optional[Dict], latest_block: Optional[Dict]) -> Dict:
+        """Derive base fee, priority fee and utilization metrics from raw RPC results"""
+        network_stats = {
+            "block_number": block_number,
+            "gas_price_wei": gas_price,
+            "gas_price_gwei": gas_price / 1e9,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        gas_used_ratios: List[float] = []
+        base_fee_pressure = 0.0
+        if fee_history:
+            # baseFeePerGas has one extra entry: the base fee of the next block
+            base_fees = [hex_to_int(fee) / 1e9 for fee in fee_history.get("baseFeePerGas", [])]
+            gas_used_ratios = [float(ratio) for ratio in fee_history.get("gasUsedRatio", [])]
             
-            # Add cross-asset analysis
-            if combined_data["multi_coins"]:
-                combined_data["cross_asset_analysis"] = self._analyze_cross_asset_correlations(combined_data["multi_coins"])
+            if base_fees:
+                network_stats["base_fee_gwei"] = base_fees[-1]
+                network_stats["base_fee_avg_gwei"] = sum(base_fees) / len(base_fees)
+                network_stats["base_fee_min_gwei"] = min(base_fees)
+                network_stats["base_fee_max_gwei"] = max(base_fees)
+                network_stats["base_fee_trend"] = ((base_fees[-1] - base_fees[0]) / base_fees[0] * 100) if base_fees[0] > 0 else 0.0
+                # A base fee that doubled over the window counts as full pressure
+                if min(base_fees) > 0:
+                    base_fee_pressure = max(0.0, min(base_fees[-1] / min(base_fees) - 1, 1.0))
             
-            # Add market regime detection
-            combined_data["market_regime"] = self._detect_market_regime(combined_data)
+            rewards = fee_history.get("reward") or []
+            if rewards:
+                percentiles = {}
+                for index, percentile in enumerate(Config.RPC_FEE_HISTORY_PERCENTILES):
+                    column = sorted(hex_to_int(row[index]) / 1e9 for row in rewards if len(row) > index)
+                    if column:
+                        percentiles[f"p{percentile:g}"] = column[len(column) // 2]
+                network_stats["priority_fee_percentiles_gwei"] = percentiles
             
+            if gas_used_ratios:
+                network_stats["avg_gas_used_ratio"] = sum(gas_used_ratios) / len(gas_used_ratios)
+            network_stats["fee_history_blocks"] = len(gas_used_ratios)
+        
+        block_utilization = None
+        if latest_block:
+            gas_used = hex_to_int(latest_block.get("gasUsed"))
+            gas_limit = hex_to_int(latest_block.get("gasLimit"))
+            network_stats["latest_block_gas_used"] = gas_used
+            network_stats["latest_block_gas_limit"] = gas_limit
+            if gas_limit > 0:
+                block_utilization = gas_used / gas_limit
+                network_stats["block_utilization"] = block_utilization
+        
+        # Congestion score (0-100): sustained utilization dominates, latest block and base fee growth refine it
+        avg_utilization = network_stats.get("avg_gas_used_ratio", block_utilization or 0.0)
+        latest_utilization = block_utilization if block_utilization is not None else avg_utilization
+        congestion_score = 100 * (0.6 * avg_utilization + 0.2 * latest_utilization + 0.2 * base_fee_pressure)
+        network_stats["congestion_score"] = round(max(0.0, min(congestion_score, 100.0)), 2)
+        network_stats["network_congestion"] = self._congestion_level(network_stats["congestion_score"])
+        
+        return network_stats
+    
+    @staticmethod
+    def _congestion_level(congestion_score: float) -> str:
+        """Map a 0-100 congestion score to a congestion label"""
+        if congestion_score >= 75:
+            return "severe"
+        elif congestion_score >= 50:
+            return "high"
+        elif congestion_score >= 25:
+            return "moderate"
+        else:
+            return "low"
+    
+    def _market_sources(self) -> Dict[str, Tuple[str, object, tuple]]:
+        """Sources of the comprehensive market view: name -> (cache key, uncached fetcher, args)"""
+        multi_coin_ids = ["avalanche-2", "bitcoin", "ethereum"]
+        return {
+            "coingecko": ("coingecko:avalanche-2", self._fetch_coingecko_data, ("avalanche-2",)),
+            "coingecko_global": ("coingecko_global", self._fetch_coingecko_global_data, ()),
+            "pyth": ("pyth:AVAX/USD", self._fetch_pyth_price_data, ("AVAX/USD",)),
+            "network": ("avalanche_stats", self._fetch_avalanche_network_stats, ()),
+            "multi_coins": (f"coingecko_multi:{'-'.join(multi_coin_ids)}", self._fetch_coingecko_multi_coins, (multi_coin_ids,))
+        }
+    
+    async def fetch_source(self, name: str, force_refresh: bool = False, max_age: Optional[float] = None):
+        """Fetch one named market source, bypassing the cache read when forced
+
+        A forced refresh still accepts a value younger than ``max_age`` (for
+        example one another worker just stored in the shared cache).
+        """
+        cache_key, fetcher, args = self._market_sources()[name]
+        if force_refresh:
+            return await inflight.do(cache_key, lambda: self._leased_fetch(cache_key, fetcher, *args, max_age=max_age))
+        return await self._cached_fetch(cache_key, fetcher, *args)
+    
+    async def get_comprehensive_market_data(self) -> Dict:
+        """Fetch all market data concurrently with enhanced CoinGecko integration
+        
+        Sources that failed or missed the request deadline are listed in
+        ``missing_sources`` instead of holding up the rest.
+        """
+        try:
+            # Fetch all data sources concurrently
+            sources = await FetchPlan(*self._market_sources()).run(self)
+            combined_data = self.combine_market_data(sources)
+            combined_data["missing_sources"] = [name for name, value in sources.items() if value is None]
             return combined_data
             
         except Exception as e:
             logger.error(f"Error fetching comprehensive market data: {e}")
             return {"timestamp": datetime.now().isoformat(), "error": str(e)}
     
+    def combine_market_data(self, sources: Dict) -> Dict:
+        """Combine raw source payloads with the derived analytics for them
+        
+        The derivation (indicators, cross-asset analysis, regime, sentiment)
+        only reruns when a source payload is replaced or a live indicator
+        moves; ``analytics_version`` identifies the result.
+        """
+        # Live indicators move between CoinGecko fetches, so overlay the latest values
+        combined_data = {
+            "timestamp": datetime.now().isoformat(),
+            "coingecko": streaming_indicators.overlay(sources.get("coingecko")),
+            "coingecko_global": sources.get("coingecko_global"),
+            "multi_coins": {
+                coin_id: streaming_indicators.overlay(coin_data)
+                for coin_id, coin_data in (sources.get("multi_coins") or {}).items()
+            },
+            "pyth": sources.get("pyth"),
+            "network": sources.get("network")
+        }
+        
+        names = sorted(sources)
+        derived = analytics_stage.derive(
+            [sources[name] for name in names], (tuple(names), streaming_indicators.version),
+            lambda: self.derive_analytics(combined_data)
+        )
+        combined_data.update(derived.data)
+        combined_data["analytics_version"] = derived.version
+        return combined_data
+    
+    def derive_analytics(self, data: Dict) -> Dict:
+        """Everything computed from the raw sources: indicators, cross-asset analysis, regime and sentiment"""
+        derived = {}
+        
+        # Calculate enhanced market indicators
+        if data["coingecko"]:
+            derived["market_indicators"] = self._calculate_enhanced_market_indicators(data)
+        
+        # Add cross-asset analysis
+        if data["multi_coins"]:
+            derived["cross_asset_analysis"] = self._analyze_cross_asset_correlations(data["multi_coins"])
+        
+        # Add market regime detection
+        derived["market_regime"] = self._detect_market_regime(data)
+        derived["sentiment"] = self._analyze_sentiment(data)
+        
+        return derived
+    
+    def _analyze_sentiment(self, data: Dict) -> Dict:
+        """Overall and AVAX sentiment from global market data and AVAX RSI"""
+        global_data = data.get("coingecko_global") or {}
+        coingecko = data.get("coingecko") or {}
+        
+        sentiment = {
+            "overall_sentiment": global_data.get("market_sentiment", "unknown") if global_data else "unknown",
+            "avax_sentiment": "neutral",
+            "confidence": 0.7
+        }
+        
+        if coingecko:
+            rsi = coingecko.get("rsi_14", 50)
+            volatility = coingecko.get("volatility", 0)
+            
+            if rsi > 70:
+                sentiment["avax_sentiment"] = "bullish_extreme"
+            elif rsi > 60:
+                sentiment["avax_sentiment"] = "bullish"
+            elif rsi < 30:
+                sentiment["avax_sentiment"] = "bearish_extreme"
+            elif rsi < 40:
+                sentiment["avax_sentiment"] = "bearish"
+            
+            sentiment["volatility_adjusted"] = volatility > 8
+            sentiment["rsi"] = rsi
+        
+        if global_data:
+            sentiment["btc_dominance"] = global_data.get("market_cap_percentage", {}).get("btc", 0)
+            sentiment["market_cap_change_24h"] = global_data.get("market_cap_change_24h", 0)
+        
+        return sentiment
+    
     def _calculate_enhanced_market_indicators(self, data: Dict) -> Dict:
         """Calculate enhanced market indicators from all data sources"""
         coingecko = data.get("coingecko", {})
@@ -668,17 +1132,35 @@ class OracleDataPipeline:
             return {}
         
         try:
-            correlations = {}
             coins = list(multi_coins.keys())
             
-            # Calculate price change correlations
-            for i, coin1 in enumerate(coins):
-                for coin2 in coins[i+1:]:
-                    if coin1 in multi_coins and coin2 in multi_coins:
+            # Return correlations over the 7-day hourly sparklines, as whole matrices
+            matrix = correlation_engine.analyze(
+                {coin: multi_coins[coin].get("sparkline_7d") for coin in coins},
+                reference="avalanche-2"
+            )
+            
+            correlations = {}
+            if matrix:
+                index = {coin: i for i, coin in enumerate(matrix["coins"])}
+                pair_coins = matrix["coins"][:MAX_PAIR_COINS]
+                for i, coin1 in enumerate(pair_coins):
+                    for coin2 in pair_coins[i+1:]:
+                        pearson = matrix["pearson"][index[coin1]][index[coin2]]
+                        correlations[f"{coin1}_{coin2}"] = {
+                            "correlation": correlation_label(pearson),
+                            "pearson": pearson,
+                            "spearman": matrix["spearman"][index[coin1]][index[coin2]],
+                            "change1": multi_coins[coin1].get("price_change_24h", 0),
+                            "change2": multi_coins[coin2].get("price_change_24h", 0)
+                        }
+            else:
+                # Without sparklines fall back to comparing the direction of the 24h moves
+                for i, coin1 in enumerate(coins):
+                    for coin2 in coins[i+1:]:
                         change1 = multi_coins[coin1].get("price_change_24h", 0)
                         change2 = multi_coins[coin2].get("price_change_24h", 0)
                         
-                        # Simple correlation approximation based on direction
                         if abs(change1) > 0.1 and abs(change2) > 0.1:
                             correlation = "positive" if (change1 > 0) == (change2 > 0) else "negative"
                         else:
@@ -707,11 +1189,16 @@ class OracleDataPipeline:
                 else:
                     leadership = "moving_together"
             
-            return {
+            analysis = {
                 "correlations": correlations,
                 "market_leadership": leadership,
                 "relative_strength": self._calculate_relative_strength(multi_coins)
             }
+            if matrix:
+                analysis["correlation_matrix"] = {key: value for key, value in matrix.items() if key != "rolling"}
+                if "rolling" in matrix:
+                    analysis["rolling_correlations"] = matrix["rolling"]
+            return analysis
             
         except Exception as e:
             logger.warning(f"Error analyzing cross-asset correlations: {e}")
@@ -809,6 +1296,9 @@ class OracleDataPipeline:
         if not network:
             return "unknown"
         
+        if "congestion_score" in network:
+            return self._congestion_level(network["congestion_score"])
+        
         gas_price = network.get("gas_price_gwei", 25)
         
         if gas_price > 100:
@@ -857,7 +1347,15 @@ class OracleDataPipeline:
         
         # Network congestion
         network_adjustment = 0
-        if network:
+        if network and "congestion_score" in network:
+            congestion_score = network["congestion_score"]
+            if congestion_score >= 75:
+                network_adjustment = 0.1
+            elif congestion_score >= 50:
+                network_adjustment = 0.05
+            elif congestion_score < 25:
+                network_adjustment = -0.05
+        elif network:
             gas_price = network.get("gas_price_gwei", 25)
             if gas_price > 50:
                 network_adjustment = 0.1
@@ -988,6 +1486,11 @@ async def get_global_market_data() -> Optional[Dict]:
     async with OracleDataPipeline() as pipeline:
         return await pipeline.fetch_coingecko_global_data()
 
+async def get_pyth_prices(symbols: List[str] = None) -> Dict[str, Dict]:
+    """Get Pyth prices for several symbols in one batch request"""
+    async with OracleDataPipeline() as pipeline:
+        return await pipeline.fetch_pyth_multi_prices(symbols)
+
 async def get_avax_price() -> Optional[float]:
     """Get current AVAX price"""
     async with OracleDataPipeline() as pipeline:
@@ -1015,11 +1518,21 @@ async def get_market_sentiment() -> str:
 async def get_cross_asset_analysis() -> Dict:
     """Get cross-asset correlation analysis"""
     async with OracleDataPipeline() as pipeline:
-        multi_coin_data = await pipeline.fetch_coingecko_multi_coins()
+        # Same multi-coin source as the market snapshot, so both share one cache entry
+        multi_coin_data = (await FetchPlan("multi_coins").run(pipeline))["multi_coins"]
         if multi_coin_data:
             return pipeline._analyze_cross_asset_correlations(multi_coin_data)
         return {}
 
+async def get_sentiment_analysis() -> Dict:
+    """Get sentiment analysis from the AVAX and global sources, fetched concurrently"""
+    async with OracleDataPipeline() as pipeline:
+        sources = await FetchPlan("coingecko", "coingecko_global").run(pipeline)
+        return pipeline._analyze_sentiment({
+            "coingecko": streaming_indicators.overlay(sources["coingecko"]),
+            "coingecko_global": sources["coingecko_global"]
+        })
+
 # Test function
 async def test_pipeline():
     """Test the data pipeline"""
@@ -0,0 +1,82 @@
+"""
+Request deadlines for Aura AI Backend
+Each endpoint runs under a latency budget; upstream calls made on its behalf get the time that is left
+"""
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import aiohttp
+
+from config import Config
+
+# Absolute time.monotonic() deadline of the work running in the current task; child tasks inherit it
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The request budget ran out before the work finished"""
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Run the enclosed block with at most ``seconds`` left; a nested budget never extends an outer one"""
+    if seconds is None or seconds <= 0:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = request_deadline.get()
+    token = request_deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+@contextmanager
+def no_deadline():
+    """Run the enclosed block (e.g. a fetch shared with other requests) without the caller's budget"""
+    token = request_deadline.set(None)
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None without one"""
+    at = request_deadline.get()
+    return None if at is None else at - time.monotonic()
+
+def check_deadline():
+    """Raise DeadlineExceeded once the current budget has run out"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+def upstream_timeout() -> Optional[aiohttp.ClientTimeout]:
+    """Timeout for one upstream call: the session defaults, capped by the remaining budget"""
+    left = remaining()
+    if left is None:
+        return None
+    check_deadline()
+    return aiohttp.ClientTimeout(
+        total=min(left, Config.HTTP_TOTAL_TIMEOUT),
+        connect=min(left, Config.HTTP_CONNECT_TIMEOUT),
+        sock_read=min(left, Config.HTTP_READ_TIMEOUT)
+    )
+
+async def wait_within_deadline(awaitable):
+    """Await ``awaitable`` for at most the remaining budget"""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, max(left, 0.0))
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded") from None
+
+def budget_for_path(path: str, budgets: Optional[Dict[str, float]] = None) -> Optional[float]:
+    """Budget of the longest configured path prefix; 0 (e.g. for streams) means no budget"""
+    budgets = Config.REQUEST_BUDGETS if budgets is None else budgets
+    matches = [prefix for prefix in budgets if path == prefix or path.startswith(prefix.rstrip("/") + "/")]
+    seconds = budgets[max(matches, key=len)] if matches else Config.REQUEST_BUDGET_DEFAULT
+    return seconds if seconds > 0 else None
@@ -0,0 +1,44 @@
+"""
+Fast JSON encoding for Aura AI Backend responses
+Uses orjson when installed and falls back to the standard library encoder
+"""
+import json
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def _default(value: Any):
+    """Encode the non-JSON types that show up in market data (NumPy scalars and arrays, dates)"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON bytes for ``content``"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class EncodedJSONResponse(Response):
+    """Response for a body that was already encoded, e.g. once per market snapshot"""
+    media_type = "application/json"
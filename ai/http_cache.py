@@ -0,0 +1,39 @@
+"""
+HTTP conditional GET helpers for Aura AI Backend
+ETags, If-None-Match handling and Cache-Control for endpoints the frontend polls
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from fast_json import EncodedJSONResponse
+
+def make_etag(body: bytes, weak: bool = False) -> str:
+    """Quoted entity tag for ``body`` (weak tags mark semantically equivalent bodies)"""
+    tag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored on both sides"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any((candidate[2:] if candidate.startswith("W/") else candidate) == opaque for candidate in candidates)
+
+def cache_control(max_age: float) -> str:
+    """``max-age`` for bodies known to stay valid for a while, otherwise revalidate on every use"""
+    seconds = int(max_age)
+    return f"max-age={seconds}" if seconds > 0 else "no-cache"
+
+def conditional_response(request: Request, body: bytes, max_age: float = 0,
+                         etag: Optional[str] = None) -> Response:
+    """304 if the client already holds ``body``, otherwise the body itself, both with validators"""
+    headers = {"ETag": etag or make_etag(body), "Cache-Control": cache_control(max_age)}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return EncodedJSONResponse(body, headers=headers)
@@ -0,0 +1,103 @@
+"""
+Shared HTTP connection pool for Aura AI Backend
+Keeps one long-lived aiohttp session for CoinGecko, Pyth Hermes, Avalanche RPC and Snowtrace
+"""
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _build_connector() -> aiohttp.TCPConnector:
+    """Pooled connector with keep-alive, DNS caching and per-host limits"""
+    return aiohttp.TCPConnector(
+        limit=Config.HTTP_POOL_LIMIT,
+        limit_per_host=Config.HTTP_POOL_LIMIT_PER_HOST,
+        use_dns_cache=True,
+        ttl_dns_cache=Config.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True
+    )
+
+def _build_timeout() -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(
+        total=Config.HTTP_TOTAL_TIMEOUT,
+        connect=Config.HTTP_CONNECT_TIMEOUT,
+        sock_read=Config.HTTP_READ_TIMEOUT
+    )
+
+async def start_shared_session() -> aiohttp.ClientSession:
+    """Create the app-lifetime session (called from the FastAPI startup hook)"""
+    global _session, _session_loop
+
+    if get_shared_session() is not None:
+        return _session
+
+    _session = aiohttp.ClientSession(
+        connector=_build_connector(),
+        timeout=_build_timeout(),
+        headers={"User-Agent": "Aura-AI-DEX/1.0"}
+    )
+    _session_loop = asyncio.get_running_loop()
+    logger.info(
+        f"Shared HTTP session started (pool={Config.HTTP_POOL_LIMIT}, "
+        f"per_host={Config.HTTP_POOL_LIMIT_PER_HOST}, dns_ttl={Config.HTTP_DNS_CACHE_TTL}s)"
+    )
+    return _session
+
+def get_shared_session() -> Optional[aiohttp.ClientSession]:
+    """Return the shared session if it is open and bound to the running event loop"""
+    if _session is None or _session.closed:
+        return None
+
+    try:
+        if asyncio.get_running_loop() is not _session_loop:
+            return None
+    except RuntimeError:
+        return None
+
+    return _session
+
+async def close_shared_session():
+    """Close the shared session (called from the FastAPI shutdown hook)"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Shared HTTP session closed")
+
+    _session = None
+    _session_loop = None
+
+class SessionOwner:
+    """Mixin for async context managers that borrow the shared session
+
+    Falls back to a private session (closed on exit) when the shared pool has
+    not been started, e.g. in standalone scripts and tests.
+    """
+    session: Optional[aiohttp.ClientSession] = None
+    _owns_session: bool = False
+
+    async def __aenter__(self):
+        if self.session is None or self.session.closed:
+            shared = get_shared_session()
+            if shared is not None:
+                self.session = shared
+                self._owns_session = False
+            else:
+                self.session = aiohttp.ClientSession(timeout=_build_timeout())
+                self._owns_session = True
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session and self._owns_session:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
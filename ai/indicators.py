@@ -0,0 +1,195 @@
+"""
+Vectorized technical indicators for Aura AI Backend
+Computes returns, volatility, RSI, EMA and ATR-style ranges for many coins' price series in one pass
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Sparklines are hourly, so 24 points span a day
+RSI_PERIOD = 14
+EMA_SPAN = 24
+RANGE_WINDOW = 24
+
+def to_price_matrix(series: Iterable[Optional[Sequence[float]]], length: Optional[int] = None) -> np.ndarray:
+    """Stack price series into a 2-D float array, one row per coin
+
+    Rows are right-aligned so the latest price of every coin sits in the last
+    column; shorter series are NaN-padded at the front and ``None`` prices
+    become NaN. With ``length`` each row keeps only its most recent points.
+    """
+    rows = [list(prices or []) for prices in series]
+    width = length or max((len(row) for row in rows), default=0)
+    if rows and all(len(row) == width for row in rows):
+        # Common case: every coin has a full sparkline, so one conversion suffices
+        return np.array(rows, dtype=float).reshape(len(rows), width)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        row = row[-width:] if width else []
+        if row:
+            matrix[i, width - len(row):] = np.array(row, dtype=float)
+    return matrix
+
+def pct_returns(prices: np.ndarray) -> np.ndarray:
+    """Period-over-period percentage returns; undefined where the previous price is 0 or missing"""
+    previous = prices[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(prices, axis=1) / previous * 100
+    returns[previous == 0] = np.nan
+    return returns
+
+def volatility(prices: np.ndarray) -> np.ndarray:
+    """Population standard deviation of percentage returns per row (0 where undefined)"""
+    returns = pct_returns(prices)
+    counts = np.sum(~np.isnan(returns), axis=1)
+    result = np.zeros(len(prices))
+    valid = counts > 0
+    if np.any(valid):
+        result[valid] = np.nanstd(returns[valid], axis=1)
+    return result
+
+def _split_changes(prices: np.ndarray):
+    changes = np.diff(prices, axis=1)
+    gains = np.where(changes > 0, changes, 0.0)
+    losses = np.where(changes > 0, 0.0, np.abs(changes))
+    missing = np.isnan(changes)
+    gains[missing] = np.nan
+    losses[missing] = np.nan
+    return gains, losses
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+    return np.clip(rsi, 0, 100)
+
+def simple_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI from plain averages of the last ``period`` gains and losses (Cutler's RSI)
+
+    Rows without ``period + 1`` prices, or with gaps inside the window, are neutral (50).
+    """
+    result = np.full(len(prices), 50.0)
+    if prices.shape[1] < period + 1:
+        return result
+
+    gains, losses = _split_changes(prices[:, -(period + 1):])
+    avg_gain = gains.mean(axis=1)
+    avg_loss = losses.mean(axis=1)
+    valid = ~(np.isnan(avg_gain) | np.isnan(avg_loss))
+    result[valid] = _rsi_from_averages(avg_gain[valid], avg_loss[valid])
+    return result
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    """Column of the first non-NaN value in each row (row width if none)"""
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), values.shape[1])
+
+def _smooth_last(values: np.ndarray, seed: np.ndarray, seed_column: np.ndarray, alpha: float) -> np.ndarray:
+    """Final value of ``s = (1 - alpha) * s + alpha * x`` started from ``seed`` after ``seed_column``
+
+    The recursion is unrolled into one weighted sum per row, so all coins are
+    smoothed with a single matrix-vector product instead of a loop over time.
+    """
+    width = values.shape[1]
+    columns = np.arange(width)
+    decay = (1 - alpha) ** (width - 1 - columns)
+    after_seed = columns[None, :] > seed_column[:, None]
+    weighted = np.where(after_seed, values, 0.0) @ decay
+    seed_decay = (1 - alpha) ** np.maximum(width - 1 - seed_column, 0)
+    return seed * seed_decay + alpha * weighted
+
+def _wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """Final Wilder moving average of each row (seeded with the mean of its first ``period`` values)
+
+    Leading NaNs (padding) are skipped per row; rows with fewer than
+    ``period`` values, or gaps after the first value, are NaN.
+    """
+    rows, width = values.shape
+    starts = _first_valid(values)
+    seed_column = starts + period - 1
+    result = np.full(rows, np.nan)
+    seeded = seed_column < width
+    if not np.any(seeded):
+        return result
+
+    seed_columns = starts[seeded, None] + np.arange(period)
+    seed = values[np.flatnonzero(seeded)[:, None], seed_columns].mean(axis=1)
+    result[seeded] = _smooth_last(values[seeded], seed, seed_column[seeded], 1.0 / period)
+    return result
+
+def wilder_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder-smoothed RSI over each row's full history (neutral 50 where undefined)"""
+    if prices.shape[1] < period + 1:
+        return np.full(len(prices), 50.0)
+
+    gains, losses = _split_changes(prices)
+    avg_gain = _wilder_smooth(gains, period)
+    avg_loss = _wilder_smooth(losses, period)
+    valid = ~(np.isnan(avg_gain) | np.isnan(avg_loss))
+    result = np.full(len(prices), 50.0)
+    result[valid] = _rsi_from_averages(avg_gain[valid], avg_loss[valid])
+    return result
+
+def ema(prices: np.ndarray, span: int) -> np.ndarray:
+    """Latest exponential moving average of each row, seeded with its first price (NaN for empty rows)"""
+    starts = _first_valid(prices)
+    result = np.full(len(prices), np.nan)
+    present = starts < prices.shape[1]
+    if np.any(present):
+        rows = np.flatnonzero(present)
+        seed = prices[rows, starts[present]]
+        result[present] = _smooth_last(prices[present], seed, starts[present], 2.0 / (span + 1))
+    return result
+
+def atr_pct(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """ATR-style range from close-only data: Wilder average of absolute moves, as % of the last price
+
+    Sparklines carry no highs and lows, so the true range of a period
+    reduces to the absolute close-to-close move.
+    """
+    if prices.shape[1] < period + 1:
+        return np.zeros(len(prices))
+
+    average_range = _wilder_smooth(np.abs(np.diff(prices, axis=1)), period)
+    last = prices[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = average_range / last * 100
+    return np.where(np.isfinite(result), result, 0.0)
+
+def range_pct(prices: np.ndarray, window: int = 24) -> np.ndarray:
+    """High-low range of the last ``window`` prices as % of the last price"""
+    recent = prices[:, -window:]
+    last = prices[:, -1]
+    # fmax/fmin skip NaN padding without warning on all-NaN rows
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (np.fmax.reduce(recent, axis=1) - np.fmin.reduce(recent, axis=1)) / last * 100
+    return np.where(np.isfinite(result), result, 0.0)
+
+def compute_indicators(series: Dict[str, Optional[Sequence[float]]]) -> Dict[str, Dict[str, float]]:
+    """All sparkline indicators for many coins at once, keyed like ``series``"""
+    if not series:
+        return {}
+
+    keys: List[str] = list(series)
+    prices = to_price_matrix(series[key] for key in keys)
+    if prices.shape[1] == 0:
+        prices = np.full((len(keys), 1), np.nan)
+
+    vol = volatility(prices)
+    rsi = simple_rsi(prices, RSI_PERIOD)
+    rsi_wilder = wilder_rsi(prices, RSI_PERIOD)
+    ema_last = np.nan_to_num(ema(prices, EMA_SPAN))
+    atr = atr_pct(prices, RSI_PERIOD)
+    ranges = range_pct(prices, RANGE_WINDOW)
+
+    return {
+        key: {
+            "price_volatility_7d": float(vol[i]),
+            "rsi_14": float(rsi[i]),
+            "rsi_14_wilder": float(rsi_wilder[i]),
+            "ema_24": float(ema_last[i]),
+            "atr_14_pct": float(atr[i]),
+            "range_24_pct": float(ranges[i])
+        }
+        for i, key in enumerate(keys)
+    }
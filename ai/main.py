@@ -2,17 +2,25 @@
 FastAPI main application for Aura AI Backend
 Provides REST API endpoints for DEX fee recommendations and contract scanning
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from pydantic import BaseModel, Field
 import json
 
+from fast_json import EncodedJSONResponse, FastJSONResponse, dumps as encode_json
+from http_cache import conditional_response, make_etag
+from deadline import budget_for_path, deadline
+from model_loader import model_loader
+
 # Import with error handling for Railway deployment
 try:
     from config import Config
@@ -29,9 +37,11 @@ except ImportError as e:
 # Import data pipeline functions with error handling
 try:
     from data_pipeline import (
-        get_live_market_data, get_avax_price, get_volatility,
+        get_live_market_data, get_avax_price,
         get_enhanced_coingecko_data, get_multi_coin_data, 
-        get_global_market_data, get_market_sentiment, get_cross_asset_analysis
+        get_global_market_data, get_cross_asset_analysis, get_sentiment_analysis, get_pyth_prices,
+        cache as data_cache, inflight as data_inflight, streaming_indicators, timeseries_store,
+        analytics_stage
     )
     DATA_PIPELINE_AVAILABLE = True
 except ImportError as e:
@@ -40,24 +50,98 @@ except ImportError as e:
     # Create dummy functions
     async def get_live_market_data(): return {}
     async def get_avax_price(): return 0
-    async def get_volatility(): return 0
-    async def get_enhanced_coingecko_data(): return {}
+    async def get_enhanced_coingecko_data(coin_id="avalanche-2"): return {}
     async def get_multi_coin_data(): return {}
     async def get_global_market_data(): return {}
-    async def get_market_sentiment(): return "neutral"
     async def get_cross_asset_analysis(): return {}
+    async def get_sentiment_analysis(): return {}
+    async def get_pyth_prices(symbols=None): return {}
+    data_cache = None
+    data_inflight = None
+    streaming_indicators = None
+    timeseries_store = None
+    analytics_stage = None
+
+# Import per-coin lookup batcher with error handling
+try:
+    from coin_batcher import coin_batcher, get_batched_coin_data
+    COIN_BATCHER_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import coin_batcher: {e}")
+    COIN_BATCHER_AVAILABLE = False
+    coin_batcher = None
+    get_batched_coin_data = get_enhanced_coingecko_data
 
-# Import production models with error handling
+# Import shared HTTP session management with error handling
 try:
-    from production_models import get_production_fee_recommendation, get_model_info, train_production_models
-    PRODUCTION_MODELS_AVAILABLE = True
+    from http_session import start_shared_session, close_shared_session
+    SHARED_SESSION_AVAILABLE = True
 except ImportError as e:
-    print(f"Warning: Could not import production_models: {e}")
-    PRODUCTION_MODELS_AVAILABLE = False
-    # Create dummy functions
-    async def get_production_fee_recommendation(): return {"recommended_fee": 0.3, "confidence": 0.5, "reasoning": "Fallback mode"}
-    def get_model_info(): return {"status": "unavailable"}
-    async def train_production_models(): return {"status": "unavailable"}
+    print(f"Warning: Could not import http_session: {e}")
+    SHARED_SESSION_AVAILABLE = False
+
+# Import market snapshot refresher with error handling
+try:
+    from market_snapshot import snapshot_store, snapshot_refresher
+    MARKET_SNAPSHOT_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import market_snapshot: {e}")
+    MARKET_SNAPSHOT_AVAILABLE = False
+    snapshot_store = None
+    snapshot_refresher = None
+
+# Import server-sent event streams with error handling
+try:
+    from push_stream import stream_producer
+    PUSH_STREAM_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import push_stream: {e}")
+    PUSH_STREAM_AVAILABLE = False
+    stream_producer = None
+
+# Import Pyth streaming subscriber with error handling
+try:
+    from pyth_stream import price_stream
+    PYTH_STREAM_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import pyth_stream: {e}")
+    PYTH_STREAM_AVAILABLE = False
+    price_stream = None
+
+# Import upstream request scheduler with error handling
+try:
+    from rate_limiter import scheduler as request_scheduler
+    RATE_LIMITER_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import rate_limiter: {e}")
+    RATE_LIMITER_AVAILABLE = False
+    request_scheduler = None
+
+# Production models (scikit-learn, pandas, trained weights) load in the background after startup;
+# until they are ready the functions below answer in fallback mode
+def _start_lazy_model_load():
+    if not Config.MODEL_PRELOAD:
+        model_loader.start()  # lazy mode: the first use starts loading
+
+async def get_production_fee_recommendation(market_data=None):
+    _start_lazy_model_load()
+    if not model_loader.ready:
+        return {"recommended_fee": 0.3, "confidence": 0.5, "reasoning": f"Fallback mode (models {model_loader.state})", "market_condition": "unknown"}
+    return await model_loader.get("get_production_fee_recommendation")(market_data)
+
+async def get_production_fee_batch(scenarios, market_data=None):
+    return await model_loader.get("get_production_fee_batch")(scenarios, market_data)
+
+def get_model_info():
+    _start_lazy_model_load()
+    if not model_loader.ready:
+        return {"status": "unavailable" if model_loader.state == "failed" else model_loader.state}
+    return model_loader.get("get_model_info")()
+
+async def train_production_models():
+    if not await model_loader.wait():
+        return {"status": "unavailable"}
+    return await model_loader.get("train_production_models")()
 
 # Import contract scanner with error handling
 try:
@@ -92,6 +176,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_budget(request: Request, call_next):
+    """Run each request under its path's latency budget (Config.REQUEST_BUDGETS)"""
+    with deadline(budget_for_path(request.url.path)):
+        return await call_next(request)
+
 # Pydantic models for request/response
 class FeeRecommendationResponse(BaseModel):
     recommended_fee: float = Field(..., description="Recommended fee percentage")
@@ -101,6 +191,11 @@ class FeeRecommendationResponse(BaseModel):
     current_volatility: float = Field(..., description="Current market volatility")
     timestamp: str = Field(..., description="Timestamp of recommendation")
 
+class FeeBatchRequest(BaseModel):
+    scenarios: Union[List[Dict[str, float]], Dict[str, List[float]]] = Field(
+        ..., description="Feature rows, or feature columns of equal length; missing features come from live data"
+    )
+
 class ContractScanRequest(BaseModel):
     address: str = Field(..., description="Contract address to scan")
     quick: bool = Field(default=False, description="Perform quick scan only")
@@ -114,6 +209,7 @@ class ContractScanResponse(BaseModel):
     is_verified: bool
     recommendation: str
     timestamp: str
+    missing_sources: List[str] = Field(default_factory=list, description="Lookups that failed or ran out of time")
 
 class MarketDataResponse(BaseModel):
     price_usd: Optional[float]
@@ -137,6 +233,8 @@ class CrossAssetAnalysisResponse(BaseModel):
     correlations: Dict
     market_leadership: str
     relative_strength: Dict
+    correlation_matrix: Optional[Dict] = None
+    rolling_correlations: Optional[Dict] = None
     timestamp: str
 
 class GlobalMarketResponse(BaseModel):
@@ -155,12 +253,20 @@ class HealthResponse(BaseModel):
     services: Dict[str, str]
 
 # Enhanced market data endpoints
+def _encode_enhanced_market_data(market_data: Dict) -> bytes:
+    return encode_json(EnhancedMarketDataResponse(**market_data).model_dump())
+
 @app.get("/market-data/enhanced", response_model=EnhancedMarketDataResponse)
 async def get_enhanced_market_data():
     """Get comprehensive enhanced market data with CoinGecko integration"""
     try:
+        # Validated and encoded once per snapshot, then served as bytes
+        snapshot = get_current_snapshot()
+        if snapshot is not None:
+            return EncodedJSONResponse(snapshot.encoded("market-data/enhanced", _encode_enhanced_market_data))
+        
         market_data = await get_live_market_data()
-        return EnhancedMarketDataResponse(**market_data)
+        return EncodedJSONResponse(_encode_enhanced_market_data(market_data))
     except Exception as e:
         logger.error(f"Error fetching enhanced market data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch enhanced market data: {str(e)}")
@@ -206,7 +312,8 @@ async def get_multi_coin_analysis(
 async def get_cross_asset_correlations():
     """Get cross-asset correlation analysis"""
     try:
-        analysis = await get_cross_asset_analysis()
+        # The snapshot already carries the analysis for the default coin set
+        analysis = await get_snapshot_section("cross_asset_analysis", get_cross_asset_analysis)
         if not analysis:
             raise HTTPException(status_code=404, detail="Cross-asset analysis not available")
         
@@ -224,49 +331,51 @@ async def get_cross_asset_correlations():
 async def get_market_sentiment_analysis():
     """Get overall market sentiment analysis"""
     try:
-        sentiment = await get_market_sentiment()
-        global_data = await get_global_market_data()
-        enhanced_data = await get_enhanced_coingecko_data()
-        
+        # Interpreted once per market data change by the derived analytics stage; without a
+        # snapshot only the two sources sentiment needs are fetched, concurrently
+        snapshot = get_current_snapshot()
         sentiment_data = {
-            "overall_sentiment": sentiment,
+            "overall_sentiment": "unknown",
             "avax_sentiment": "neutral",
             "confidence": 0.7,
+            **(await get_snapshot_section("sentiment", get_sentiment_analysis) or {}),
+            "analytics_version": snapshot.data.get("analytics_version") if snapshot is not None else None,
             "timestamp": datetime.now().isoformat()
         }
         
-        # Enhanced sentiment analysis
-        if enhanced_data:
-            rsi = enhanced_data.get("rsi_14", 50)
-            volatility = enhanced_data.get("volatility", 0)
-            
-            if rsi > 70:
-                sentiment_data["avax_sentiment"] = "bullish_extreme"
-            elif rsi > 60:
-                sentiment_data["avax_sentiment"] = "bullish"
-            elif rsi < 30:
-                sentiment_data["avax_sentiment"] = "bearish_extreme"
-            elif rsi < 40:
-                sentiment_data["avax_sentiment"] = "bearish"
-            
-            sentiment_data["volatility_adjusted"] = volatility > 8
-            sentiment_data["rsi"] = rsi
-        
-        if global_data:
-            sentiment_data["btc_dominance"] = global_data.get("market_cap_percentage", {}).get("btc", 0)
-            sentiment_data["market_cap_change_24h"] = global_data.get("market_cap_change_24h", 0)
-        
         return sentiment_data
         
     except Exception as e:
         logger.error(f"Error fetching sentiment analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch sentiment analysis: {str(e)}")
 
+@app.get("/market-data/pyth")
+async def get_pyth_price_feeds(
+    symbols: Optional[str] = Query(None, description="Comma-separated Pyth symbols, e.g. AVAX/USD,BTC/USD")
+):
+    """Get Pyth Network prices for several assets from a single batch request"""
+    try:
+        symbol_list = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()] if symbols else None
+        prices = await get_pyth_prices(symbol_list)
+        
+        if not prices:
+            raise HTTPException(status_code=404, detail="Pyth price data not available")
+        
+        return {
+            "prices": prices,
+            "timestamp": datetime.now().isoformat()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching Pyth prices: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch Pyth prices: {str(e)}")
+
 @app.get("/coin/{coin_id}")
 async def get_specific_coin_data(coin_id: str):
-    """Get detailed data for a specific coin"""
+    """Get market data for a specific coin (lookups from concurrent requests are batched)"""
     try:
-        coin_data = await get_enhanced_coingecko_data(coin_id)
+        coin_data = await get_batched_coin_data(coin_id)
         if not coin_data:
             raise HTTPException(status_code=404, detail=f"Data for coin '{coin_id}' not available")
         
@@ -277,20 +386,41 @@ async def get_specific_coin_data(coin_id: str):
         logger.error(f"Error fetching data for coin {coin_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch coin data: {str(e)}")
 
-# Global state for caching
-market_data_cache = {}
-cache_timestamp = None
-CACHE_DURATION = 300  # 5 minutes
+def get_current_snapshot():
+    """Latest published market snapshot, or None if there is none or it has expired"""
+    if snapshot_store is not None:
+        snapshot = snapshot_store.current()
+        if snapshot is not None and not snapshot.is_expired():
+            return snapshot
+    return None
+
+async def get_snapshot_section(key: str, fetch_live):
+    """One section of the current snapshot, or ``fetch_live()`` (fetching only what it needs) without one"""
+    snapshot = get_current_snapshot()
+    if snapshot is not None and snapshot.data.get(key):
+        return snapshot.data[key]
+    return await fetch_live()
+
+async def get_current_market_data() -> Dict:
+    """Latest published market snapshot, or a live fetch until one is available"""
+    snapshot = get_current_snapshot()
+    if snapshot is not None:
+        return snapshot.data
+    
+    return await get_live_market_data()
 
 # Startup and shutdown events
+startup_timings = {"app_import_seconds": None, "startup_seconds": None}
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
+    startup_started = time.perf_counter()
     logger.info("Starting Aura AI Backend...")
     
     # Log service availability
     logger.info(f"Data Pipeline Available: {DATA_PIPELINE_AVAILABLE}")
-    logger.info(f"Production Models Available: {PRODUCTION_MODELS_AVAILABLE}")
+    logger.info(f"Production Models: {model_loader.state}")
     logger.info(f"Contract Scanner Available: {CONTRACT_SCANNER_AVAILABLE}")
     
     # Validate configuration (non-blocking)
@@ -300,23 +430,54 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Configuration validation failed: {e}")
     
-    # Warm up AI models (non-blocking)
-    if PRODUCTION_MODELS_AVAILABLE:
+    # Open the shared upstream connection pool used by all data helpers
+    if SHARED_SESSION_AVAILABLE:
         try:
-            logger.info("Warming up AI models...")
-            # Production models are ready on import
-            logger.info("AI models ready")
+            await start_shared_session()
         except Exception as e:
-            logger.warning(f"AI models warmup failed: {e}")
+            logger.warning(f"Shared HTTP session startup failed, falling back to per-request sessions: {e}")
+    
+    # Subscribe to pushed Pyth price updates
+    if PYTH_STREAM_AVAILABLE and Config.PYTH_STREAM_ENABLED:
+        price_stream.start()
+    
+    # Start background market snapshot refresher
+    if MARKET_SNAPSHOT_AVAILABLE and DATA_PIPELINE_AVAILABLE and Config.SNAPSHOT_REFRESH_ENABLED:
+        snapshot_refresher.start()
+    
+    # Push snapshot changes to stream subscribers
+    if PUSH_STREAM_AVAILABLE and Config.STREAM_ENABLED:
+        stream_producer.start()
+    
+    # Load AI models in the background so the port binds right away
+    if Config.MODEL_PRELOAD:
+        logger.info("Loading AI models in the background...")
+        model_loader.start()
     else:
-        logger.warning("AI models not available - running in fallback mode")
+        logger.info("AI models load on first use")
     
-    logger.info("Aura AI Backend started successfully")
+    startup_timings["startup_seconds"] = round(time.perf_counter() - startup_started, 3)
+    logger.info(
+        f"Aura AI Backend started successfully (import {startup_timings['app_import_seconds']:.2f}s, "
+        f"startup {startup_timings['startup_seconds']:.2f}s)"
+    )
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Aura AI Backend...")
+    
+    if PUSH_STREAM_AVAILABLE:
+        await stream_producer.stop()
+    
+    if MARKET_SNAPSHOT_AVAILABLE:
+        await snapshot_refresher.stop()
+    
+    if PYTH_STREAM_AVAILABLE:
+        await price_stream.stop()
+    
+    if SHARED_SESSION_AVAILABLE:
+        await close_shared_session()
 
 # Simple ping endpoint for basic connectivity
 @app.get("/ping")
@@ -326,57 +487,74 @@ async def ping():
 
 # Health check endpoint
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
     services = {
-        "ai_models": "healthy" if PRODUCTION_MODELS_AVAILABLE else "degraded",
+        "ai_models": {"ready": "healthy", "failed": "degraded"}.get(model_loader.state, "loading"),
         "data_pipeline": "healthy" if DATA_PIPELINE_AVAILABLE else "degraded",
-        "contract_scanner": "healthy" if CONTRACT_SCANNER_AVAILABLE else "degraded"
+        "contract_scanner": "healthy" if CONTRACT_SCANNER_AVAILABLE else "degraded",
+        "market_snapshot": snapshot_store.get_status()["status"] if MARKET_SNAPSHOT_AVAILABLE else "degraded"
     }
     
     # Simple health check - don't test external services during startup
     # This ensures the health check passes even if API keys are missing
     overall_status = "healthy"
     
-    return HealthResponse(
+    health = HealthResponse(
         status=overall_status,
         timestamp=datetime.now().isoformat(),
         version="1.0.0",
         services=services
-    )
+    ).model_dump()
+    
+    # Bodies differing only in timestamp are equivalent, hence a weak validator
+    etag = make_etag(encode_json({key: value for key, value in health.items() if key != "timestamp"}), weak=True)
+    return conditional_response(request, encode_json(health), etag=etag)
+
+# Readiness, unlike liveness, waits for the AI models
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until the AI models have loaded (or failed to load, leaving fallback mode)"""
+    models = model_loader.get_stats()
+    body = {
+        "status": {"ready": "ready", "failed": "degraded"}.get(model_loader.state, "starting"),
+        "models": models,
+        "timings": {**startup_timings, "model_load_seconds": models["load_seconds"]},
+        "timestamp": datetime.now().isoformat()
+    }
+    return JSONResponse(status_code=200 if model_loader.finished else 503, content=body)
+
+def _snapshot_max_age() -> float:
+    """Seconds until the snapshot refresher can publish anything newer"""
+    return snapshot_refresher.seconds_until_next_refresh() if snapshot_refresher is not None else 0
+
+def _encode_market_data(market_data: Dict) -> bytes:
+    coingecko_data = market_data.get("coingecko") or {}
+    indicators = market_data.get("market_indicators") or {}
+    
+    response_data = {
+        "price_usd": coingecko_data.get("price_usd"),
+        "volatility": coingecko_data.get("volatility"),
+        "volume_24h": coingecko_data.get("volume_24h"),
+        "market_condition": indicators.get("volatility_category", "unknown"),
+        # Time of the data rather than of the request, so unchanged data keeps its ETag
+        "timestamp": coingecko_data.get("timestamp") or market_data.get("timestamp") or datetime.now().isoformat()
+    }
+    
+    return encode_json(MarketDataResponse(**response_data).model_dump())
 
 # Market data endpoints
 @app.get("/market-data", response_model=MarketDataResponse)
-async def get_market_data():
+async def get_market_data(request: Request):
     """Get current market data"""
     try:
-        global market_data_cache, cache_timestamp
-        
-        # Check cache
-        if (cache_timestamp and 
-            (datetime.now() - cache_timestamp).total_seconds() < CACHE_DURATION and
-            market_data_cache):
-            logger.debug("Using cached market data")
-            return MarketDataResponse(**market_data_cache)
-        
-        # Fetch fresh data
-        market_data = await get_live_market_data()
-        coingecko_data = market_data.get("coingecko", {})
-        indicators = market_data.get("market_indicators", {})
+        # Encoded once per snapshot; polls with a matching If-None-Match get a 304
+        snapshot = get_current_snapshot()
+        if snapshot is not None:
+            body = snapshot.encoded("market-data", _encode_market_data)
+            return conditional_response(request, body, max_age=_snapshot_max_age())
         
-        response_data = {
-            "price_usd": coingecko_data.get("price_usd"),
-            "volatility": coingecko_data.get("volatility"),
-            "volume_24h": coingecko_data.get("volume_24h"),
-            "market_condition": indicators.get("volatility_category", "unknown"),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Update cache
-        market_data_cache = response_data
-        cache_timestamp = datetime.now()
-        
-        return MarketDataResponse(**response_data)
+        return conditional_response(request, _encode_market_data(await get_live_market_data()))
         
     except Exception as e:
         logger.error(f"Error fetching market data: {e}")
@@ -386,7 +564,8 @@ async def get_market_data():
 async def get_current_volatility():
     """Get current AVAX volatility"""
     try:
-        volatility = await get_volatility()
+        coingecko_data = await get_snapshot_section("coingecko", get_enhanced_coingecko_data)
+        volatility = (coingecko_data or {}).get("volatility")
         return {
             "volatility": volatility,
             "threshold": Config.VOLATILITY_THRESHOLD,
@@ -398,37 +577,76 @@ async def get_current_volatility():
         raise HTTPException(status_code=500, detail=f"Failed to fetch volatility: {str(e)}")
 
 # AI recommendation endpoints
+async def _encode_fee_recommendation(market_data: Dict) -> bytes:
+    recommendation = await get_production_fee_recommendation(market_data)
+    
+    return encode_json(FeeRecommendationResponse(
+        recommended_fee=recommendation["recommended_fee"],
+        confidence=recommendation["confidence"],
+        reasoning=recommendation["reasoning"],
+        market_condition=recommendation["market_condition"],
+        current_volatility=recommendation.get("current_volatility", 0),
+        timestamp=recommendation.get("prediction_timestamp", datetime.now().isoformat())
+    ).model_dump())
+
+def _fee_recommendation_key() -> str:
+    """Snapshot body key: one prediction per hour of week, and fallback bodies never outlive model loading"""
+    return f"recommend-fee:{datetime.now():%w-%H}:{model_loader.state}"
+
 @app.get("/recommend-fee", response_model=FeeRecommendationResponse)
 async def recommend_fee(
+    request: Request,
     force_refresh: bool = Query(False, description="Force refresh market data"),
     use_production: bool = Query(True, description="Use production ML models")
 ):
     """Get AI-powered DEX fee recommendation"""
     try:
-        # Get market data
-        market_data = None
-        if force_refresh or not market_data_cache:
-            market_data = await get_live_market_data()
+        if force_refresh:
+            return conditional_response(request, await _encode_fee_recommendation(await get_live_market_data()))
         
-        # Get fee recommendation using production ML models or legacy system
-        if use_production:
-            recommendation = await get_production_fee_recommendation(market_data)
-        else:
-            recommendation = await get_production_fee_recommendation(market_data)
+        # One prediction per snapshot and hour of week (time features feed the models)
+        snapshot = get_current_snapshot()
+        if snapshot is not None:
+            body = await snapshot.encoded_async(_fee_recommendation_key(), _encode_fee_recommendation)
+            return conditional_response(request, body, max_age=_snapshot_max_age())
         
-        return FeeRecommendationResponse(
-            recommended_fee=recommendation["recommended_fee"],
-            confidence=recommendation["confidence"],
-            reasoning=recommendation["reasoning"],
-            market_condition=recommendation["market_condition"],
-            current_volatility=recommendation.get("current_volatility", 0),
-            timestamp=recommendation.get("prediction_timestamp", datetime.now().isoformat())
-        )
+        return conditional_response(request, await _encode_fee_recommendation(await get_live_market_data()))
         
     except Exception as e:
         logger.error(f"Error generating fee recommendation: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendation: {str(e)}")
 
+# Server-sent event streams carrying the same bodies as /market-data and /recommend-fee
+async def _stream_market_data(snapshot) -> bytes:
+    return snapshot.encoded("market-data", _encode_market_data)
+
+async def _stream_fee_recommendation(snapshot) -> bytes:
+    return await snapshot.encoded_async(_fee_recommendation_key(), _encode_fee_recommendation)
+
+if PUSH_STREAM_AVAILABLE:
+    stream_producer.add_channel("market", _stream_market_data)
+    stream_producer.add_channel("fee-recommendation", _stream_fee_recommendation)
+
+def _event_stream(channel: str, request: Request) -> StreamingResponse:
+    if not PUSH_STREAM_AVAILABLE or not stream_producer.running:
+        raise HTTPException(status_code=503, detail="Streaming not available")
+    
+    return StreamingResponse(
+        stream_producer.stream(channel, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/stream/market")
+async def stream_market_data(request: Request):
+    """Server-sent events with the /market-data payload, sent only when it changes"""
+    return _event_stream("market", request)
+
+@app.get("/stream/fee-recommendation")
+async def stream_fee_recommendation(request: Request):
+    """Server-sent events with the /recommend-fee payload, sent only when it changes"""
+    return _event_stream("fee-recommendation", request)
+
 @app.get("/recommend-fee/production")
 async def recommend_fee_production():
     """Get production ML-based fee recommendation with detailed model info"""
@@ -439,6 +657,25 @@ async def recommend_fee_production():
         logger.error(f"Error generating production fee recommendation: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendation: {str(e)}")
 
+@app.post("/recommend-fee/batch", response_class=FastJSONResponse)
+async def recommend_fee_batch(request: FeeBatchRequest):
+    """Score what-if market scenarios with one inference pass per model"""
+    _start_lazy_model_load()
+    if not model_loader.ready:
+        raise HTTPException(status_code=503, detail=f"Production models not available ({model_loader.state})")
+    if not get_model_info().get("is_trained"):
+        raise HTTPException(status_code=503, detail="Production models are not trained yet")
+    
+    try:
+        snapshot = get_current_snapshot()
+        market_data = snapshot.data if snapshot is not None else None
+        return FastJSONResponse(await get_production_fee_batch(request.scenarios, market_data))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error scoring fee scenarios: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to score scenarios: {str(e)}")
+
 @app.get("/model-info")
 async def get_ai_model_info():
     """Get information about the trained AI models"""
@@ -467,7 +704,7 @@ async def retrain_ai_models(background_tasks: BackgroundTasks):
         "note": "This process may take several minutes"
     }
 
-@app.get("/market-analysis")
+@app.get("/market-analysis", response_class=FastJSONResponse)
 async def get_market_analysis():
     """Get comprehensive market analysis"""
     try:
@@ -479,13 +716,14 @@ async def get_market_analysis():
             "fee_recommendation": production_recommendation,
             "analysis_timestamp": datetime.now().isoformat()
         }
-        return analysis
+        # Returned as a response so the large payload skips jsonable_encoder
+        return FastJSONResponse(analysis)
     except Exception as e:
         logger.error(f"Error generating market analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate analysis: {str(e)}")
 
 # Contract scanning endpoints
-@app.post("/scan-contract", response_model=ContractScanResponse)
+@app.post("/scan-contract", response_model=ContractScanResponse, response_class=FastJSONResponse)
 async def scan_contract(request: ContractScanRequest):
     """Scan a contract for security risks"""
     try:
@@ -565,6 +803,7 @@ async def root():
         "endpoints": {
             # Core endpoints
             "health": "/health",
+            "ready": "/ready",
             "market_data": "/market-data",
             "volatility": "/volatility",
             
@@ -574,19 +813,29 @@ async def root():
             "multi_coin_analysis": "/market-data/multi-coin",
             "cross_asset_analysis": "/market-data/cross-asset",
             "sentiment_analysis": "/market-data/sentiment",
+            "pyth_prices": "/market-data/pyth",
             "specific_coin": "/coin/{coin_id}",
             
             # AI endpoints
             "recommend_fee": "/recommend-fee",
             "recommend_fee_production": "/recommend-fee/production",
+            "recommend_fee_batch": "/recommend-fee/batch",
             "model_info": "/model-info",
             "retrain_models": "/retrain-models",
             "market_analysis": "/market-analysis",
             
+            # Server-sent event streams
+            "stream_market": "/stream/market",
+            "stream_fee_recommendation": "/stream/fee-recommendation",
+            
             # Contract scanning
             "scan_contract": "/scan-contract",
             "quick_risk": "/quick-risk/{address}",
             
+            # Diagnostics
+            "cache_stats": "/cache/stats",
+            "rate_limits": "/rate-limits",
+            
             # Documentation
             "docs": "/docs"
         },
@@ -597,6 +846,40 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Get data cache occupancy and per-namespace hit/miss/eviction counters"""
+    if data_cache is None:
+        raise HTTPException(status_code=503, detail="Data cache not available")
+    
+    stats = data_cache.get_stats()
+    stats["single_flight"] = data_inflight.get_stats()
+    if price_stream is not None:
+        stats["pyth_stream"] = price_stream.get_stats()
+    if streaming_indicators is not None:
+        stats["streaming_indicators"] = streaming_indicators.get_stats()
+    if timeseries_store is not None:
+        stats["timeseries"] = timeseries_store.get_stats()
+    if analytics_stage is not None:
+        stats["derived_analytics"] = analytics_stage.get_stats()
+    if coin_batcher is not None:
+        stats["coin_batcher"] = coin_batcher.get_stats()
+    if stream_producer is not None:
+        stats["streams"] = stream_producer.get_stats()
+    stats["models"] = model_loader.get_stats()
+    stats["timestamp"] = datetime.now().isoformat()
+    return stats
+
+@app.get("/rate-limits")
+async def get_rate_limits():
+    """Get per-upstream rate limiter state, queue depth and wait times"""
+    if not RATE_LIMITER_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Request scheduler not available")
+    
+    stats = request_scheduler.get_stats()
+    stats["timestamp"] = datetime.now().isoformat()
+    return stats
+
 @app.get("/config")
 async def get_config():
     """Get current configuration (excluding sensitive data)"""
@@ -605,6 +888,7 @@ async def get_config():
         "base_fee_rate": Config.BASE_FEE_RATE,
         "volatility_threshold": Config.VOLATILITY_THRESHOLD,
         "cache_ttl": Config.CACHE_TTL,
+        "cache_swr_enabled": Config.CACHE_SWR_ENABLED,
         "model_retrain_interval": Config.MODEL_RETRAIN_INTERVAL,
         "has_api_keys": {
             "coingecko": bool(Config.COINGECKO_API_KEY),
@@ -671,7 +955,7 @@ if Config.DEBUG:
             # Test production model
             market_data = await get_live_market_data()
             recommendation = await get_production_fee_recommendation(market_data)
-            model_info = await get_model_info()
+            model_info = get_model_info()
             
             return {
                 "status": "success", 
@@ -692,6 +976,8 @@ if Config.DEBUG:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
 
+startup_timings["app_import_seconds"] = round(time.perf_counter() - _import_started, 3)
+
 # Main function to run the server
 def main():
     """Main function to run the FastAPI server"""
@@ -0,0 +1,208 @@
+"""
+Background market snapshot refresher for Aura AI Backend
+Periodically refreshes each upstream source and publishes an immutable, versioned market snapshot
+"""
+import asyncio
+import copy
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from config import Config
+from data_pipeline import OracleDataPipeline
+from rate_limiter import background_priority
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Point-in-time view of all market sources
+
+    ``data`` has the same shape as ``get_comprehensive_market_data`` and must
+    be treated as read-only: it is shared by every request that reads this
+    snapshot.
+    """
+    version: int
+    data: Dict
+    created_at: float
+    source_updated_at: Dict[str, float] = field(default_factory=dict)
+    _encoded: Dict[str, bytes] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def is_expired(self, max_age: float = Config.SNAPSHOT_MAX_AGE) -> bool:
+        return self.age > max_age
+
+    def encoded(self, key: str, encode: Callable[[Dict], bytes]) -> bytes:
+        """``encode(data)`` computed on first use and shared by every later response for this snapshot"""
+        body = self._encoded.get(key)
+        if body is None:
+            body = self._encoded[key] = encode(self.data)
+        return body
+
+    async def encoded_async(self, key: str, encode: Callable[[Dict], Awaitable[bytes]]) -> bytes:
+        """``encoded`` for bodies that need an async step, such as a model prediction"""
+        body = self._encoded.get(key)
+        if body is None:
+            body = self._encoded[key] = await encode(self.data)
+        return body
+
+class MarketSnapshotStore:
+    """Holds the latest published snapshot; reads are a single attribute lookup"""
+
+    def __init__(self):
+        self._current: Optional[MarketSnapshot] = None
+        self._version = 0
+        self._listeners: List[Callable[[MarketSnapshot], None]] = []
+
+    def current(self) -> Optional[MarketSnapshot]:
+        return self._current
+
+    def add_listener(self, listener: Callable[[MarketSnapshot], None]):
+        """Register a callback invoked with every newly published snapshot"""
+        self._listeners.append(listener)
+
+    def publish(self, data: Dict, source_updated_at: Dict[str, float]) -> MarketSnapshot:
+        self._version += 1
+        snapshot = MarketSnapshot(
+            version=self._version,
+            data=copy.deepcopy(data),
+            created_at=time.time(),
+            source_updated_at=dict(source_updated_at)
+        )
+        self._current = snapshot
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.warning(f"Market snapshot listener failed: {e}")
+        return snapshot
+
+    def get_status(self) -> Dict:
+        snapshot = self._current
+        if snapshot is None:
+            return {"status": "warming_up", "version": 0}
+
+        return {
+            "status": "stale" if snapshot.is_expired() else "healthy",
+            "version": snapshot.version,
+            "analytics_version": snapshot.data.get("analytics_version"),
+            "age_seconds": round(snapshot.age, 2),
+            "created_at": datetime.fromtimestamp(snapshot.created_at).isoformat(),
+            "source_age_seconds": {
+                name: round(time.time() - updated_at, 2)
+                for name, updated_at in snapshot.source_updated_at.items()
+            }
+        }
+
+class MarketSnapshotRefresher:
+    """Supervised asyncio task that keeps the snapshot store up to date
+
+    Each source has its own refresh interval. On every tick the sources that
+    are due are fetched concurrently (bypassing the cache), the last good
+    payload of every other source is reused, and a new snapshot is published.
+    """
+
+    def __init__(self, store: MarketSnapshotStore, intervals: Optional[Dict[str, float]] = None):
+        self.store = store
+        self.intervals = intervals or dict(Config.SNAPSHOT_INTERVALS)
+        self._sources: Dict = {}
+        self._source_updated_at: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {name: 0.0 for name in self.intervals}
+        self._task: Optional[asyncio.Task] = None
+        self.restarts = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._supervise(), name="market-snapshot-refresher")
+            logger.info(f"Market snapshot refresher started (intervals: {self.intervals})")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Market snapshot refresher stopped")
+
+    async def _supervise(self):
+        """Restart the refresh loop with capped exponential backoff if it crashes"""
+        backoff = 1.0
+        while True:
+            try:
+                await self._run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.restarts += 1
+                logger.error(f"Market snapshot refresher crashed (restart #{self.restarts} in {backoff:.0f}s): {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _run(self):
+        while True:
+            await self.refresh_due_sources()
+            await asyncio.sleep(self._seconds_until_next_due())
+
+    def _seconds_until_next_due(self) -> float:
+        return max(1.0, min(self._next_due.values()) - time.time())
+
+    def seconds_until_next_refresh(self) -> float:
+        """How long the current snapshot is guaranteed to stay current (0 when not running)"""
+        if not self.running:
+            return 0.0
+        return max(0.0, min(self._next_due.values()) - time.time())
+
+    @staticmethod
+    def _is_good(result) -> bool:
+        """A real payload: not an error, empty, or the hard-coded fallback a fetcher returns on failure"""
+        if isinstance(result, Exception) or not result:
+            return False
+        return not (isinstance(result, dict) and result.get("data_source") == "fallback")
+
+    async def refresh_due_sources(self) -> Optional[MarketSnapshot]:
+        """Fetch every source whose interval has elapsed and publish a new snapshot"""
+        now = time.time()
+        due = [name for name, next_due in self._next_due.items() if next_due <= now]
+        if not due:
+            return None
+
+        async with OracleDataPipeline() as pipeline:
+            with background_priority():
+                results = await asyncio.gather(
+                    # Half an interval of slack lets workers sharing a cache reuse each other's refreshes
+                    *[pipeline.fetch_source(name, force_refresh=True, max_age=self.intervals[name] / 2) for name in due],
+                    return_exceptions=True
+                )
+
+            refreshed: List[str] = []
+            for name, result in zip(due, results):
+                self._next_due[name] = now + self.intervals[name]
+                if not self._is_good(result):
+                    logger.warning(f"Snapshot source {name} refresh failed, keeping last good value")
+                    continue
+                self._sources[name] = result
+                self._source_updated_at[name] = now
+                refreshed.append(name)
+
+            if not refreshed:
+                return None
+
+            snapshot = self.store.publish(pipeline.combine_market_data(self._sources), self._source_updated_at)
+
+        logger.debug(f"Published market snapshot v{snapshot.version} (refreshed: {', '.join(refreshed)})")
+        return snapshot
+
+# Global snapshot store and refresher
+snapshot_store = MarketSnapshotStore()
+snapshot_refresher = MarketSnapshotRefresher(snapshot_store)
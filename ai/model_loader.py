@@ -0,0 +1,91 @@
+"""
+Deferred loading of the ML model stack for Aura AI Backend
+production_models (scikit-learn, pandas and the trained predictor) is imported in the background after startup
+"""
+import asyncio
+import importlib
+import logging
+import time
+from typing import Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+class ModelLoader:
+    """Imports the model module off the event loop and hands out its API once it is ready
+
+    The import also builds the global predictor, which loads (or trains)
+    the models, so it can take minutes; the server keeps answering from
+    fallbacks meanwhile.
+    """
+
+    def __init__(self, module_name: str = "production_models"):
+        self.module_name = module_name
+        self.module = None
+        self.state = STATE_PENDING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == STATE_READY
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (STATE_READY, STATE_FAILED)
+
+    def start(self):
+        """Begin loading in the background unless it has already started"""
+        if self.state == STATE_PENDING and self._task is None:
+            self._task = asyncio.create_task(self._load(), name=f"load-{self.module_name}")
+
+    async def _load(self):
+        self.state = STATE_LOADING
+        started = time.perf_counter()
+        try:
+            # Imports run in a worker thread so the event loop keeps serving requests
+            self.module = await asyncio.to_thread(importlib.import_module, self.module_name)
+            self.state = STATE_READY
+        except Exception as e:
+            self.state = STATE_FAILED
+            self.error = str(e)
+            logger.warning(f"Could not load {self.module_name}, running in fallback mode: {e}")
+        finally:
+            self.load_seconds = time.perf_counter() - started
+        if self.ready:
+            logger.info(f"{self.module_name} loaded in {self.load_seconds:.2f}s")
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait (starting the load if needed) until loading finished; True if the models are ready"""
+        if not self.finished:
+            self.start()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.ready
+
+    def get(self, name: str):
+        """Attribute ``name`` of the loaded module"""
+        if not self.ready:
+            raise RuntimeError(f"{self.module_name} is not loaded ({self.state})")
+        return getattr(self.module, name)
+
+    def get_stats(self) -> Dict:
+        return {
+            "module": self.module_name,
+            "state": self.state,
+            "error": self.error,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "preload": Config.MODEL_PRELOAD
+        }
+
+# Global loader for the production models
+model_loader = ModelLoader()
@@ -0,0 +1,183 @@
+"""
+NumPy inference for the Keras fee network in Aura AI Backend
+Reads the Dense/BatchNormalization weights from a Keras .h5 file, folds the batch norms into
+the following Dense layers and runs the forward pass without TensorFlow
+"""
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0, out=x),
+}
+
+# Layers that are the identity at inference time
+PASSTHROUGH_LAYERS = {"InputLayer", "Dropout", "GaussianNoise", "GaussianDropout", "AlphaDropout"}
+
+class NumpyMLP:
+    """Stack of dense layers ``activation(x @ kernel + bias)`` evaluated in float32 like Keras"""
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray, str]]):
+        for _, _, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+        self.layers = [
+            (np.ascontiguousarray(kernel, dtype=np.float32), np.asarray(bias, dtype=np.float32), activation)
+            for kernel, bias, activation in layers
+        ]
+
+    @property
+    def input_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    def predict(self, X) -> np.ndarray:
+        """Outputs of shape (rows, units), as ``keras.Model.predict`` returns them"""
+        x = np.asarray(X, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = ACTIVATIONS[activation](x)
+        return x
+
+    @classmethod
+    def from_keras_h5(cls, path: str) -> "NumpyMLP":
+        return cls(fold_batch_norms(read_keras_h5(path)))
+
+    def save(self, path: str):
+        arrays = {}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        arrays["activations"] = np.array([activation for _, _, activation in self.layers])
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyMLP":
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(activation) for activation in data["activations"]]
+            return cls([(data[f"kernel_{i}"], data[f"bias_{i}"], activation) for i, activation in enumerate(activations)])
+
+def read_keras_h5(path: str) -> List[Dict]:
+    """Inference-relevant layers of a Sequential model saved by ``model.save('*.h5')``
+
+    Returns dicts with ``type`` ("dense" or "batch_norm") and the layer's
+    weights; pass-through layers are dropped.
+    """
+    import h5py
+
+    with h5py.File(path, "r") as f:
+        config = json.loads(_text(f.attrs["model_config"]))
+        if config["class_name"] != "Sequential":
+            raise ValueError(f"Only Sequential models are supported, got {config['class_name']}")
+        weights_group = f["model_weights"] if "model_weights" in f else f
+
+        layers = []
+        for layer in config["config"]["layers"]:
+            class_name, layer_config = layer["class_name"], layer["config"]
+            if class_name in PASSTHROUGH_LAYERS:
+                continue
+            weights = _layer_weights(weights_group, layer_config["name"])
+
+            if class_name == "Dense":
+                layers.append({
+                    "type": "dense",
+                    "kernel": weights["kernel"],
+                    "bias": weights.get("bias", np.zeros(weights["kernel"].shape[1], dtype=np.float32)),
+                    "activation": layer_config.get("activation", "linear")
+                })
+            elif class_name == "BatchNormalization":
+                if layer_config.get("axis", -1) not in (-1, 1, [-1], [1]):
+                    raise ValueError(f"Unsupported BatchNormalization axis: {layer_config.get('axis')}")
+                units = weights["moving_mean"].shape[0]
+                layers.append({
+                    "type": "batch_norm",
+                    "gamma": weights.get("gamma", np.ones(units, dtype=np.float32)),
+                    "beta": weights.get("beta", np.zeros(units, dtype=np.float32)),
+                    "moving_mean": weights["moving_mean"],
+                    "moving_variance": weights["moving_variance"],
+                    "epsilon": layer_config.get("epsilon", 1e-3)
+                })
+            elif class_name == "Activation":
+                if not layers or layers[-1]["type"] != "dense" or layers[-1]["activation"] != "linear":
+                    raise ValueError("An Activation layer must follow a linear Dense layer")
+                layers[-1]["activation"] = layer_config["activation"]
+            else:
+                raise ValueError(f"Unsupported layer for NumPy inference: {class_name}")
+        return layers
+
+def fold_batch_norms(layers: List[Dict]) -> List[Tuple[np.ndarray, np.ndarray, str]]:
+    """Dense layers with every batch norm folded into the Dense layer after it
+
+    At inference a batch norm is the affine map ``x * scale + shift``, so the
+    next layer ``(x * scale + shift) @ W + b`` equals ``x @ (scale[:, None] * W)
+    + (shift @ W + b)``. Folding forward is exact whatever activation comes
+    before the batch norm (here it follows a ReLU).
+    """
+    folded = []
+    scale: Optional[np.ndarray] = None
+    shift: Optional[np.ndarray] = None
+    for layer in layers:
+        if layer["type"] == "batch_norm":
+            layer_scale = layer["gamma"].astype(np.float64) / np.sqrt(layer["moving_variance"].astype(np.float64) + layer["epsilon"])
+            layer_shift = layer["beta"].astype(np.float64) - layer["moving_mean"].astype(np.float64) * layer_scale
+            # Consecutive batch norms compose into one affine map
+            scale, shift = (layer_scale, layer_shift) if scale is None else (scale * layer_scale, shift * layer_scale + layer_shift)
+            continue
+
+        kernel = layer["kernel"].astype(np.float64)
+        bias = layer["bias"].astype(np.float64)
+        if scale is not None:
+            bias = shift @ kernel + bias
+            kernel = scale[:, None] * kernel
+            scale = shift = None
+        folded.append((kernel, bias, layer["activation"]))
+
+    if scale is not None:
+        raise ValueError("A BatchNormalization layer must be followed by a Dense layer")
+    return folded
+
+def export_keras_h5(h5_path: str, npz_path: Optional[str] = None) -> str:
+    """Write the folded NumPy weights of ``h5_path`` next to it (or to ``npz_path``)"""
+    npz_path = npz_path or os.path.splitext(h5_path)[0] + ".npz"
+    NumpyMLP.from_keras_h5(h5_path).save(npz_path)
+    logger.info(f"Exported {h5_path} to {npz_path}")
+    return npz_path
+
+def load_network(h5_path: str) -> NumpyMLP:
+    """NumPy network for ``h5_path``, from its exported .npz unless that is older than the .h5"""
+    npz_path = os.path.splitext(h5_path)[0] + ".npz"
+    if os.path.exists(npz_path) and (not os.path.exists(h5_path) or os.path.getmtime(npz_path) >= os.path.getmtime(h5_path)):
+        return NumpyMLP.load(npz_path)
+    network = NumpyMLP.from_keras_h5(h5_path)
+    try:
+        network.save(npz_path)
+    except OSError as e:
+        logger.warning(f"Could not cache NumPy weights at {npz_path}: {e}")
+    return network
+
+def _layer_weights(weights_group, layer_name: str) -> Dict[str, np.ndarray]:
+    """Weights of one layer keyed by short name (``kernel``, ``gamma``, ...)"""
+    group = weights_group[layer_name]
+    weights = {}
+    for weight_name in group.attrs.get("weight_names", []):
+        weight_name = _text(weight_name)
+        short_name = weight_name.rsplit("/", 1)[-1].split(":", 1)[0]
+        weights[short_name] = np.asarray(group[weight_name])
+    return weights
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    source = sys.argv[1] if len(sys.argv) > 1 else "models/production/neural_network.h5"
+    print(export_keras_h5(source, sys.argv[2] if len(sys.argv) > 2 else None))
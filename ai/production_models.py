@@ -4,7 +4,6 @@ Implements neural networks and ensemble methods for real-time trading
 """
 import numpy as np
 import pandas as pd
-import tensorflow as tf
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler, RobustScaler
@@ -20,13 +19,26 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from config import Config
+from nn_numpy import NumpyMLP, load_network
+from tree_ensemble import TreeEnsemble, compile_ensembles
 from data_pipeline import get_live_market_data
+from timeseries import timeseries_store
+from fee_scenarios import ScenarioPayload, classify_market_conditions, model_confidences, scenario_frame, weighted_ensemble
 
 logger = logging.getLogger(__name__)
 
+class ModelsNotTrainedError(RuntimeError):
+    """Raised when scoring is requested before any model has been trained or loaded"""
+
 class ProductionFeePredictor:
     """Production-ready ML model for DEX fee prediction"""
     
+    BASE_CONFIDENCE = {
+        'random_forest': 0.87,
+        'gradient_boosting': 0.84,
+        'neural_network': 0.81
+    }
+    
     def __init__(self):
         self.models = {}
         self.scalers = {}
@@ -39,6 +51,8 @@ class ProductionFeePredictor:
         self.models_dir = "models/production/"
         self.is_trained = False
         self.best_model_name = None
+        self._cached_prediction: Optional[Tuple[Tuple, Dict]] = None
+        self.compiled_models: Dict[str, TreeEnsemble] = {}  # tree ensembles flattened for fast scoring
         
         # Create models directory
         os.makedirs(self.models_dir, exist_ok=True)
@@ -84,8 +98,10 @@ class ProductionFeePredictor:
             self.scalers[model_name] = RobustScaler()
         self.scalers['neural_network'] = StandardScaler()
     
-    def _build_neural_network(self, input_shape: int) -> tf.keras.Model:
+    def _build_neural_network(self, input_shape: int) -> "tf.keras.Model":
         """Build an advanced neural network for fee prediction"""
+        import tensorflow as tf
+        
         model = tf.keras.Sequential([
             # Input layer with batch normalization
             tf.keras.layers.Dense(128, activation='relu', input_shape=(input_shape,)),
@@ -411,7 +427,43 @@ class ProductionFeePredictor:
             
             logger.info(f"{model_name} - Test R²: {test_r2:.4f}, CV R²: {cv_scores.mean():.4f} (±{cv_scores.std():.3f})")
         
-        # Train Neural Network
+        # Train Neural Network (TensorFlow is only needed for training, never for serving)
+        nn_results = self._train_neural_network(X_train, X_test, y_train, y_test)
+        if nn_results is not None:
+            results['neural_network'] = nn_results
+        
+        # Determine best model
+        self.best_model_name = max(results.keys(), key=lambda k: results[k]['test_r2'])
+        logger.info(f"Best performing model: {self.best_model_name} (R²: {results[self.best_model_name]['test_r2']:.4f})")
+        
+        self.is_trained = True
+        self._cached_prediction = None
+        self._save_models()
+        self.compiled_models = compile_ensembles(self.models, ['random_forest', 'gradient_boosting'])
+        
+        # Serve the network through NumPy from the weights just saved
+        nn_path = os.path.join(self.models_dir, 'neural_network.h5')
+        if self._is_keras(self.models.get('neural_network')) and os.path.exists(nn_path):
+            try:
+                self.models['neural_network'] = load_network(nn_path)
+            except Exception as e:
+                logger.warning(f"Could not convert neural network for NumPy inference: {e}")
+        
+        return results
+    
+    def _train_neural_network(self, X_train, X_test, y_train, y_test) -> Optional[Dict]:
+        """Train the Keras network; None when TensorFlow is not installed
+        
+        Without TensorFlow the previously loaded network (and its fitted
+        scaler) stays in place, untouched on disk.
+        """
+        try:
+            import tensorflow as tf
+        except ImportError:
+            kept = "keeping the previous network" if self.models.get('neural_network') is not None else "no network"
+            logger.warning(f"TensorFlow not installed, skipping neural network training ({kept})")
+            return None
+        
         logger.info("Training neural network...")
         X_train_nn = self.scalers['neural_network'].fit_transform(X_train)
         X_test_nn = self.scalers['neural_network'].transform(X_test)
@@ -451,36 +503,31 @@ class ProductionFeePredictor:
         test_mse_nn = mean_squared_error(y_test, test_pred_nn)
         test_mae_nn = mean_absolute_error(y_test, test_pred_nn)
         
-        results['neural_network'] = {
+        logger.info(f"Neural Network - Test R²: {test_r2_nn:.4f}, Epochs: {len(history.history['loss'])}")
+        
+        return {
             'test_r2': test_r2_nn,
             'test_mse': test_mse_nn,
             'test_mae': test_mae_nn,
             'epochs_trained': len(history.history['loss'])
         }
-        
-        logger.info(f"Neural Network - Test R²: {test_r2_nn:.4f}, Epochs: {len(history.history['loss'])}")
-        
-        # Determine best model
-        self.best_model_name = max(results.keys(), key=lambda k: results[k]['test_r2'])
-        logger.info(f"Best performing model: {self.best_model_name} (R²: {results[self.best_model_name]['test_r2']:.4f})")
-        
-        self.is_trained = True
-        self._save_models()
-        
-        return results
     
     def _save_models(self):
         """Save all trained models and metadata"""
         try:
             # Save sklearn models
             for model_name, model in self.models.items():
-                if model_name == 'neural_network' and model is not None:
-                    model.save(os.path.join(self.models_dir, f'{model_name}.h5'))
+                if model_name == 'neural_network':
+                    # Only a freshly trained Keras network is written; a kept one is already on disk
+                    if self._is_keras(model):
+                        model.save(os.path.join(self.models_dir, f'{model_name}.h5'))
                 elif model is not None:
                     joblib.dump(model, os.path.join(self.models_dir, f'{model_name}.pkl'))
             
-            # Save scalers
+            # Save scalers (the network's only when it was refit together with a new network)
             for scaler_name, scaler in self.scalers.items():
+                if scaler_name == 'neural_network' and not self._is_keras(self.models.get('neural_network')):
+                    continue
                 joblib.dump(scaler, os.path.join(self.models_dir, f'{scaler_name}_scaler.pkl'))
             
             # Save metadata
@@ -520,24 +567,30 @@ class ProductionFeePredictor:
                 if os.path.exists(model_path):
                     self.models[model_name] = joblib.load(model_path)
             
-            # Load neural network
-            nn_path = os.path.join(self.models_dir, 'neural_network.h5')
-            if os.path.exists(nn_path):
-                self.models['neural_network'] = tf.keras.models.load_model(nn_path)
-            
             # Load scalers
             for scaler_name in self.scalers.keys():
                 scaler_path = os.path.join(self.models_dir, f'{scaler_name}_scaler.pkl')
                 if os.path.exists(scaler_path):
                     self.scalers[scaler_name] = joblib.load(scaler_path)
             
+            # Load neural network as folded NumPy weights (no TensorFlow needed to serve)
+            nn_path = os.path.join(self.models_dir, 'neural_network.h5')
+            if os.path.exists(nn_path):
+                self.models['neural_network'] = load_network(nn_path)
+            
             self.is_trained = True
+            self.compiled_models = compile_ensembles(self.models, ['random_forest', 'gradient_boosting'])
             logger.info(f"Models loaded successfully. Best model: {self.best_model_name}")
             
         except Exception as e:
             logger.error(f"Error loading models: {e}")
             self.is_trained = False
     
+    @staticmethod
+    def _is_keras(model) -> bool:
+        """A Keras network, i.e. one trained in this process rather than loaded as NumPy weights"""
+        return model is not None and not isinstance(model, NumpyMLP)
+    
     def _extract_features_from_market_data(self, market_data: Dict) -> Optional[pd.DataFrame]:
         """Extract features from real-time market data"""
         try:
@@ -563,11 +616,16 @@ class ProductionFeePredictor:
             # Calculate derived features
             liquidity_score = (volume_24h / max(market_cap, 1)) * 100 if market_cap > 0 else 0
             
-            # Approximate features (in production, use actual historical data)
-            price_change_1h = price_change_24h * 0.08  # Approximate hourly change
-            volume_ma_7d = volume_24h * 0.92  # Rough approximation
-            volatility_ma_7d = volatility * 1.08  # Rough approximation
-            price_momentum = price_change_24h * 1.15
+            # Rolling features from the in-memory history, approximated until it covers enough time
+            history = timeseries_store.get(coingecko.get('symbol') or 'AVAX')
+            has_history = history is not None and history.history_seconds('volume') >= Config.TIMESERIES_MIN_HISTORY
+            
+            price_change_1h = history.change_pct('price', 3600) if history is not None else None
+            if price_change_1h is None:
+                price_change_1h = coingecko.get('price_change_1h') or price_change_24h * 0.08
+            volume_ma_7d = history.mean('volume', 7 * 24 * 3600) if has_history else volume_24h * 0.92
+            volatility_ma_7d = history.mean('volatility', 7 * 24 * 3600) if has_history else volatility * 1.08
+            price_momentum = price_change_24h * (1 + volatility / 20)  # same definition as the training data
             volume_ratio = volume_24h / volume_ma_7d if volume_ma_7d > 0 else 1.0
             gas_trend = (gas_price_gwei - 28) / 372
             
@@ -602,6 +660,11 @@ class ProductionFeePredictor:
             if market_data is None:
                 market_data = await get_live_market_data()
             
+            # Reuse the last prediction while the derived analytics (and the hour feature) are unchanged
+            cache_key = self._prediction_cache_key(market_data)
+            if cache_key is not None and self._cached_prediction is not None and self._cached_prediction[0] == cache_key:
+                return dict(self._cached_prediction[1])
+            
             # Extract features
             features_df = self._extract_features_from_market_data(market_data)
             if features_df is None or features_df.empty:
@@ -625,10 +688,7 @@ class ProductionFeePredictor:
                     features_scaled = self.scalers[model_name].transform(features_df[self.feature_columns])
                     
                     # Make prediction
-                    if model_name == 'neural_network':
-                        pred = model.predict(features_scaled, verbose=0)[0][0]
-                    else:
-                        pred = model.predict(features_scaled)[0]
+                    pred = float(np.ravel(self._predict(model_name, model, features_scaled))[0])
                     
                     predictions[model_name] = pred
                     confidences[model_name] = self._calculate_model_confidence(model_name, features_df.iloc[0])
@@ -673,7 +733,7 @@ class ProductionFeePredictor:
             # Classify market condition
             market_condition = self._classify_market_condition(features_df.iloc[0])
             
-            return {
+            result = {
                 "recommended_fee": round(final_prediction, 4),
                 "confidence": round(primary_confidence, 3),
                 "reasoning": reasoning,
@@ -685,19 +745,98 @@ class ProductionFeePredictor:
                 "features_used": len(self.feature_columns),
                 "prediction_timestamp": datetime.now().isoformat()
             }
+            if cache_key is not None:
+                self._cached_prediction = (cache_key, result)
+            return dict(result)
             
         except Exception as e:
             logger.error(f"Error in fee prediction: {e}")
             return self._fallback_prediction()
     
+    async def predict_batch(self, scenarios: ScenarioPayload, market_data: Optional[Dict] = None) -> Dict:
+        """Score many what-if feature rows with one call per model
+        
+        Features missing from the scenarios are filled from the live feature
+        row; results are returned column-wise in scenario order.
+        """
+        if market_data is None:
+            market_data = await get_live_market_data()
+        baseline_df = self._extract_features_from_market_data(market_data) if market_data else None
+        baseline = baseline_df.iloc[0].to_dict() if baseline_df is not None and not baseline_df.empty else None
+        
+        if not self.is_trained:
+            raise ModelsNotTrainedError("Production models are not trained yet")
+        
+        # Scaling and scoring thousands of rows is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._score_batch, scenarios, baseline)
+    
+    def _score_batch(self, scenarios: ScenarioPayload, baseline: Optional[Dict]) -> Dict:
+        """Feature matrix for the scenarios and every model's predictions, column-wise"""
+        features_df = scenario_frame(scenarios, self.feature_columns, baseline, Config.FEE_BATCH_MAX_ROWS)
+        
+        predictions = {}
+        confidences = {}
+        for model_name, model in self.models.items():
+            if model is None:
+                continue
+            try:
+                features_scaled = self.scalers[model_name].transform(features_df)
+                pred = np.ravel(self._predict(model_name, model, features_scaled))
+                predictions[model_name] = np.asarray(pred, dtype=float)
+                confidences[model_name] = model_confidences(self.BASE_CONFIDENCE.get(model_name, 0.75), features_df)
+            except Exception as e:
+                logger.warning(f"Error with {model_name} batch: {e}")
+                continue
+        
+        if not predictions:
+            raise RuntimeError("No model could score the scenarios")
+        
+        if self.best_model_name and self.best_model_name in predictions:
+            primary_prediction = predictions[self.best_model_name]
+            primary_confidence = confidences[self.best_model_name]
+        else:
+            primary_prediction = np.mean(list(predictions.values()), axis=0)
+            primary_confidence = np.mean(list(confidences.values()), axis=0)
+        
+        return {
+            "count": len(features_df),
+            "primary_model": self.best_model_name,
+            "recommended_fee": np.round(np.clip(primary_prediction, 0.05, 2.5), 4),
+            "confidence": np.round(primary_confidence, 3),
+            "ensemble_prediction": np.round(weighted_ensemble(predictions, confidences), 4),
+            "market_condition": classify_market_conditions(features_df).tolist(),
+            "all_predictions": {k: np.round(v, 4) for k, v in predictions.items()},
+            "baseline": baseline,
+            "features_used": len(self.feature_columns),
+            "prediction_timestamp": datetime.now().isoformat()
+        }
+    
+    def _predict(self, model_name: str, model, features_scaled: np.ndarray) -> np.ndarray:
+        """Model outputs; a Keras network only appears here right after training when conversion failed
+        
+        Small inputs go through the flattened trees, which skip sklearn's
+        per-call overhead; sklearn is faster on large batches.
+        """
+        compiled = self.compiled_models.get(model_name)
+        if compiled is not None and len(features_scaled) <= Config.TREE_COMPILED_MAX_ROWS:
+            return compiled.predict(features_scaled)
+        if isinstance(model, NumpyMLP) or not hasattr(model, 'layers'):
+            return model.predict(features_scaled)
+        return model.predict(features_scaled, verbose=0, batch_size=len(features_scaled))
+    
+    @staticmethod
+    def _prediction_cache_key(market_data: Dict) -> Optional[Tuple]:
+        """Analytics version plus the time features, or None for unversioned market data"""
+        version = market_data.get('analytics_version')
+        if version is None:
+            return None
+        now = datetime.now()
+        return (version, now.hour, now.weekday())
+    
     def _calculate_model_confidence(self, model_name: str, features: pd.Series) -> float:
         """Calculate confidence based on model performance and feature values"""
         # Base confidence from model performance
-        base_confidence = {
-            'random_forest': 0.87,
-            'gradient_boosting': 0.84,
-            'neural_network': 0.81
-        }.get(model_name, 0.75)
+        base_confidence = self.BASE_CONFIDENCE.get(model_name, 0.75)
         
         # Adjust confidence based on feature values
         volatility = features['volatility']
@@ -821,6 +960,10 @@ async def get_production_fee_recommendation(market_data: Optional[Dict] = None)
     """Get production-ready ML fee recommendation"""
     return await production_fee_predictor.predict_optimal_fee(market_data)
 
+async def get_production_fee_batch(scenarios: ScenarioPayload, market_data: Optional[Dict] = None) -> Dict:
+    """Score a batch of what-if feature rows with the production models"""
+    return await production_fee_predictor.predict_batch(scenarios, market_data)
+
 async def train_production_models() -> Dict:
     """Train production models"""
     return production_fee_predictor.train_models()
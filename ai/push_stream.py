@@ -0,0 +1,203 @@
+"""
+Server-sent event streams for Aura AI Backend
+One producer turns each market snapshot into per-channel messages and fans them out to every subscriber
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from config import Config
+from http_cache import make_etag
+from market_snapshot import MarketSnapshot, MarketSnapshotStore, snapshot_store
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE = b": keepalive\n\n"
+
+@dataclass(frozen=True)
+class StreamMessage:
+    event: str
+    id: str
+    data: bytes  # single-line JSON
+
+    def encode(self) -> bytes:
+        return b"event: %s\nid: %s\ndata: %s\n\n" % (self.event.encode(), self.id.encode(), self.data)
+
+class Subscription:
+    """Latest-value slot for one client: a newer message replaces one that has not been sent yet"""
+    __slots__ = ("_pending", "_ready", "dropped")
+
+    def __init__(self):
+        self._pending: Optional[StreamMessage] = None
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, message: StreamMessage):
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = message
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[StreamMessage]:
+        """The pending message, or None if nothing arrived within ``timeout`` seconds"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        message, self._pending = self._pending, None
+        return message
+
+class Broadcaster:
+    """Fan-out of one event channel; publishing an unchanged payload is a no-op
+
+    Publishing never blocks on clients: each subscriber only holds the most
+    recent message it has not consumed yet, so a slow client skips
+    intermediate updates instead of queueing them.
+    """
+
+    def __init__(self, event: str):
+        self.event = event
+        self.latest: Optional[StreamMessage] = None
+        self.version: Optional[int] = None  # snapshot version ``latest`` was produced from
+        self._subscribers: Set[Subscription] = set()
+        self.stats = {"published": 0, "unchanged": 0, "dropped": 0}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, data: bytes, version: Optional[int] = None) -> bool:
+        """Send ``data`` to every subscriber unless it equals the last message"""
+        self.version = version
+        message_id = make_etag(data).strip('"')
+        if self.latest is not None and self.latest.id == message_id:
+            self.stats["unchanged"] += 1
+            return False
+
+        self.latest = StreamMessage(self.event, message_id, data)
+        for subscription in self._subscribers:
+            subscription.offer(self.latest)
+        self.stats["published"] += 1
+        return True
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """New subscription primed with the latest message unless the client already has it"""
+        subscription = Subscription()
+        if self.latest is not None and self.latest.id != last_event_id:
+            subscription.offer(self.latest)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            self.stats["dropped"] += subscription.dropped
+
+    def stream(self, last_event_id: Optional[str] = None,
+               heartbeat: float = Config.STREAM_HEARTBEAT_SECONDS) -> AsyncIterator[bytes]:
+        """SSE frames for one client, with keepalive comments while nothing changes
+
+        The subscription is registered immediately, before the first frame is
+        requested, so no message published in between is missed.
+        """
+        return self._frames(self.subscribe(last_event_id), heartbeat)
+
+    async def _frames(self, subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                message = await subscription.next(heartbeat)
+                yield message.encode() if message is not None else KEEPALIVE
+        finally:
+            self.unsubscribe(subscription)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "subscribers": self.subscriber_count,
+            "dropped": self.stats["dropped"] + sum(subscription.dropped for subscription in self._subscribers),
+            "latest_id": self.latest.id if self.latest is not None else None
+        }
+
+class SnapshotStreamProducer:
+    """Single producer feeding the stream channels from published market snapshots
+
+    Publishing a snapshot only flags it; the producer task then encodes each
+    channel that has subscribers for the newest snapshot, so snapshots
+    published while it was busy are skipped rather than queued.
+    """
+
+    def __init__(self, store: MarketSnapshotStore):
+        self.store = store
+        self.channels: Dict[str, Tuple[Broadcaster, Callable[[MarketSnapshot], Awaitable[bytes]]]] = {}
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        store.add_listener(self._on_snapshot)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_channel(self, name: str, encode: Callable[[MarketSnapshot], Awaitable[bytes]]) -> Broadcaster:
+        broadcaster = Broadcaster(name)
+        self.channels[name] = (broadcaster, encode)
+        return broadcaster
+
+    def _on_snapshot(self, snapshot: MarketSnapshot):
+        self._changed.set()
+
+    def start(self):
+        if not self.running:
+            self._changed = asyncio.Event()
+            self._changed.set()
+            self._task = asyncio.create_task(self._run(), name="snapshot-stream-producer")
+            logger.info(f"Snapshot stream producer started (channels: {', '.join(self.channels)})")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Snapshot stream producer stopped")
+
+    async def _run(self):
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            await self.produce()
+
+    async def produce(self):
+        """Publish the current snapshot to every channel that has subscribers"""
+        snapshot = self.store.current()
+        if snapshot is None:
+            return
+        for name, (broadcaster, encode) in self.channels.items():
+            if not broadcaster.subscriber_count or broadcaster.version == snapshot.version:
+                continue
+            try:
+                broadcaster.publish(await encode(snapshot), snapshot.version)
+            except Exception as e:
+                logger.warning(f"Failed to produce {name} stream message: {e}")
+
+    def stream(self, name: str, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """SSE frames of channel ``name`` for a new client"""
+        broadcaster, _ = self.channels[name]
+        frames = broadcaster.stream(last_event_id)
+        current = self.store.current()
+        if current is not None and broadcaster.version != current.version:
+            # Channels without subscribers are not produced; catch this one up
+            self._changed.set()
+        return frames
+
+    def get_stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "channels": {name: broadcaster.get_stats() for name, (broadcaster, _) in self.channels.items()}
+        }
+
+# Global stream producer for market snapshots
+stream_producer = SnapshotStreamProducer(snapshot_store)
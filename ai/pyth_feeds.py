@@ -0,0 +1,165 @@
+"""
+Pyth Hermes price feed registry and batch price fetching for Aura AI Backend
+Resolves symbol -> feed id once (persisted to disk) and fetches many prices in one request
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from config import Config
+from rate_limiter import scheduler
+
+logger = logging.getLogger(__name__)
+
+def normalize_feed_id(feed_id: str) -> str:
+    """Hermes returns ids with or without a 0x prefix depending on the endpoint"""
+    feed_id = feed_id.lower()
+    return feed_id[2:] if feed_id.startswith("0x") else feed_id
+
+def split_symbol(symbol: str) -> tuple:
+    base, _, quote = symbol.upper().partition("/")
+    return base, quote or "USD"
+
+class PythFeedRegistry:
+    """Symbol -> Hermes price feed id mapping
+
+    The crypto feed list is downloaded at most once per ``refresh_interval``
+    and persisted as JSON so restarts do not need to re-resolve ids.
+    """
+
+    def __init__(self, path: str = Config.PYTH_FEED_REGISTRY_PATH,
+                 refresh_interval: int = Config.PYTH_FEED_REGISTRY_TTL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.feeds: Dict[str, Dict] = {}  # "AVAX/USD" -> {"id", "base", "quote"}
+        self.resolved_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+            self.feeds = stored.get("feeds", {})
+            self.resolved_at = stored.get("resolved_at", 0.0)
+            logger.info(f"Loaded {len(self.feeds)} Pyth feed ids from {self.path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Pyth feed registry {self.path}: {e}")
+
+    def _save(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"resolved_at": self.resolved_at, "feeds": self.feeds}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist Pyth feed registry: {e}")
+
+    def is_stale(self) -> bool:
+        return time.time() - self.resolved_at > self.refresh_interval
+
+    async def resolve(self, session: aiohttp.ClientSession, symbols: Iterable[str]) -> Dict[str, Dict]:
+        """Return feed info for each known symbol, refreshing the registry when stale or incomplete"""
+        symbols = [symbol.upper() for symbol in symbols]
+        missing = [symbol for symbol in symbols if symbol not in self.feeds]
+
+        # Unknown symbols only trigger a reload once the current list has aged a little,
+        # so a symbol Hermes does not list cannot cause a download on every request
+        recently_resolved = time.time() - self.resolved_at < 60
+        if self.is_stale() or (missing and not recently_resolved):
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self.is_stale() or any(symbol not in self.feeds for symbol in missing):
+                    await self.refresh(session)
+
+        return {symbol: self.feeds[symbol] for symbol in symbols if symbol in self.feeds}
+
+    async def refresh(self, session: aiohttp.ClientSession):
+        """Download the Hermes crypto feed list and rebuild the symbol map"""
+        url = f"{Config.PYTH_HERMES_URL}/v2/price_feeds"
+        async with scheduler.request(session, "hermes", "GET", url, params={"asset_type": "crypto"}) as response:
+            if response.status != 200:
+                logger.error(f"Pyth feeds API error: {response.status}")
+                return
+            feeds = await response.json()
+
+        resolved = {}
+        for feed in feeds:
+            attrs = feed.get("attributes", {})
+            base = attrs.get("base", "").upper()
+            quote = attrs.get("quote_currency", "").upper()
+            if not base or not quote:
+                continue
+            # Keep the first listing per pair; Hermes lists the canonical spot feed first
+            resolved.setdefault(f"{base}/{quote}", {
+                "id": normalize_feed_id(feed["id"]),
+                "base": attrs.get("base", base),
+                "quote": attrs.get("quote_currency", quote)
+            })
+
+        self.feeds = resolved
+        self.resolved_at = time.time()
+        self._save()
+        logger.info(f"Resolved {len(resolved)} Pyth price feeds")
+
+def parse_price_update(parsed_feed: Dict, symbol: str, feed_info: Dict) -> Dict:
+    """Convert a Hermes parsed price update into the pipeline's price dict"""
+    price_info = parsed_feed["price"]
+
+    price = int(price_info["price"])
+    expo = int(price_info["expo"])
+    confidence = int(price_info["conf"])
+
+    # Calculate actual price (Pyth prices use scaled integers)
+    actual_price = price * (10 ** expo)
+    confidence_interval = confidence * (10 ** expo)
+
+    return {
+        "symbol": symbol,
+        "price": actual_price,
+        "confidence": confidence_interval,
+        "confidence_ratio": confidence_interval / abs(actual_price) if actual_price != 0 else 0,
+        "publish_time": price_info["publish_time"],
+        "feed_id": feed_info["id"],
+        "base": feed_info.get("base", split_symbol(symbol)[0]),
+        "quote": feed_info.get("quote", split_symbol(symbol)[1]),
+        "timestamp": datetime.now().isoformat()
+    }
+
+async def fetch_latest_prices(session: aiohttp.ClientSession, feeds: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Fetch the latest prices for many feeds with a single ``ids[]`` batch request"""
+    if not feeds:
+        return {}
+
+    symbols_by_id = {info["id"]: symbol for symbol, info in feeds.items()}
+    params: List[tuple] = [("ids[]", feed_id) for feed_id in symbols_by_id]
+    params.append(("parsed", "true"))
+
+    url = f"{Config.PYTH_HERMES_URL}/v2/updates/price/latest"
+    async with scheduler.request(session, "hermes", "GET", url, params=params) as response:
+        if response.status != 200:
+            logger.error(f"Pyth price API error: {response.status}")
+            return {}
+        price_data = await response.json()
+
+    prices = {}
+    for parsed_feed in (price_data or {}).get("parsed", []):
+        symbol = symbols_by_id.get(normalize_feed_id(parsed_feed.get("id", "")))
+        if symbol is not None:
+            prices[symbol] = parse_price_update(parsed_feed, symbol, feeds[symbol])
+    return prices
+
+# Global registry instance
+feed_registry = PythFeedRegistry()
@@ -0,0 +1,170 @@
+"""
+Pyth Hermes streaming price subscriber for Aura AI Backend
+Keeps an in-memory latest-price table updated push-style from the Hermes SSE endpoint
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+from config import Config
+from http_session import get_shared_session
+from pyth_feeds import PythFeedRegistry, feed_registry, normalize_feed_id, parse_price_update
+from rate_limiter import background_priority, scheduler
+
+logger = logging.getLogger(__name__)
+
+class PythPriceStream:
+    """Long-running subscriber to ``/v2/updates/price/stream``
+
+    Every server-sent event replaces the entry for its symbol in ``latest``.
+    The connection is re-established with jittered exponential backoff
+    whenever it drops (Hermes also closes streams after 24 hours).
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None,
+                 registry: PythFeedRegistry = feed_registry,
+                 max_age: float = Config.PYTH_STREAM_MAX_AGE,
+                 max_backoff: float = Config.PYTH_STREAM_MAX_BACKOFF):
+        self.symbols = [symbol.upper() for symbol in (symbols or Config.PYTH_SYMBOLS)]
+        self.registry = registry
+        self.max_age = max_age
+        self.max_backoff = max_backoff
+        self.latest: Dict[str, Dict] = {}
+        self.updated_at: Dict[str, float] = {}
+        self.stats = {"connects": 0, "messages": 0, "errors": 0}
+        self._listeners: List[Callable[[str, Dict], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_listener(self, listener: Callable[[str, Dict], None]):
+        """Register a callback invoked with ``(symbol, price_data)`` for every update"""
+        self._listeners.append(listener)
+
+    def get_price(self, symbol: str) -> Optional[Dict]:
+        """Latest streamed price for ``symbol`` if it is fresher than ``max_age``"""
+        symbol = symbol.upper()
+        updated_at = self.updated_at.get(symbol)
+        if updated_at is None or time.time() - updated_at > self.max_age:
+            return None
+        return self.latest[symbol]
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="pyth-price-stream")
+            logger.info(f"Pyth price stream started for {', '.join(self.symbols)}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Pyth price stream stopped")
+
+    async def _run(self):
+        with background_priority():
+            await self._reconnect_loop()
+
+    async def _reconnect_loop(self):
+        backoff = 1.0
+        while True:
+            messages_before = self.stats["messages"]
+            try:
+                await self._connect_and_consume()
+                logger.info("Pyth price stream closed by server, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Pyth price stream error: {e}")
+
+            # A connection that delivered data resets the backoff
+            if self.stats["messages"] > messages_before:
+                backoff = 1.0
+            delay = backoff * random.uniform(0.5, 1.0)
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _connect_and_consume(self):
+        session = get_shared_session()
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                await self._consume(own_session)
+        else:
+            await self._consume(session)
+
+    async def _consume(self, session: aiohttp.ClientSession):
+        feeds = await self.registry.resolve(session, self.symbols)
+        if not feeds:
+            raise RuntimeError("no Pyth feed ids resolved for streaming")
+
+        symbols_by_id = {info["id"]: symbol for symbol, info in feeds.items()}
+        params = [("ids[]", feed_id) for feed_id in symbols_by_id]
+        params.append(("parsed", "true"))
+
+        url = f"{Config.PYTH_HERMES_URL}/v2/updates/price/stream"
+        timeout = aiohttp.ClientTimeout(total=None, connect=Config.HTTP_CONNECT_TIMEOUT,
+                                        sock_read=Config.PYTH_STREAM_READ_TIMEOUT)
+
+        async with scheduler.request(session, "hermes", "GET", url, params=params, timeout=timeout,
+                                     headers={"Accept": "text/event-stream"}) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Hermes stream returned HTTP {response.status}")
+
+            self.stats["connects"] += 1
+            data_lines: List[str] = []
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                elif not line and data_lines:
+                    # A blank line terminates the event
+                    self._handle_event("\n".join(data_lines), symbols_by_id, feeds)
+                    data_lines = []
+
+    def _handle_event(self, payload: str, symbols_by_id: Dict[str, str], feeds: Dict[str, Dict]):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.debug("Skipping non-JSON Pyth stream event")
+            return
+
+        now = time.time()
+        for parsed_feed in event.get("parsed", []):
+            symbol = symbols_by_id.get(normalize_feed_id(parsed_feed.get("id", "")))
+            if symbol is None:
+                continue
+
+            price_data = parse_price_update(parsed_feed, symbol, feeds[symbol])
+            price_data["data_source"] = "pyth_stream"
+            self.latest[symbol] = price_data
+            self.updated_at[symbol] = now
+            self.stats["messages"] += 1
+
+            for listener in self._listeners:
+                try:
+                    listener(symbol, price_data)
+                except Exception as e:
+                    logger.warning(f"Pyth stream listener failed: {e}")
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        return {
+            **self.stats,
+            "running": self.running,
+            "symbols": self.symbols,
+            "age_seconds": {symbol: round(now - updated_at, 3) for symbol, updated_at in self.updated_at.items()}
+        }
+
+# Global stream instance
+price_stream = PythPriceStream()
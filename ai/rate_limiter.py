@@ -0,0 +1,246 @@
+"""
+Per-upstream rate limiting and request scheduling for Aura AI Backend
+Token bucket per upstream API with priority queueing, Retry-After handling and adaptive backoff
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from config import Config
+from deadline import DeadlineExceeded, remaining, upstream_timeout, wait_within_deadline
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# Priority of the work running in the current task; child tasks inherit it
+request_priority = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+@contextmanager
+def background_priority():
+    """Run the enclosed block (and tasks it creates) at background priority"""
+    token = request_priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class UpstreamLimiter:
+    """Token bucket for one upstream API with a priority wait queue
+
+    Waiters are served lowest priority value first, FIFO within a priority.
+    The refill rate adapts AIMD-style: it is halved whenever the upstream
+    throttles us and recovers additively on every successful response.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = rate * 0.1
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self._updated = time.monotonic()
+        self._waiters: List = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.stats = {
+            "granted": 0,
+            "throttled": 0,
+            "max_queue_depth": 0,
+            "wait_seconds": {name: 0.0 for name in PRIORITY_NAMES.values()},
+            "waits": {name: 0 for name in PRIORITY_NAMES.values()},
+            "max_wait_seconds": 0.0
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: Optional[int] = None):
+        """Wait for a request slot"""
+        if priority is None:
+            priority = request_priority.get()
+        started = time.monotonic()
+
+        self._refill(started)
+        if not self._waiters and self.tokens >= 1 and started >= self.blocked_until:
+            self.tokens -= 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue_depth)
+            if self._dispatcher is None or self._dispatcher.done():
+                self._dispatcher = asyncio.create_task(self._dispatch(), name=f"rate-limiter-{self.name}")
+            await future
+
+        waited = time.monotonic() - started
+        priority_name = PRIORITY_NAMES.get(priority, str(priority))
+        self.stats["granted"] += 1
+        self.stats["waits"][priority_name] = self.stats["waits"].get(priority_name, 0) + 1
+        self.stats["wait_seconds"][priority_name] = self.stats["wait_seconds"].get(priority_name, 0.0) + waited
+        self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+
+    async def _dispatch(self):
+        """Hand out tokens to queued waiters as they become available"""
+        while True:
+            # Skip waiters that gave up (cancelled) while queued
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                return
+
+            now = time.monotonic()
+            self._refill(now)
+            delay = self.blocked_until - now
+            if delay <= 0 and self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            self.tokens -= 1
+            _, _, future = heapq.heappop(self._waiters)
+            future.set_result(None)
+
+    def on_success(self):
+        self.consecutive_throttles = 0
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> float:
+        """Record a 429 and block the upstream; returns the seconds until it may be retried"""
+        self.stats["throttled"] += 1
+        self.consecutive_throttles += 1
+        self.rate = max(self.min_rate, self.rate * 0.5)
+        self.tokens = 0.0
+
+        if retry_after is None:
+            retry_after = min(2.0 ** self.consecutive_throttles, Config.RATE_LIMIT_MAX_BACKOFF)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"{self.name} throttled us; backing off {retry_after:.1f}s (rate now {self.rate:.2f}/s)")
+        return retry_after
+
+    def get_stats(self) -> Dict:
+        waits = self.stats["waits"]
+        return {
+            "rate_per_second": round(self.rate, 3),
+            "base_rate_per_second": self.base_rate,
+            "burst": self.burst,
+            "tokens": round(min(self.burst, self.tokens + (time.monotonic() - self._updated) * self.rate), 2),
+            "queue_depth": self.queue_depth,
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            "granted": self.stats["granted"],
+            "throttled": self.stats["throttled"],
+            "max_queue_depth": self.stats["max_queue_depth"],
+            "max_wait_ms": round(self.stats["max_wait_seconds"] * 1000, 2),
+            "avg_wait_ms": {
+                name: round(self.stats["wait_seconds"][name] / count * 1000, 2) if count else 0.0
+                for name, count in waits.items()
+            }
+        }
+
+class RequestScheduler:
+    """Routes outgoing HTTP requests through the limiter of their upstream"""
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None,
+                 bursts: Optional[Dict[str, float]] = None,
+                 enabled: bool = Config.RATE_LIMIT_ENABLED):
+        self.limits = limits or dict(Config.RATE_LIMITS)
+        self.bursts = bursts or dict(Config.RATE_LIMIT_BURSTS)
+        self.enabled = enabled
+        self.limiters: Dict[str, UpstreamLimiter] = {}
+
+    def limiter(self, upstream: str) -> UpstreamLimiter:
+        if upstream not in self.limiters:
+            rate = self.limits.get(upstream, 10.0)
+            self.limiters[upstream] = UpstreamLimiter(upstream, rate, self.bursts.get(upstream, rate))
+        return self.limiters[upstream]
+
+    async def acquire(self, upstream: str, priority: Optional[int] = None):
+        if self.enabled:
+            await self.limiter(upstream).acquire(priority)
+
+    @asynccontextmanager
+    async def request(self, session: aiohttp.ClientSession, upstream: str, method: str, url: str, **kwargs):
+        """Rate-limited ``session.request``; 429s are retried when the upstream asks for a short wait
+
+        Used as ``async with scheduler.request(session, "coingecko", "GET", url) as response``.
+        A throttled response is handed back to the caller once retries are
+        exhausted or the requested wait is too long for an inline retry.
+        Under a request deadline, queueing and the call itself only get the
+        time left, and running out raises DeadlineExceeded.
+        """
+        limiter = self.limiter(upstream)
+        for attempt in range(Config.RATE_LIMIT_MAX_RETRIES + 1):
+            await wait_within_deadline(self.acquire(upstream))
+            timeout = upstream_timeout()
+            try:
+                if timeout is not None and "timeout" not in kwargs:
+                    response = await session.request(method, url, timeout=timeout, **kwargs)
+                else:
+                    response = await session.request(method, url, **kwargs)
+            except asyncio.TimeoutError:
+                left = remaining()
+                if left is not None and left <= 0.01:
+                    raise DeadlineExceeded(f"Request deadline exceeded waiting for {upstream}") from None
+                raise
+
+            throttled = response.status == 429 or (response.status == 503 and "Retry-After" in response.headers)
+            if not throttled:
+                limiter.on_success()
+                break
+
+            delay = limiter.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+            left = remaining()
+            if (attempt == Config.RATE_LIMIT_MAX_RETRIES or delay > Config.RATE_LIMIT_MAX_RETRY_WAIT
+                    or (left is not None and delay >= left)):
+                break
+            response.release()
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "upstreams": {name: limiter.get_stats() for name, limiter in self.limiters.items()}
+        }
+
+# Global scheduler instance
+scheduler = RequestScheduler()
@@ -0,0 +1,75 @@
+"""
+Batched JSON-RPC client for Aura AI Backend
+Sends several Ethereum JSON-RPC calls to the Avalanche C-Chain in one HTTP round trip
+"""
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+from config import Config
+from rate_limiter import scheduler
+
+logger = logging.getLogger(__name__)
+
+class JsonRpcError(Exception):
+    """Error object returned by the node for a single call in a batch"""
+
+    def __init__(self, method: str, error: Any):
+        self.method = method
+        self.error = error
+        message = error.get("message", error) if isinstance(error, dict) else error
+        super().__init__(f"{method}: {message}")
+
+def hex_to_int(value: Optional[str]) -> int:
+    """Decode a JSON-RPC quantity ("0x1a"); missing values decode to 0"""
+    if not value:
+        return 0
+    return int(value, 16)
+
+class JsonRpcBatchClient:
+    """Sends a list of ``(method, params)`` calls as a single JSON-RPC batch request
+
+    Results come back in call order. A call the node rejected is returned as a
+    ``JsonRpcError`` instance in its slot so one failing method does not hide
+    the others; transport failures raise.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, url: Optional[str] = None):
+        self.session = session
+        self.url = url or Config.AVALANCHE_RPC_URL
+
+    async def batch(self, calls: Sequence[Tuple[str, list]]) -> List[Any]:
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": list(params), "id": request_id}
+            for request_id, (method, params) in enumerate(calls)
+        ]
+
+        async with scheduler.request(self.session, "rpc", "POST", self.url, json=payload) as response:
+            if response.status != 200:
+                raise RuntimeError(f"JSON-RPC batch returned HTTP {response.status}")
+            replies = await response.json(content_type=None)
+
+        # A node that rejects the whole batch answers with a single error object
+        if isinstance(replies, dict):
+            raise JsonRpcError("batch", replies.get("error", replies))
+
+        # Replies may arrive in any order; match them back up by id
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        results: List[Any] = []
+        for request_id, (method, _) in enumerate(calls):
+            reply = by_id.get(request_id)
+            if reply is None:
+                results.append(JsonRpcError(method, "missing from batch response"))
+            elif "error" in reply:
+                results.append(JsonRpcError(method, reply["error"]))
+            else:
+                results.append(reply.get("result"))
+        return results
+
+    async def call(self, method: str, params: Optional[list] = None) -> Any:
+        """Single call convenience wrapper; raises instead of returning the error"""
+        result = (await self.batch([(method, params or [])]))[0]
+        if isinstance(result, JsonRpcError):
+            raise result
+        return result
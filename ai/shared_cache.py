@@ -0,0 +1,162 @@
+"""
+Cross-process cache backend for Aura AI Backend
+SQLite (WAL mode) store shared by every worker on a host, plus fetch leases so only one worker hits an upstream
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class SQLiteCacheBackend:
+    """Key/value entries and fetch leases in a WAL-mode SQLite file
+
+    WAL lets every worker read while one writes, so lookups never block on a
+    concurrent fetch. Calls are synchronous and made from the event loop, so
+    a write waits at most ``busy_timeout`` for another worker's write lock: a
+    failed write is a skipped write-through, and a lease that cannot be
+    written is treated as denied (the caller polls and, after
+    ``CACHE_LEASE_WAIT``, fetches itself). Values are stored as the JSON text
+    ``DataCache`` already produces for its size accounting. Connections are
+    opened lazily per process, so a backend created before gunicorn forks is
+    safe to inherit.
+    """
+    name = "sqlite"
+
+    def __init__(self, path: str = Config.CACHE_SQLITE_PATH, lease_ttl: float = Config.CACHE_LEASE_TTL,
+                 busy_timeout: float = Config.CACHE_SQLITE_BUSY_TIMEOUT):
+        self.path = path
+        self.lease_ttl = lease_ttl
+        self.busy_timeout = busy_timeout
+        self._token = uuid.uuid4().hex[:8]
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.stats = {"reads": 0, "read_hits": 0, "writes": 0, "leases_granted": 0, "leases_denied": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @property
+    def owner(self) -> str:
+        """Lease owner id; includes the pid so a forked worker never shares its parent's identity"""
+        return f"{os.getpid()}-{self._token}"
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._connection().execute(sql, params)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return ``(json_text, stored_at)`` or None"""
+        self.stats["reads"] += 1
+        try:
+            row = self._execute("SELECT value, stored_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return None
+        if row is not None:
+            self.stats["read_hits"] += 1
+        return row
+
+    def set(self, key: str, payload: str, stored_at: float):
+        try:
+            # Never let a slower writer replace a newer entry from another worker
+            self._execute(
+                "INSERT INTO cache_entries (key, value, stored_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, stored_at = excluded.stored_at "
+                "WHERE excluded.stored_at >= cache_entries.stored_at",
+                (key, payload, stored_at)
+            )
+            self.stats["writes"] += 1
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    def delete_older_than(self, cutoff: float) -> int:
+        try:
+            cursor = self._execute("DELETE FROM cache_entries WHERE stored_at < ?", (cutoff,))
+            self._execute("DELETE FROM cache_leases WHERE expires_at < ?", (time.time(),))
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Shared cache sweep failed: {e}")
+            return 0
+
+    def clear(self):
+        try:
+            self._execute("DELETE FROM cache_entries")
+            self._execute("DELETE FROM cache_leases")
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Shared cache clear failed: {e}")
+
+    def try_lease(self, key: str) -> bool:
+        """Claim the right to fetch ``key``; expired leases of crashed workers are taken over"""
+        now = time.time()
+        try:
+            cursor = self._execute(
+                "INSERT INTO cache_leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE cache_leases.expires_at < ? OR cache_leases.owner = excluded.owner",
+                (key, self.owner, now + self.lease_ttl, now)
+            )
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e):
+                return self._lease_failed(key, e)
+            # Another worker is writing (likely taking this very lease): wait and poll like any denial
+            self.stats["leases_denied"] += 1
+            return False
+        except sqlite3.Error as e:
+            return self._lease_failed(key, e)
+
+        granted = cursor.rowcount == 1
+        self.stats["leases_granted" if granted else "leases_denied"] += 1
+        return granted
+
+    def _lease_failed(self, key: str, error: Exception) -> bool:
+        # Without a working lease table every worker simply fetches for itself
+        self.stats["errors"] += 1
+        logger.warning(f"Shared cache lease failed for {key}: {error}")
+        return True
+
+    def release_lease(self, key: str):
+        try:
+            self._execute("DELETE FROM cache_leases WHERE key = ? AND owner = ?", (key, self.owner))
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Shared cache lease release failed for {key}: {e}")
+
+    def get_stats(self) -> Dict:
+        stats = {"backend": self.name, "path": self.path, **self.stats}
+        try:
+            stats["entries"] = self._execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        except sqlite3.Error:
+            stats["entries"] = None
+        return stats
+
+def create_cache_backend(name: str = Config.CACHE_BACKEND) -> Optional[SQLiteCacheBackend]:
+    """Build the configured shared backend; ``memory`` keeps the cache process-local"""
+    name = name.lower()
+    if name == "sqlite":
+        return SQLiteCacheBackend()
+    if name != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND {name!r}, using process-local memory cache")
+    return None
@@ -0,0 +1,294 @@
+"""
+Incremental streaming indicators for Aura AI Backend
+Constant-time volatility, RSI and EMA updates per price tick, seeded once from CoinGecko sparklines
+"""
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class RollingVolatility:
+    """Population standard deviation over a sliding window (windowed Welford)"""
+    __slots__ = ("window", "_values", "_mean", "_m2")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @staticmethod
+    def _add(n: int, mean: float, m2: float, x: float):
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        return n, mean, m2 + delta * (x - mean)
+
+    @staticmethod
+    def _remove(n: int, mean: float, m2: float, x: float):
+        if n <= 1:
+            return 0, 0.0, 0.0
+        new_mean = (n * mean - x) / (n - 1)
+        return n - 1, new_mean, m2 - (x - mean) * (x - new_mean)
+
+    def _next_state(self, x: float):
+        n, mean, m2 = len(self._values), self._mean, self._m2
+        if n == self.window:
+            n, mean, m2 = self._remove(n, mean, m2, self._values[0])
+        return self._add(n, mean, m2, x)
+
+    def update(self, x: float):
+        _, self._mean, self._m2 = self._next_state(x)
+        if len(self._values) == self.window:
+            self._values.popleft()
+        self._values.append(x)
+
+    def value(self, pending: Optional[float] = None) -> float:
+        """Current std-dev, optionally as if ``pending`` had been added"""
+        if pending is None:
+            n, m2 = len(self._values), self._m2
+        else:
+            n, _, m2 = self._next_state(pending)
+        return math.sqrt(max(m2, 0.0) / n) if n else 0.0
+
+class WindowedRSI:
+    """RSI from plain averages of the last ``period`` gains and losses (same definition as ``rsi_14``)"""
+    __slots__ = ("period", "_changes", "_gain_sum", "_loss_sum")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._changes = deque()
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+
+    def _next_sums(self, change: float):
+        gain_sum = self._gain_sum + max(change, 0.0)
+        loss_sum = self._loss_sum + max(-change, 0.0)
+        if len(self._changes) == self.period:
+            oldest = self._changes[0]
+            gain_sum -= max(oldest, 0.0)
+            loss_sum -= max(-oldest, 0.0)
+        return gain_sum, loss_sum
+
+    def update(self, change: float):
+        self._gain_sum, self._loss_sum = self._next_sums(change)
+        if len(self._changes) == self.period:
+            self._changes.popleft()
+        self._changes.append(change)
+
+    def value(self, pending: Optional[float] = None) -> Optional[float]:
+        if pending is None:
+            count, gain_sum, loss_sum = len(self._changes), self._gain_sum, self._loss_sum
+        else:
+            count = min(len(self._changes) + 1, self.period)
+            gain_sum, loss_sum = self._next_sums(pending)
+        if count < self.period:
+            return None
+        return _rsi(gain_sum, loss_sum)
+
+class WilderRSI:
+    """Wilder-smoothed RSI; seeded with the simple average of the first ``period`` changes"""
+    __slots__ = ("period", "_seed_count", "_avg_gain", "_avg_loss")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._seed_count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def _next_averages(self, change: float):
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self._seed_count < self.period:
+            count = self._seed_count + 1
+            return (self._avg_gain * self._seed_count + gain) / count, (self._avg_loss * self._seed_count + loss) / count, count
+        return ((self._avg_gain * (self.period - 1) + gain) / self.period,
+                (self._avg_loss * (self.period - 1) + loss) / self.period, self._seed_count)
+
+    def update(self, change: float):
+        self._avg_gain, self._avg_loss, self._seed_count = self._next_averages(change)
+
+    def value(self, pending: Optional[float] = None) -> Optional[float]:
+        if pending is None:
+            avg_gain, avg_loss, count = self._avg_gain, self._avg_loss, self._seed_count
+        else:
+            avg_gain, avg_loss, count = self._next_averages(pending)
+        if count < self.period:
+            return None
+        return _rsi(avg_gain, avg_loss)
+
+class EMA:
+    """Exponential moving average seeded with the first value"""
+    __slots__ = ("alpha", "_value")
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self._value: Optional[float] = None
+
+    def update(self, x: float):
+        self._value = self.value(x)
+
+    def value(self, pending: Optional[float] = None) -> Optional[float]:
+        if pending is None or self._value is None:
+            return pending if self._value is None else self._value
+        return self.alpha * pending + (1 - self.alpha) * self._value
+
+def _rsi(gain: float, loss: float) -> float:
+    if loss == 0:
+        return 100.0
+    return max(0.0, min(100.0, 100 - 100 / (1 + gain / loss)))
+
+class IndicatorTracker:
+    """Live indicators for one symbol on the same hourly grid as CoinGecko's 7-day sparkline
+
+    Ticks inside the current bucket only move the provisional close; when a
+    tick lands in a new bucket the previous close is committed to every
+    indicator. Reads fold the provisional close in without mutating state, so
+    both updates and reads are O(1).
+    """
+    __slots__ = ("symbol", "bucket_seconds", "volatility", "rsi", "wilder_rsi", "ema",
+                 "_closes", "_bucket", "_price", "updated_at")
+
+    def __init__(self, symbol: str, bucket_seconds: float = Config.STREAMING_BUCKET_SECONDS,
+                 window: int = Config.STREAMING_VOLATILITY_WINDOW):
+        self.symbol = symbol
+        self.bucket_seconds = bucket_seconds
+        self.volatility = RollingVolatility(window)
+        self.rsi = WindowedRSI(14)
+        self.wilder_rsi = WilderRSI(14)
+        self.ema = EMA(24)
+        self._closes = deque(maxlen=25)  # enough for the 24-bucket change
+        self._bucket: Optional[int] = None
+        self._price: Optional[float] = None
+        self.updated_at = 0.0
+
+    @property
+    def is_warm(self) -> bool:
+        """Enough history for every indicator, and not abandoned for more than two buckets"""
+        return (self.rsi.value() is not None and len(self._closes) >= 24
+                and time.time() - self.updated_at <= 2 * self.bucket_seconds)
+
+    def seed(self, prices: Sequence[float], now: Optional[float] = None):
+        """Rebuild from a sparkline whose last point is the current bucket"""
+        now = time.time() if now is None else now
+        prices = [float(price) for price in prices if price is not None]
+        if not prices:
+            return
+        current_bucket = int(now // self.bucket_seconds)
+        for price in prices[:-1]:
+            self._commit(price)
+        self._bucket = current_bucket
+        self._price = prices[-1]
+        self.updated_at = now
+
+    def update(self, price: float, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        bucket = int(timestamp // self.bucket_seconds)
+        if self._bucket is not None and bucket < self._bucket:
+            return  # late tick for a bucket that is already closed
+        if self._bucket is not None and bucket > self._bucket and self._price is not None:
+            self._commit(self._price)
+        self._bucket = bucket
+        self._price = float(price)
+        self.updated_at = timestamp
+
+    def _commit(self, close: float):
+        if self._closes:
+            previous = self._closes[-1]
+            change = close - previous
+            if previous != 0:
+                self.volatility.update(change / previous * 100)
+            self.rsi.update(change)
+            self.wilder_rsi.update(change)
+        self.ema.update(close)
+        self._closes.append(close)
+
+    def snapshot(self) -> Dict:
+        price = self._price
+        previous = self._closes[-1] if self._closes else None
+        change = price - previous if previous is not None else None
+        pending_return = change / previous * 100 if previous else None
+
+        result = {
+            "price_volatility_7d": self.volatility.value(pending_return),
+            "rsi_14": self.rsi.value(change),
+            "rsi_14_wilder": self.wilder_rsi.value(change),
+            "ema_24": self.ema.value(price),
+            "indicators_live": True,
+            "indicators_updated_at": self.updated_at
+        }
+        # 24 buckets back from the provisional close
+        if len(self._closes) >= 24 and self._closes[-24]:
+            result["volatility"] = abs((price - self._closes[-24]) / self._closes[-24] * 100)
+        return {key: value for key, value in result.items() if value is not None}
+
+class StreamingIndicators:
+    """Per-symbol indicator trackers fed by CoinGecko fetches and Pyth stream ticks"""
+
+    def __init__(self, enabled: bool = Config.STREAMING_INDICATORS_ENABLED):
+        self.enabled = enabled
+        self.trackers: Dict[str, IndicatorTracker] = {}
+        self.stats = {"ticks": 0, "seeds": 0}
+
+    @property
+    def version(self) -> int:
+        """Changes whenever any tracker is seeded or ticked, i.e. whenever an overlay may differ"""
+        return self.stats["ticks"] + self.stats["seeds"]
+
+    def observe(self, symbol: str, price: float, sparkline: Optional[Sequence[float]] = None):
+        """Feed a fetched price; a cold tracker is (re)seeded from the sparkline instead"""
+        if not self.enabled or not symbol:
+            return
+        symbol = symbol.upper()
+        tracker = self.trackers.get(symbol)
+        if tracker is not None and tracker.is_warm:
+            self.update(symbol, price)
+        elif sparkline:
+            tracker = IndicatorTracker(symbol)
+            tracker.seed(sparkline)
+            if price:
+                tracker.update(price)
+            self.trackers[symbol] = tracker
+            self.stats["seeds"] += 1
+            logger.debug(f"Seeded streaming indicators for {symbol} from {len(sparkline)} sparkline points")
+
+    def update(self, symbol: str, price: float, timestamp: Optional[float] = None):
+        tracker = self.trackers.get(symbol.upper()) if symbol else None
+        if tracker is not None and price:
+            tracker.update(price, timestamp)
+            self.stats["ticks"] += 1
+
+    def on_price_update(self, symbol: str, price_data: Dict):
+        """Pyth stream listener: ``AVAX/USD`` ticks update the ``AVAX`` tracker"""
+        self.update(price_data.get("base") or symbol.split("/")[0], price_data.get("price"), price_data.get("publish_time"))
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Live indicator values for ``symbol`` once its tracker is warm"""
+        tracker = self.trackers.get(symbol.upper()) if self.enabled and symbol else None
+        if tracker is None or not tracker.is_warm:
+            return None
+        return tracker.snapshot()
+
+    def overlay(self, coin_data: Optional[Dict], symbol: Optional[str] = None) -> Optional[Dict]:
+        """Copy of ``coin_data`` with sparkline-derived indicators replaced by live ones"""
+        symbol = symbol or (coin_data or {}).get("symbol")
+        live = self.get(symbol) if coin_data and symbol else None
+        return {**coin_data, **live} if live else coin_data
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "symbols": {symbol: {"warm": tracker.is_warm, "updated_at": tracker.updated_at}
+                        for symbol, tracker in self.trackers.items()}
+        }
+
+# Global streaming indicator registry
+streaming_indicators = StreamingIndicators()
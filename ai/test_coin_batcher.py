@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for micro-batched per-coin lookups against a local CoinGecko stand-in
+"""
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import data_pipeline
+from coin_batcher import CoinBatcher
+from config import Config
+from data_pipeline import OracleDataPipeline, cache
+from deadline import DeadlineExceeded, deadline
+from streaming_indicators import StreamingIndicators
+from timeseries import TimeSeriesStore
+
+def market_row(coin_id):
+    return {
+        "id": coin_id, "symbol": coin_id[:3], "name": coin_id.title(),
+        "current_price": 10.0, "price_change_percentage_24h": -2.0,
+        "total_volume": 100.0, "market_cap": 1000.0,
+        "sparkline_in_7d": {"price": [10.0 + i % 3 for i in range(30)]}
+    }
+
+class CoinGeckoStandIn:
+    """Serves ``/coins/markets`` and records the ids of every request"""
+
+    def __init__(self):
+        self.requests = []
+        self.app = web.Application()
+        self.app.router.add_get("/coins/markets", self.markets)
+
+    async def markets(self, request):
+        ids = request.query["ids"].split(",")
+        self.requests.append(ids)
+        await asyncio.sleep(0.05)  # slow enough for concurrent pages to overlap
+        return web.json_response([market_row(coin_id) for coin_id in ids if coin_id != "unknown-coin"])
+
+def test_lookups_in_one_window_share_paged_requests(monkeypatch, local_server):
+    """Five coins, one of them asked for twice, cost three pages of two ids fetched side by side"""
+    coin_ids = ["avalanche-2", "bitcoin", "ethereum", "solana", "avalanche-2", "unknown-coin"]
+
+    async def run():
+        server = CoinGeckoStandIn()
+        async with local_server(server.app) as url:
+            monkeypatch.setattr(Config, "COINGECKO_BASE_URL", url)
+            monkeypatch.setattr(Config, "COINGECKO_MARKETS_PAGE_SIZE", 2)
+            batcher = CoinBatcher(window=0.02)
+            results = await asyncio.gather(*(batcher.get(coin_id) for coin_id in coin_ids))
+            cached = await batcher.get("bitcoin")
+            return server.requests, batcher, results, cached
+
+    requests, batcher, results, cached = asyncio.run(run())
+    cache.clear()
+
+    assert sorted(requests) == [["avalanche-2", "bitcoin"], ["ethereum", "solana"], ["unknown-coin"]]
+    assert [result["symbol"] if result else None for result in results] == ["AVA", "BIT", "ETH", "SOL", "AVA", None]
+    assert results[0] is results[4]
+    assert results[1]["price_usd"] == 10.0
+    assert "rsi_14" in results[1]
+    assert cached is results[1]
+    assert batcher.stats["batches"] == 1
+    assert batcher.stats["coalesced"] == 1
+    assert batcher.stats["cache_hits"] == 1
+
+def test_shared_fetch_outlives_the_first_callers_deadline(monkeypatch, local_server):
+    """A caller with a short budget gives up alone; the batch still serves everyone else"""
+    async def run():
+        server = CoinGeckoStandIn()
+        async with local_server(server.app) as url:
+            monkeypatch.setattr(Config, "COINGECKO_BASE_URL", url)
+            batcher = CoinBatcher(window=0.01)
+
+            async def hurried():
+                with deadline(0.03):  # shorter than the stand-in's 50 ms response
+                    return await batcher.get("bitcoin")
+
+            return await asyncio.gather(hurried(), batcher.get("ethereum"), return_exceptions=True)
+
+    hurried, patient = asyncio.run(run())
+    cache.clear()
+
+    assert isinstance(hurried, DeadlineExceeded)
+    assert patient["symbol"] == "ETH"
+
+def test_cancelled_flush_fails_waiting_callers():
+    async def run():
+        batcher = CoinBatcher(window=1.0)
+        waiter = asyncio.ensure_future(batcher.get("bitcoin"))
+        await asyncio.sleep(0.01)
+        for task in list(batcher._tasks):
+            task.cancel()
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    with pytest.raises(RuntimeError, match="cancelled"):
+        asyncio.run(run())
+
+def test_only_tracked_coins_feed_live_indicators_and_history(monkeypatch):
+    """A coin sharing a tracked coin's symbol must not overwrite that coin's live state"""
+    registry, store = StreamingIndicators(enabled=True), TimeSeriesStore()
+    monkeypatch.setattr(data_pipeline, "streaming_indicators", registry)
+    monkeypatch.setattr(data_pipeline, "timeseries_store", store)
+    pipeline = OracleDataPipeline()
+    real = {**market_row("avalanche-2"), "symbol": "avax", "current_price": 35.0}
+    fake = {**market_row("fake-avax-token"), "symbol": "avax", "current_price": 0.0001, "total_volume": 5.0}
+
+    pipeline._parse_markets_coin(real, {})
+    history_before = store.get("AVAX").buffers["price"].last()
+    indicators_before = registry.get("AVAX")
+    pipeline._parse_markets_coin(fake, {})
+    # Batched lookups of a tracked coin read the live state without feeding it
+    pipeline._parse_markets_coin({**real, "current_price": 1.0}, {}, record=False)
+
+    assert store.get("AVAX").buffers["price"].last() == history_before == 35.0
+    assert registry.get("AVAX") == indicators_before
+    assert list(registry.trackers) == ["AVAX"]
+    assert list(store.series) == ["AVAX"]
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
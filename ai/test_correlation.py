@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the cross-asset correlation engine
+"""
+import numpy as np
+
+from benchmark_indicators import make_sparklines
+from correlation import CorrelationEngine, aligned_returns, pearson_matrix, rolling_correlation, spearman_matrix
+from data_pipeline import OracleDataPipeline
+
+def reference_spearman(x, y):
+    def ranks(values):
+        order = np.argsort(values, kind="mergesort")
+        result = np.empty(len(values))
+        result[order] = np.arange(1, len(values) + 1)
+        # Average the ranks of tied values
+        for value in np.unique(values):
+            tied = values == value
+            result[tied] = result[tied].mean()
+        return result
+    return np.corrcoef(ranks(x), ranks(y))[0, 1]
+
+def test_matrices_match_pairwise_definitions():
+    rng = np.random.default_rng(11)
+    returns = np.round(rng.normal(size=(5, 60)), 1)  # rounding creates ties
+
+    pearson = pearson_matrix(returns)
+    spearman = spearman_matrix(returns)
+
+    for i in range(5):
+        for j in range(5):
+            assert abs(pearson[i, j] - np.corrcoef(returns[i], returns[j])[0, 1]) < 1e-9
+            assert abs(spearman[i, j] - reference_spearman(returns[i], returns[j])) < 1e-9
+
+def test_rolling_correlation_against_reference_row():
+    rng = np.random.default_rng(5)
+    returns = rng.normal(size=(3, 50))
+
+    rolling = rolling_correlation(returns, reference=1, window=20)
+
+    assert rolling.shape == (3, 31)
+    assert np.allclose(rolling[1], 1.0)
+    assert abs(rolling[2, 7] - np.corrcoef(returns[2, 7:27], returns[1, 7:27])[0, 1]) < 1e-9
+
+def test_returns_are_aligned_to_common_history():
+    returns = aligned_returns([[1, 2, 3, 4, 5], [10, 11, 12]])
+    assert returns.shape == (2, 2)
+
+def test_engine_reuses_report_until_sparklines_change():
+    sparklines = make_sparklines(coins=3, points=168)
+    engine = CorrelationEngine()
+
+    first = engine.analyze(sparklines, reference="coin-0")
+    second = engine.analyze(dict(sparklines), reference="coin-0")
+    sparklines["coin-2"] = sparklines["coin-2"][1:] + [sparklines["coin-2"][-1] * 1.01]
+    third = engine.analyze(sparklines, reference="coin-0")
+
+    assert first is second
+    assert third is not first
+    assert engine.stats == {"computed": 2, "reused": 1}
+    assert first["observations"] == 167
+    assert first["rolling"]["latest"]["coin-0"] == 1.0
+    assert len(first["rolling"]["series"]["coin-1"]) == 167 - 24 + 1
+
+def test_cross_asset_analysis_reports_real_correlations():
+    prices = make_sparklines(coins=1, points=168)["coin-0"]
+    multi_coins = {
+        "avalanche-2": {"sparkline_7d": prices, "price_change_24h": 2.0},
+        "bitcoin": {"sparkline_7d": [p * 2 for p in prices], "price_change_24h": 1.0},
+        "ethereum": {"sparkline_7d": [1000 / p for p in prices], "price_change_24h": -1.0}
+    }
+
+    analysis = OracleDataPipeline()._analyze_cross_asset_correlations(multi_coins)
+
+    assert analysis["correlations"]["avalanche-2_bitcoin"]["correlation"] == "positive"
+    assert analysis["correlations"]["avalanche-2_bitcoin"]["pearson"] == 1.0
+    assert analysis["correlations"]["avalanche-2_ethereum"]["correlation"] == "negative"
+    assert analysis["correlation_matrix"]["coins"] == ["avalanche-2", "bitcoin", "ethereum"]
+    assert analysis["rolling_correlations"]["reference"] == "avalanche-2"
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded LRU/TTL DataCache used by the data pipeline
+"""
+import asyncio
+import time
+
+from data_pipeline import DataCache, OracleDataPipeline, cache
+
+def test_lru_eviction_by_entry_count():
+    """Least recently used entries are evicted once max_entries is exceeded"""
+    cache = DataCache(ttl=60, max_entries=3, max_bytes=1_000_000)
+    for i in range(3):
+        cache.set(f"coingecko:{i}", {"price": i})
+
+    # Touch the oldest entry so the second one becomes the LRU victim
+    assert cache.get("coingecko:0") == {"price": 0}
+    cache.set("coingecko:3", {"price": 3})
+
+    assert cache.get("coingecko:1") is None
+    assert cache.get("coingecko:0") == {"price": 0}
+    assert len(cache.cache) == 3
+    assert cache.get_stats()["namespaces"]["coingecko"]["evictions"] == 1
+
+def test_byte_budget():
+    """Entries are evicted to stay within the byte budget"""
+    cache = DataCache(ttl=60, max_entries=100, max_bytes=200)
+    for i in range(10):
+        cache.set(f"coingecko:{i}", {"payload": "x" * 50})
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 200
+    assert stats["entries"] < 10
+
+    # Values larger than the whole budget are never stored
+    cache.set("coingecko:huge", {"payload": "x" * 500})
+    assert cache.get("coingecko:huge") is None
+
+def test_expired_entries_are_swept():
+    """Expired entries are removed without having to be read again"""
+    cache = DataCache(ttl=0.05, max_entries=100, max_bytes=1_000_000, sweep_interval=0)
+    cache.set("coingecko:bitcoin", {"price": 1})
+    cache.set("pyth:AVAX/USD", {"price": 2})
+    time.sleep(0.1)
+
+    assert cache.sweep() == 2
+    assert cache.get_stats()["entries"] == 0
+    assert cache.total_bytes == 0
+
+def test_namespace_stats():
+    """Hits and misses are counted per key namespace"""
+    cache = DataCache(ttl=60)
+    cache.set("coingecko:avalanche-2", {"price": 1})
+    cache.get("coingecko:avalanche-2")
+    cache.get("coingecko:bitcoin")
+    cache.get("avalanche_stats")
+
+    namespaces = cache.get_stats()["namespaces"]
+    assert namespaces["coingecko"]["hits"] == 1
+    assert namespaces["coingecko"]["misses"] == 1
+    assert namespaces["coingecko"]["hit_rate"] == 0.5
+    assert namespaces["avalanche_stats"]["misses"] == 1
+
+def test_single_flight_coalesces_concurrent_misses():
+    """Concurrent misses on one key share a single upstream fetch"""
+    calls = []
+
+    async def slow_fetch(cache_key, coin_id):
+        calls.append(coin_id)
+        await asyncio.sleep(0.05)
+        data = {"coin_id": coin_id}
+        cache.set(cache_key, data)
+        return data
+
+    async def run():
+        pipeline = OracleDataPipeline()
+        return await asyncio.gather(*[
+            pipeline._cached_fetch("coingecko:single-flight-test", slow_fetch, "single-flight-test")
+            for _ in range(10)
+        ])
+
+    results = asyncio.run(run())
+    assert calls == ["single-flight-test"]
+    assert all(result is results[0] for result in results)
+
+def test_stale_while_revalidate():
+    """Stale entries are served immediately and refreshed in the background"""
+    swr_cache = DataCache(ttl=0.05, max_stale=60)
+    swr_cache.set("pyth:SWR/USD", {"price": 1})
+    time.sleep(0.1)
+
+    assert swr_cache.get("pyth:SWR/USD") is None
+    assert swr_cache.lookup("pyth:SWR/USD", allow_stale=True) == ({"price": 1}, False)
+
+    # Past the hard staleness cutoff nothing is served
+    strict_cache = DataCache(ttl=0.05, max_stale=0.05)
+    strict_cache.set("pyth:SWR/USD", {"price": 1})
+    time.sleep(0.15)
+    assert strict_cache.lookup("pyth:SWR/USD", allow_stale=True) == (None, False)
+
+def test_stale_entry_triggers_background_refresh(monkeypatch):
+    """The pipeline returns the stale value at once and revalidates it in the background"""
+    import data_pipeline
+    swr_cache = DataCache(ttl=0.05, max_stale=60)
+    monkeypatch.setattr(data_pipeline, "cache", swr_cache)
+
+    class Pipeline(OracleDataPipeline):
+        async def _fetch_price(self, cache_key):
+            await asyncio.sleep(0.05)
+            swr_cache.set(cache_key, {"price": 2})
+            return {"price": 2}
+
+    async def run():
+        pipeline = Pipeline()
+        swr_cache.set("pyth:SWR/USD", {"price": 1})
+        await asyncio.sleep(0.1)
+
+        stale = await pipeline._cached_fetch("pyth:SWR/USD", pipeline._fetch_price)
+        await asyncio.sleep(0.1)
+        fresh = await pipeline._cached_fetch("pyth:SWR/USD", pipeline._fetch_price)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+    assert stale == {"price": 1}
+    assert fresh == {"price": 2}
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for request deadlines, deadline-bound upstream calls and partial results
+"""
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from data_pipeline import FetchPlan, SingleFlight, cache
+from deadline import DeadlineExceeded, budget_for_path, deadline, remaining
+from rate_limiter import RequestScheduler
+
+def test_nested_budgets_only_tighten():
+    assert remaining() is None
+    with deadline(5):
+        with deadline(10):
+            assert 4.9 < remaining() <= 5
+        with deadline(1):
+            assert remaining() <= 1
+    assert remaining() is None
+
+def test_budgets_match_the_longest_path_prefix():
+    budgets = {"/recommend-fee": 3.0, "/recommend-fee/batch": 20.0, "/stream": 0.0}
+    assert budget_for_path("/recommend-fee", budgets) == 3.0
+    assert budget_for_path("/recommend-fee/production", budgets) == 3.0
+    assert budget_for_path("/recommend-fee/batch", budgets) == 20.0
+    assert budget_for_path("/recommend-fees", budgets) is not None  # default budget, not /recommend-fee's
+    assert budget_for_path("/stream/market", budgets) is None
+
+def test_upstream_call_gets_the_remaining_budget(local_server):
+    """A hung upstream fails at the request deadline instead of the session timeout"""
+    async def run():
+        async def hang(request):
+            await asyncio.sleep(5)
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_get("/", hang)
+
+        scheduler = RequestScheduler(limits={"upstream": 100}, bursts={"upstream": 5}, enabled=True)
+        async with local_server(app) as url:
+            async with aiohttp.ClientSession() as session:
+                started = time.monotonic()
+                with deadline(0.2):
+                    with pytest.raises(DeadlineExceeded):
+                        async with scheduler.request(session, "upstream", "GET", url):
+                            pass
+                return time.monotonic() - started
+
+    assert asyncio.run(run()) < 1.0
+
+def test_plan_returns_sources_that_finished_in_time():
+    flights = SingleFlight()
+
+    class SlowNetworkPipeline:
+        async def fetch_source(self, name):
+            async def fetch():
+                await asyncio.sleep(0.3 if name == "network" else 0.01)
+                cache.set(f"deadline-test:{name}", {"source": name})
+                return {"source": name}
+            return await flights.do(f"deadline-test:{name}", fetch)
+
+    async def run():
+        started = time.monotonic()
+        with deadline(0.1):
+            sources = await FetchPlan("coingecko", "network").run(SlowNetworkPipeline())
+        elapsed = time.monotonic() - started
+        # The late fetch is not cancelled; it still fills the cache for the next request
+        await asyncio.sleep(0.3)
+        return sources, elapsed, cache.get("deadline-test:network")
+
+    sources, elapsed, late = asyncio.run(run())
+
+    assert sources == {"coingecko": {"source": "coingecko"}, "network": None}
+    assert elapsed < 0.2
+    assert late == {"source": "network"}
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned derived analytics stage
+"""
+from data_pipeline import OracleDataPipeline, analytics_stage, streaming_indicators
+
+def make_sources(rsi=75.0):
+    return {
+        "coingecko": {"symbol": "TESTCOIN", "price_usd": 20.0, "volatility": 9.0, "volume_24h": 1e8,
+                      "market_cap": 1e9, "rsi_14": rsi},
+        "coingecko_global": {"market_sentiment": "bullish", "market_cap_percentage": {"btc": 52.0},
+                             "market_cap_change_24h": 1.5},
+        "multi_coins": {},
+        "pyth": None,
+        "network": None
+    }
+
+def test_derivation_reruns_only_when_inputs_change():
+    pipeline = OracleDataPipeline()
+    sources = make_sources()
+    derived_before = analytics_stage.stats["derived"]
+
+    first = pipeline.combine_market_data(sources)
+    second = pipeline.combine_market_data(dict(sources))
+    assert second["analytics_version"] == first["analytics_version"]
+    assert second["market_indicators"] is first["market_indicators"]
+    assert analytics_stage.stats["derived"] == derived_before + 1
+
+    # A refetched source is a new payload, even with equal contents
+    sources["coingecko"] = dict(sources["coingecko"], rsi_14=25.0)
+    third = pipeline.combine_market_data(sources)
+    assert third["analytics_version"] == first["analytics_version"] + 1
+    assert third["sentiment"]["avax_sentiment"] == "bearish_extreme"
+
+    # Live indicator ticks can change the overlay, so they invalidate too
+    streaming_indicators.stats["ticks"] += 1
+    fourth = pipeline.combine_market_data(sources)
+    assert fourth["analytics_version"] == third["analytics_version"] + 1
+
+def test_sentiment_is_derived_with_the_other_analytics():
+    sentiment = OracleDataPipeline().combine_market_data(make_sources())["sentiment"]
+
+    assert sentiment["overall_sentiment"] == "bullish"
+    assert sentiment["avax_sentiment"] == "bullish_extreme"
+    assert sentiment["volatility_adjusted"] is True
+    assert sentiment["btc_dominance"] == 52.0
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
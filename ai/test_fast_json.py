@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the fast JSON response path and per-snapshot encoded bodies
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import fast_json
+from main import app, snapshot_store
+
+def test_orjson_and_stdlib_encodings_agree(monkeypatch):
+    content = {"price": np.float64(21.5), "series": np.array([1.0, 2.0]), "at": datetime(2024, 1, 2), "nested": {"ok": True}}
+
+    fast = fast_json.dumps(content)
+    monkeypatch.setattr(fast_json, "ORJSON_AVAILABLE", False)
+    fallback = fast_json.dumps(content)
+
+    assert json.loads(fast) == json.loads(fallback) == {
+        "price": 21.5, "series": [1.0, 2.0], "at": "2024-01-02T00:00:00", "nested": {"ok": True}
+    }
+
+def test_enhanced_market_data_is_encoded_once_per_snapshot():
+    snapshot = snapshot_store.publish({
+        "coingecko": {"price_usd": 21.5}, "coingecko_global": None, "multi_coins": {}, "pyth": None,
+        "network": None, "market_indicators": {}, "cross_asset_analysis": {}, "market_regime": "stable",
+        "timestamp": "2024-01-02T00:00:00", "analytics_version": 3
+    }, {})
+    client = TestClient(app)
+
+    first = client.get("/market-data/enhanced")
+    body = snapshot._encoded["market-data/enhanced"]
+    second = client.get("/market-data/enhanced")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == body
+    assert snapshot._encoded["market-data/enhanced"] is body
+    # Same shape as the response model: undeclared keys are dropped
+    assert first.json()["coingecko"] == {"price_usd": 21.5}
+    assert "analytics_version" not in first.json()
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
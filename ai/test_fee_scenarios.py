@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for building and scoring what-if fee scenario batches
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from fee_scenarios import classify_market_conditions, model_confidences, scenario_frame, weighted_ensemble
+
+FEATURES = [
+    'volatility', 'volume_24h', 'price_change_1h', 'price_change_24h',
+    'market_cap', 'gas_price_gwei', 'liquidity_score',
+    'hour_of_day', 'day_of_week', 'volume_ma_7d', 'volatility_ma_7d',
+    'price_momentum', 'volume_ratio', 'gas_trend'
+]
+
+BASELINE = {
+    'volatility': 4.0, 'volume_24h': 5e8, 'price_change_1h': 0.2, 'price_change_24h': 2.0,
+    'market_cap': 1e10, 'gas_price_gwei': 28.0, 'liquidity_score': 5.0,
+    'hour_of_day': 12, 'day_of_week': 2, 'volume_ma_7d': 4e8, 'volatility_ma_7d': 4.2,
+    'price_momentum': 2.4, 'volume_ratio': 1.25, 'gas_trend': 0.0
+}
+
+def test_rows_and_columns_build_the_same_matrix():
+    rows = [{"volatility": v, "gas_price_gwei": g} for v in (1.0, 10.0) for g in (28.0, 400.0)]
+    columns = {"volatility": [1.0, 1.0, 10.0, 10.0], "gas_price_gwei": [28.0, 400.0, 28.0, 400.0]}
+
+    from_rows = scenario_frame(rows, FEATURES, BASELINE)
+    from_columns = scenario_frame(columns, FEATURES, BASELINE)
+
+    pd.testing.assert_frame_equal(from_rows, from_columns)
+    assert list(from_rows.columns) == FEATURES
+    assert (from_rows["market_cap"] == 1e10).all()
+    # Derived features follow the scenario inputs, not the baseline
+    assert from_rows["gas_trend"].tolist() == [0.0, 1.0, 0.0, 1.0]
+    assert from_rows["price_momentum"].tolist() == pytest.approx([2.1, 2.1, 3.0, 3.0])
+    assert from_rows["volume_ratio"].tolist() == [1.25] * 4
+
+def test_invalid_payloads_are_rejected():
+    with pytest.raises(ValueError, match="Unknown features"):
+        scenario_frame([{"volatilty": 1.0}], FEATURES, BASELINE)
+    with pytest.raises(ValueError, match="different lengths"):
+        scenario_frame({"volatility": [1.0, 2.0], "gas_price_gwei": [28.0]}, FEATURES, BASELINE)
+    with pytest.raises(ValueError, match="Missing features"):
+        scenario_frame([{"volatility": 1.0}], FEATURES, baseline=None)
+    with pytest.raises(ValueError, match="same features"):
+        scenario_frame([{"volatility": 1.0}, {"gas_price_gwei": 30.0}], FEATURES, BASELINE)
+    with pytest.raises(ValueError, match="Too many"):
+        scenario_frame({"volatility": [1.0] * 3}, FEATURES, BASELINE, max_rows=2)
+
+def test_confidences_and_conditions_are_computed_per_row():
+    frame = scenario_frame({
+        "volatility": [1.0, 25.0, 14.0, 5.0],
+        "price_change_24h": [0.0, 20.0, 1.0, 1.0],
+        "gas_price_gwei": [28.0, 28.0, 250.0, 350.0],
+        "volume_24h": [6e8, 1e8, 4e8, 4e8]
+    }, FEATURES, BASELINE)
+
+    assert classify_market_conditions(frame).tolist() == [
+        "stable_liquid", "extreme_volatility", "high_volatility_congested", "network_congested"
+    ]
+    assert model_confidences(0.87, frame) == pytest.approx([0.92, 0.87 - 0.15 - 0.08, 0.87 - 0.08, 0.87 - 0.06])
+
+    ensemble = weighted_ensemble(
+        {"a": np.array([0.2, 0.4]), "b": np.array([0.4, 0.4])},
+        {"a": np.array([0.5, 0.5]), "b": np.array([1.5, 0.5])}
+    )
+    assert ensemble == pytest.approx([0.35, 0.4])
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
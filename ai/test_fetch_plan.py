@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent, deduplicated fetch plans
+"""
+import asyncio
+import time
+
+from data_pipeline import FetchPlan, OracleDataPipeline, get_sentiment_analysis
+
+class RecordingPipeline:
+    """Stands in for the pipeline: every source takes 50 ms, one of them fails"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_source(self, name):
+        self.calls.append(name)
+        await asyncio.sleep(0.05)
+        if name == "network":
+            raise RuntimeError("rpc down")
+        return {"source": name}
+
+def test_plans_fetch_each_source_once_and_concurrently():
+    pipeline = RecordingPipeline()
+    plan = FetchPlan("coingecko", "coingecko_global") | FetchPlan("coingecko", "network")
+
+    started = time.perf_counter()
+    sources = asyncio.run(plan.run(pipeline))
+    elapsed = time.perf_counter() - started
+
+    assert pipeline.calls == ["coingecko", "coingecko_global", "network"]
+    assert sources == {"coingecko": {"source": "coingecko"}, "coingecko_global": {"source": "coingecko_global"}, "network": None}
+    assert elapsed < 0.12
+
+def test_sentiment_fetches_only_its_two_sources(monkeypatch):
+    calls = []
+
+    async def fetch_source(self, name):
+        calls.append(name)
+        return {
+            "coingecko": {"symbol": "PLANCOIN", "rsi_14": 65.0, "volatility": 1.0},
+            "coingecko_global": {"market_sentiment": "neutral", "market_cap_percentage": {"btc": 50.0}}
+        }[name]
+
+    monkeypatch.setattr(OracleDataPipeline, "fetch_source", fetch_source)
+    sentiment = asyncio.run(get_sentiment_analysis())
+
+    assert sorted(calls) == ["coingecko", "coingecko_global"]
+    assert sentiment["avax_sentiment"] == "bullish"
+    assert sentiment["overall_sentiment"] == "neutral"
+    assert sentiment["btc_dominance"] == 50.0
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
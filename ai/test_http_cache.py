@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for ETag / If-None-Match handling on the polled endpoints
+"""
+from fastapi.testclient import TestClient
+
+from http_cache import etag_matches, make_etag
+from main import app, snapshot_store
+
+def publish_snapshot(price=21.5):
+    return snapshot_store.publish({
+        "coingecko": {"price_usd": price, "volatility": 2.0, "volume_24h": 1e8, "timestamp": "2024-01-02T00:00:00"},
+        "market_indicators": {"volatility_category": "low"},
+        "timestamp": "2024-01-02T00:00:05"
+    }, {})
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag(b"{}")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+def test_market_data_revalidates_with_304_until_snapshot_changes():
+    client = TestClient(app)
+    publish_snapshot()
+
+    first = client.get("/market-data")
+    etag = first.headers["etag"]
+    repeat = client.get("/market-data", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.json()["price_usd"] == 21.5
+    assert first.json()["timestamp"] == "2024-01-02T00:00:00"
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == etag
+    assert "cache-control" in repeat.headers
+
+    # Same data republished keeps the tag; new data gets a full response
+    publish_snapshot()
+    assert client.get("/market-data", headers={"If-None-Match": etag}).status_code == 304
+    publish_snapshot(price=22.0)
+    changed = client.get("/market-data", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+def test_recommend_fee_is_computed_once_per_snapshot():
+    client = TestClient(app)
+    snapshot = publish_snapshot()
+
+    first = client.get("/recommend-fee")
+    repeat = client.get("/recommend-fee", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert repeat.status_code == 304
+    assert len([key for key in snapshot._encoded if key.startswith("recommend-fee:")]) == 1
+
+def test_health_uses_a_weak_etag_ignoring_the_timestamp():
+    client = TestClient(app)
+
+    first = client.get("/health")
+    repeat = client.get("/health", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.headers["etag"].startswith("W/")
+    assert first.headers["cache-control"] == "no-cache"
+    assert repeat.status_code == 304
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized indicator engine
+"""
+import numpy as np
+
+from benchmark_indicators import legacy_price_volatility, legacy_rsi, make_sparklines
+from indicators import atr_pct, compute_indicators, ema, to_price_matrix, wilder_rsi
+
+def reference_wilder_rsi(prices, period=14):
+    changes = np.diff(prices)
+    gains = np.where(changes > 0, changes, 0.0)
+    losses = np.where(changes > 0, 0.0, -changes)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+def reference_ema(prices, span):
+    alpha = 2 / (span + 1)
+    value = prices[0]
+    for price in prices[1:]:
+        value = alpha * price + (1 - alpha) * value
+    return value
+
+def test_matches_previous_volatility_and_rsi():
+    """Volatility and rsi_14 keep the exact semantics of the per-coin loops they replace"""
+    sparklines = make_sparklines(coins=50, points=168)
+    sparklines["short"] = [10.0, 11.0, 10.5]
+    sparklines["zero_start"] = [0.0, 1.0, 2.0, 1.5]
+    sparklines["empty"] = []
+
+    results = compute_indicators(sparklines)
+
+    for coin, prices in sparklines.items():
+        assert abs(results[coin]["price_volatility_7d"] - legacy_price_volatility(prices)) < 1e-9
+        assert abs(results[coin]["rsi_14"] - legacy_rsi(prices)) < 1e-9
+
+def test_wilder_rsi_and_ema_match_sequential_definitions():
+    sparklines = make_sparklines(coins=5, points=168)
+    prices = to_price_matrix(sparklines.values())
+
+    rsi = wilder_rsi(prices)
+    ema_24 = ema(prices, 24)
+    for i, series in enumerate(sparklines.values()):
+        assert abs(rsi[i] - reference_wilder_rsi(np.array(series))) < 1e-9
+        assert abs(ema_24[i] - reference_ema(series, 24)) < 1e-9
+
+def test_padded_rows_are_computed_from_their_own_history():
+    """A shorter series gives the same result alone as when stacked with longer ones"""
+    long_series = make_sparklines(coins=1, points=168)["coin-0"]
+    short_series = long_series[-40:]
+
+    stacked = to_price_matrix([long_series, short_series])
+    alone = to_price_matrix([short_series])
+
+    assert np.isnan(stacked[1, 0])
+    assert abs(wilder_rsi(stacked)[1] - wilder_rsi(alone)[0]) < 1e-9
+    assert abs(ema(stacked, 24)[1] - ema(alone, 24)[0]) < 1e-9
+    assert abs(atr_pct(stacked)[1] - atr_pct(alone)[0]) < 1e-9
+
+def test_flat_series_is_overbought_by_convention():
+    """No losses in the window means RSI 100, matching the previous implementation"""
+    results = compute_indicators({"flat": [5.0] * 30})
+    assert results["flat"]["rsi_14"] == 100.0
+    assert results["flat"]["price_volatility_7d"] == 0.0
+    assert results["flat"]["atr_14_pct"] == 0.0
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the background market snapshot refresher and store
+"""
+import asyncio
+
+import market_snapshot
+from data_pipeline import OracleDataPipeline
+from market_snapshot import MarketSnapshotRefresher, MarketSnapshotStore
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+class StubSources:
+    """``fetch_source`` stand-in: each source returns its next queued payload (or raises it)"""
+
+    def __init__(self, **payloads):
+        self.payloads = {name: list(values) for name, values in payloads.items()}
+        self.calls = []
+
+    def install(self, monkeypatch):
+        async def fetch_source(pipeline, name, force_refresh=False, max_age=None):
+            self.calls.append(name)
+            result = self.payloads[name].pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        monkeypatch.setattr(OracleDataPipeline, "fetch_source", fetch_source)
+
+def make_refresher(monkeypatch, sources, intervals):
+    clock = Clock()
+    monkeypatch.setattr(market_snapshot, "time", clock)
+    sources.install(monkeypatch)
+    return MarketSnapshotRefresher(MarketSnapshotStore(), intervals), clock
+
+def coingecko(price, **extra):
+    return {"symbol": "SNAPCOIN", "price_usd": price, "volatility": 2.0, **extra}
+
+def test_each_source_refreshes_on_its_own_interval(monkeypatch):
+    sources = StubSources(coingecko=[coingecko(20.0), coingecko(21.0)], network=[{"gas_price_gwei": 25}])
+    refresher, clock = make_refresher(monkeypatch, sources, {"coingecko": 10, "network": 60})
+
+    first = asyncio.run(refresher.refresh_due_sources())
+    clock.now += 5
+    nothing_due = asyncio.run(refresher.refresh_due_sources())
+    clock.now += 5
+    second = asyncio.run(refresher.refresh_due_sources())
+
+    assert sources.calls == ["coingecko", "network", "coingecko"]
+    assert nothing_due is None
+    assert (first.version, second.version) == (1, 2)
+    assert second.data["coingecko"]["price_usd"] == 21.0
+    assert second.data["network"] == {"gas_price_gwei": 25}  # reused until its own interval elapses
+    assert second.source_updated_at["network"] == first.source_updated_at["network"]
+    assert refresher.store.current() is second
+
+def test_failed_refresh_keeps_the_last_good_value(monkeypatch):
+    fallback = coingecko(35.0, data_source="fallback")
+    sources = StubSources(
+        coingecko=[coingecko(20.0), fallback, RuntimeError("coingecko down"), coingecko(22.0)],
+        network=[{"gas_price_gwei": 25}, None, {"gas_price_gwei": 30}, {"gas_price_gwei": 31}]
+    )
+    refresher, clock = make_refresher(monkeypatch, sources, {"coingecko": 10, "network": 10})
+
+    first = asyncio.run(refresher.refresh_due_sources())
+    clock.now += 10
+    all_failed = asyncio.run(refresher.refresh_due_sources())
+    clock.now += 10
+    partial = asyncio.run(refresher.refresh_due_sources())
+
+    assert all_failed is None
+    assert partial.version == first.version + 1
+    assert partial.data["coingecko"]["price_usd"] == 20.0  # never the hard-coded fallback price
+    assert partial.data["network"] == {"gas_price_gwei": 30}
+    assert partial.source_updated_at["coingecko"] == first.source_updated_at["coingecko"]
+
+def test_store_publishes_versioned_copies_to_listeners():
+    store = MarketSnapshotStore()
+    published = []
+    store.add_listener(lambda snapshot: published.append(snapshot.version))
+    store.add_listener(lambda snapshot: 1 / 0)  # a failing listener does not stop publishing
+    data = {"coingecko": coingecko(20.0)}
+
+    first = store.publish(data, {"coingecko": 1.0})
+    data["coingecko"]["price_usd"] = 99.0
+    second = store.publish(data, {"coingecko": 2.0})
+
+    assert published == [1, 2]
+    assert first.data["coingecko"]["price_usd"] == 20.0
+    assert store.current() is second
+    assert store.get_status()["version"] == 2
+
+def test_supervisor_restarts_a_crashed_refresh_loop():
+    refresher = MarketSnapshotRefresher(MarketSnapshotStore(), {"coingecko": 10})
+    runs = []
+
+    async def run():
+        restarted = asyncio.Event()
+
+        async def flaky_run():
+            runs.append(len(runs))
+            if len(runs) == 1:
+                raise RuntimeError("refresh loop crashed")
+            restarted.set()
+            await asyncio.Event().wait()
+
+        refresher._run = flaky_run
+        refresher.start()
+        await asyncio.wait_for(restarted.wait(), timeout=5)
+        running = refresher.running
+        await refresher.stop()
+        return running
+
+    assert asyncio.run(run()) is True
+    assert runs == [0, 1]
+    assert refresher.restarts == 1
+    assert not refresher.running
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for background loading of the model stack and the readiness endpoint
+"""
+import asyncio
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from model_loader import ModelLoader
+
+SLOW_MODULE = '''
+import time
+time.sleep(0.3)
+
+async def get_production_fee_recommendation(market_data=None):
+    return {"recommended_fee": 0.42, "confidence": 0.9, "reasoning": "Loaded", "market_condition": "stable"}
+'''
+
+def test_models_load_off_the_event_loop(tmp_path, monkeypatch):
+    (tmp_path / "slow_models_fixture.py").write_text(SLOW_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("slow_models_fixture", None)
+
+    async def run():
+        loader = ModelLoader("slow_models_fixture")
+        loader.start()
+        # The loop keeps ticking while the import sleeps in its worker thread
+        ticks = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < 0.1:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        state_while_loading = loader.state
+        ready = await loader.wait(timeout=5)
+        return loader, ticks, state_while_loading, ready
+
+    loader, ticks, state_while_loading, ready = asyncio.run(run())
+
+    assert ticks >= 5
+    assert state_while_loading == "loading"
+    assert ready and loader.state == "ready"
+    assert loader.load_seconds >= 0.3
+    assert loader.get("get_production_fee_recommendation") is not None
+
+def test_failed_import_leaves_fallback_mode():
+    loader = ModelLoader("module_that_does_not_exist")
+    assert asyncio.run(loader.wait()) is False
+    assert loader.state == "failed"
+    assert "module_that_does_not_exist" in loader.get_stats()["error"]
+
+def test_readiness_is_separate_from_liveness(tmp_path, monkeypatch):
+    (tmp_path / "fast_models_fixture.py").write_text(SLOW_MODULE.replace("time.sleep(0.3)", ""))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    loader = ModelLoader("fast_models_fixture")
+    monkeypatch.setattr(main, "model_loader", loader)
+    client = TestClient(main.app)
+
+    starting = client.get("/ready")
+    health = client.get("/health")
+    asyncio.run(loader.wait())
+    ready = client.get("/ready")
+    fee = client.get("/recommend-fee/production")
+
+    assert starting.status_code == 503 and starting.json()["status"] == "starting"
+    assert health.status_code == 200 and health.json()["services"]["ai_models"] == "loading"
+    assert ready.status_code == 200 and ready.json()["models"]["state"] == "ready"
+    assert fee.json()["recommended_fee"] == 0.42
+
+def test_lazy_mode_starts_loading_from_every_model_endpoint(tmp_path, monkeypatch):
+    (tmp_path / "lazy_models_fixture.py").write_text(SLOW_MODULE.replace("time.sleep(0.3)", ""))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(main.Config, "MODEL_PRELOAD", False)
+    requests = {
+        "/model-info": lambda client: client.get("/model-info"),
+        "/recommend-fee/batch": lambda client: client.post("/recommend-fee/batch", json={"scenarios": {"gas_price_gwei": [20]}}),
+        "/recommend-fee/production": lambda client: client.get("/recommend-fee/production"),
+    }
+
+    started = {}
+    for endpoint, request in requests.items():
+        loader = ModelLoader("lazy_models_fixture")
+        monkeypatch.setattr(main, "model_loader", loader)
+        request(TestClient(main.app))
+        started[endpoint] = loader.state != "pending"
+
+    assert started == dict.fromkeys(requests, True)
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
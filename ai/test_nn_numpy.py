@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy inference path of the Keras fee network
+"""
+import os
+import shutil
+
+import numpy as np
+
+from nn_numpy import NumpyMLP, fold_batch_norms, load_network, read_keras_h5
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "production", "neural_network.h5")
+
+def unfolded_forward(layers, X):
+    """Layer-by-layer Keras inference: Dense -> activation, BatchNormalization with moving statistics"""
+    x = X.astype(np.float32)
+    for layer in layers:
+        if layer["type"] == "dense":
+            x = x @ layer["kernel"] + layer["bias"]
+            if layer["activation"] == "relu":
+                x = np.maximum(x, 0)
+        else:
+            x = (x - layer["moving_mean"]) / np.sqrt(layer["moving_variance"] + np.float32(layer["epsilon"]))
+            x = x * layer["gamma"] + layer["beta"]
+    return x
+
+def test_folded_network_matches_layer_by_layer_inference():
+    layers = read_keras_h5(MODEL_PATH)
+    network = NumpyMLP.from_keras_h5(MODEL_PATH)
+    X = np.random.default_rng(7).normal(size=(500, network.input_dim))
+
+    assert [layer["type"] for layer in layers].count("batch_norm") == 3
+    assert len(network.layers) == 5  # only the Dense layers remain
+    assert network.predict(X).shape == (500, 1)
+    np.testing.assert_allclose(network.predict(X), unfolded_forward(layers, X), rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(network.predict(X[0]), network.predict(X[:1]))
+
+def test_consecutive_batch_norms_fold_into_one_affine_map():
+    rng = np.random.default_rng(1)
+    def batch_norm(units):
+        return {"type": "batch_norm", "gamma": rng.uniform(0.5, 2, units), "beta": rng.normal(size=units),
+                "moving_mean": rng.normal(size=units), "moving_variance": rng.uniform(0.5, 2, units), "epsilon": 1e-3}
+    layers = [
+        {"type": "dense", "kernel": rng.normal(size=(4, 3)), "bias": rng.normal(size=3), "activation": "relu"},
+        batch_norm(3), batch_norm(3),
+        {"type": "dense", "kernel": rng.normal(size=(3, 1)), "bias": rng.normal(size=1), "activation": "linear"}
+    ]
+    X = rng.normal(size=(20, 4))
+
+    np.testing.assert_allclose(NumpyMLP(fold_batch_norms(layers)).predict(X), unfolded_forward(layers, X), rtol=1e-5, atol=1e-5)
+
+def test_exported_weights_are_reused_until_the_model_changes(tmp_path):
+    h5_path = str(tmp_path / "neural_network.h5")
+    shutil.copy(MODEL_PATH, h5_path)
+    X = np.random.default_rng(3).normal(size=(5, 14))
+
+    first = load_network(h5_path)
+    npz_path = str(tmp_path / "neural_network.npz")
+    assert os.path.exists(npz_path)
+    np.testing.assert_array_equal(load_network(h5_path).predict(X), first.predict(X))
+
+    # A retrained (newer) .h5 is exported again
+    stale = os.path.getmtime(npz_path) - 10
+    os.utime(npz_path, (stale, stale))
+    load_network(h5_path)
+    assert os.path.getmtime(npz_path) > stale
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for saving, loading and serving the production fee models
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+
+import joblib
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.preprocessing import RobustScaler, StandardScaler
+
+SHIPPED_NETWORK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "production", "neural_network.h5")
+FEATURE_COUNT = 14
+
+MARKET_DATA = {
+    "coingecko": {"symbol": "TESTCOIN", "volatility": 4.0, "volume_24h": 2.5e8, "price_change_24h": 1.5, "market_cap": 9e9},
+    "network": {"gas_price_gwei": 30}
+}
+
+def small_models():
+    return {
+        "random_forest": RandomForestRegressor(n_estimators=10, max_depth=6, random_state=42),
+        "gradient_boosting": GradientBoostingRegressor(n_estimators=10, max_depth=3, random_state=42)
+    }
+
+def write_fitted_models(models_dir):
+    """Small fitted tree models and scalers, so constructing a predictor loads instead of training"""
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(200, FEATURE_COUNT)), rng.uniform(0.1, 1.0, 200)
+    for name, model in small_models().items():
+        scaler = RobustScaler().fit(X)
+        joblib.dump(model.fit(scaler.transform(X), y), os.path.join(models_dir, f"{name}.pkl"))
+        joblib.dump(scaler, os.path.join(models_dir, f"{name}_scaler.pkl"))
+    with open(os.path.join(models_dir, "metadata.json"), "w") as f:
+        json.dump({"best_model_name": "random_forest"}, f)
+    return X
+
+@pytest.fixture(scope="module")
+def production_models(tmp_path_factory):
+    """production_models imported inside a scratch models directory, without TensorFlow"""
+    workdir = tmp_path_factory.mktemp("production")
+    models_dir = workdir / "models" / "production"
+    models_dir.mkdir(parents=True)
+    write_fitted_models(str(models_dir))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(workdir)
+        mp.setitem(sys.modules, "tensorflow", None)  # import tensorflow raises ImportError
+        mp.delitem(sys.modules, "production_models", raising=False)
+        import production_models
+        yield production_models
+    sys.modules.pop("production_models", None)
+
+@pytest.fixture
+def models_dir(production_models):
+    models_dir = os.path.abspath(production_models.production_fee_predictor.models_dir)
+    shutil.rmtree(models_dir)
+    os.makedirs(models_dir)
+    return models_dir
+
+def read_files(models_dir, filenames):
+    contents = {}
+    for filename in filenames:
+        with open(os.path.join(models_dir, filename), "rb") as f:
+            contents[filename] = f.read()
+    return contents
+
+def test_retrain_without_tensorflow_keeps_the_saved_network(production_models, models_dir, caplog):
+    X = write_fitted_models(models_dir)
+    shutil.copy(SHIPPED_NETWORK, os.path.join(models_dir, "neural_network.h5"))
+    joblib.dump(StandardScaler().fit(X), os.path.join(models_dir, "neural_network_scaler.pkl"))
+    predictor = production_models.ProductionFeePredictor()
+    network_files = read_files(models_dir, ["neural_network.h5", "neural_network.npz", "neural_network_scaler.pkl"])
+
+    predictor.models.update(small_models())
+    results = predictor.train_models(predictor._generate_realistic_training_data(400))
+    reloaded = production_models.ProductionFeePredictor()
+    with caplog.at_level(logging.WARNING, logger="production_models"):
+        prediction = asyncio.run(reloaded.predict_optimal_fee(MARKET_DATA))
+
+    assert "neural_network" not in results
+    assert isinstance(predictor.models["neural_network"], production_models.NumpyMLP)
+    assert read_files(models_dir, network_files) == network_files  # the network and its scaler stay a pair
+    assert sorted(prediction["all_predictions"]) == ["gradient_boosting", "neural_network", "random_forest"]
+    assert not [record for record in caplog.records if "Error with" in record.getMessage()]
+
+def test_retrain_without_tensorflow_or_network_saves_no_network_scaler(production_models, models_dir):
+    write_fitted_models(models_dir)
+    predictor = production_models.ProductionFeePredictor()
+
+    predictor.models.update(small_models())
+    predictor.train_models(predictor._generate_realistic_training_data(400))
+
+    assert predictor.models["neural_network"] is None
+    assert not os.path.exists(os.path.join(models_dir, "neural_network_scaler.pkl"))
+
+def test_large_inputs_skip_the_flattened_trees(production_models, models_dir, monkeypatch):
+    write_fitted_models(models_dir)
+    predictor = production_models.ProductionFeePredictor()
+    compiled = predictor.compiled_models["random_forest"]
+    calls = []
+    monkeypatch.setattr(compiled, "predict", lambda X: calls.append(len(X)) or np.zeros(len(X)))
+    monkeypatch.setattr(production_models.Config, "TREE_COMPILED_MAX_ROWS", 8)
+    X = np.random.default_rng(1).normal(size=(9, FEATURE_COUNT))
+
+    predictor._predict("random_forest", predictor.models["random_forest"], X[:8])
+    large = predictor._predict("random_forest", predictor.models["random_forest"], X)
+
+    assert calls == [8]
+    np.testing.assert_array_equal(large, predictor.models["random_forest"].predict(X))
+
+def test_batch_scoring_runs_off_the_event_loop(production_models, models_dir, monkeypatch):
+    write_fitted_models(models_dir)
+    predictor = production_models.ProductionFeePredictor()
+    score_batch = predictor._score_batch
+    threads = []
+    def recording_score_batch(*args):
+        threads.append(threading.get_ident())
+        return score_batch(*args)
+    monkeypatch.setattr(predictor, "_score_batch", recording_score_batch)
+
+    async def run():
+        return threading.get_ident(), await predictor.predict_batch({"gas_price_gwei": [20, 40, 80]}, MARKET_DATA)
+
+    loop_thread, result = asyncio.run(run())
+
+    assert result["count"] == 3
+    assert threads and threads[0] != loop_thread
+
+def test_batch_endpoint_is_unavailable_until_models_are_trained(production_models, models_dir, monkeypatch):
+    import main
+    from model_loader import ModelLoader
+    loader = ModelLoader("production_models")  # already imported by the fixture
+    asyncio.run(loader.wait())
+    monkeypatch.setattr(main, "model_loader", loader)
+    monkeypatch.setattr(production_models.production_fee_predictor, "is_trained", False)
+    monkeypatch.setattr(production_models.production_fee_predictor, "train_models", lambda *args: pytest.fail("trained inline"))
+
+    response = TestClient(main.app).post("/recommend-fee/batch", json={"scenarios": {"gas_price_gwei": [20, 40]}})
+
+    assert response.status_code == 503
+    with pytest.raises(production_models.ModelsNotTrainedError):
+        asyncio.run(production_models.production_fee_predictor.predict_batch({"gas_price_gwei": [20]}, MARKET_DATA))
+
+def test_live_features_use_history_once_it_covers_the_minimum(production_models, monkeypatch):
+    from timeseries import TimeSeriesStore
+    store = TimeSeriesStore(resolution=300, retention=7 * 24 * 3600)
+    monkeypatch.setattr(production_models, "timeseries_store", store)
+    monkeypatch.setattr(production_models.Config, "TIMESERIES_MIN_HISTORY", 3600)
+    predictor = production_models.production_fee_predictor
+    start = 1_700_000_100.0
+
+    store.record("TESTCOIN", start, price=10.0, volume=1e8, volatility=2.0)
+    approximated = predictor._extract_features_from_market_data(MARKET_DATA).iloc[0]
+    for bucket in range(1, 13):  # 12 more buckets: exactly one hour of history
+        store.record("TESTCOIN", start + bucket * 300, price=11.0 if bucket == 12 else 10.0)
+    from_history = predictor._extract_features_from_market_data(MARKET_DATA).iloc[0]
+
+    assert approximated["price_change_1h"] == pytest.approx(1.5 * 0.08)
+    assert approximated["volume_ma_7d"] == pytest.approx(2.5e8 * 0.92)
+    assert approximated["volatility_ma_7d"] == pytest.approx(4.0 * 1.08)
+    assert from_history["price_change_1h"] == pytest.approx(10.0)
+    assert from_history["volume_ma_7d"] == pytest.approx(1e8)
+    assert from_history["volatility_ma_7d"] == pytest.approx(2.0)
+    assert from_history["volume_ratio"] == pytest.approx(2.5)
+    assert from_history["price_momentum"] == pytest.approx(1.5 * (1 + 4.0 / 20))
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the snapshot-fed server-sent event streams
+"""
+import asyncio
+import json
+
+from market_snapshot import MarketSnapshotStore
+from push_stream import KEEPALIVE, Broadcaster, SnapshotStreamProducer
+
+def parse(frame):
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+def test_slow_subscribers_only_get_the_latest_change():
+    async def run():
+        broadcaster = Broadcaster("market")
+        fast = broadcaster.stream(heartbeat=0.05)
+        slow = broadcaster.stream(heartbeat=0.05)
+
+        frames = []
+        for price in (1, 2, 2, 3):
+            if broadcaster.publish(json.dumps({"price": price}).encode()):
+                frames.append(await fast.__anext__())
+        slow_frame = await slow.__anext__()
+        keepalive = await slow.__anext__()
+
+        await fast.aclose()
+        await slow.aclose()
+        return broadcaster, frames, slow_frame, keepalive
+
+    broadcaster, frames, slow_frame, keepalive = asyncio.run(run())
+
+    assert [parse(frame)[1]["price"] for frame in frames] == [1, 2, 3]
+    assert parse(slow_frame) == ("market", {"price": 3})
+    assert keepalive == KEEPALIVE
+    assert broadcaster.stats["unchanged"] == 1
+    assert broadcaster.stats["dropped"] == 2
+    assert broadcaster.subscriber_count == 0
+
+def test_producer_encodes_each_snapshot_once_for_all_subscribers():
+    calls = []
+
+    async def encode(snapshot):
+        calls.append(snapshot.version)
+        return json.dumps({"regime": snapshot.data["market_regime"]}).encode()
+
+    async def run():
+        store = MarketSnapshotStore()
+        producer = SnapshotStreamProducer(store)
+        producer.add_channel("market", encode)
+        producer.start()
+
+        store.publish({"market_regime": "stable"}, {})
+        clients = [producer.stream("market") for _ in range(3)]
+        first = await asyncio.gather(*(client.__anext__() for client in clients))
+
+        store.publish({"market_regime": "volatile"}, {})
+        second = await asyncio.gather(*(client.__anext__() for client in clients))
+
+        # A reconnecting client that already has the latest message is not sent it again
+        resumed = producer.stream("market", last_event_id=parse_id(second[0]))
+        store.publish({"market_regime": "volatile"}, {})
+        await asyncio.sleep(0.05)
+        for client in clients + [resumed]:
+            await client.aclose()
+        await producer.stop()
+        return producer, first, second
+
+    def parse_id(frame):
+        return dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))["id"]
+
+    producer, first, second = asyncio.run(run())
+
+    assert [parse(frame)[1] for frame in first] == [{"regime": "stable"}] * 3
+    assert [parse(frame)[1] for frame in second] == [{"regime": "volatile"}] * 3
+    assert calls == [1, 2, 3]
+    assert producer.channels["market"][0].stats == {"published": 2, "unchanged": 1, "dropped": 0}
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
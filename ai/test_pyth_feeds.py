@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the Pyth feed registry and batch price fetching against a local Hermes stand-in
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+import aiohttp
+from aiohttp import web
+
+from config import Config
+from pyth_feeds import PythFeedRegistry, fetch_latest_prices
+
+FEEDS = [
+    {"id": "0xaa", "attributes": {"base": "AVAX", "quote_currency": "USD"}},
+    {"id": "bb", "attributes": {"base": "BTC", "quote_currency": "USD"}},
+    {"id": "cc", "attributes": {"base": "ETH", "quote_currency": "USD"}},
+]
+PRICES = {
+    "aa": {"price": "3512345678", "conf": "1234567", "expo": -8, "publish_time": 1700000000},
+    "bb": {"price": "6500000000000", "conf": "2000000000", "expo": -8, "publish_time": 1700000000},
+    "cc": {"price": "350000000000", "conf": "100000000", "expo": -8, "publish_time": 1700000000},
+}
+
+class HermesStandIn:
+    """Minimal local Hermes server that records every request it serves"""
+
+    def __init__(self):
+        self.requests = []
+        self.app = web.Application()
+        self.app.router.add_get("/v2/price_feeds", self.price_feeds)
+        self.app.router.add_get("/v2/updates/price/latest", self.latest)
+
+    async def price_feeds(self, request):
+        self.requests.append(("price_feeds", {}))
+        return web.json_response(FEEDS)
+
+    async def latest(self, request):
+        ids = request.query.getall("ids[]", [])
+        self.requests.append(("latest", ids))
+        parsed = [{"id": feed_id, "price": PRICES[feed_id]} for feed_id in ids if feed_id in PRICES]
+        return web.json_response({"parsed": parsed})
+
+def test_registry_resolves_once_and_persists(monkeypatch, local_server):
+    """Feed ids are downloaded once, written to disk and reloaded without network"""
+    async def run(path):
+        hermes = HermesStandIn()
+        async with local_server(hermes.app) as url:
+            monkeypatch.setattr(Config, "PYTH_HERMES_URL", url)
+            async with aiohttp.ClientSession() as session:
+                registry = PythFeedRegistry(path=path, refresh_interval=3600)
+                first = await registry.resolve(session, ["AVAX/USD", "BTC/USD"])
+                second = await registry.resolve(session, ["avax/usd"])
+
+                reloaded = PythFeedRegistry(path=path, refresh_interval=3600)
+                third = await reloaded.resolve(session, ["ETH/USD"])
+            return hermes.requests, first, second, third
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pyth_feeds.json")
+        requests, first, second, third = asyncio.run(run(path))
+
+        assert [name for name, _ in requests] == ["price_feeds"]
+        assert first["AVAX/USD"]["id"] == "aa"
+        assert second["AVAX/USD"]["id"] == "aa"
+        assert third["ETH/USD"]["id"] == "cc"
+        with open(path) as f:
+            assert set(json.load(f)["feeds"]) == {"AVAX/USD", "BTC/USD", "ETH/USD"}
+
+def test_batch_fetch_uses_single_request(monkeypatch, local_server):
+    """Prices for several symbols come back from one ids[] request"""
+    async def run():
+        hermes = HermesStandIn()
+        async with local_server(hermes.app) as url:
+            monkeypatch.setattr(Config, "PYTH_HERMES_URL", url)
+            async with aiohttp.ClientSession() as session:
+                feeds = {
+                    "AVAX/USD": {"id": "aa", "base": "AVAX", "quote": "USD"},
+                    "BTC/USD": {"id": "bb", "base": "BTC", "quote": "USD"},
+                    "ETH/USD": {"id": "cc", "base": "ETH", "quote": "USD"},
+                }
+                prices = await fetch_latest_prices(session, feeds)
+            return hermes.requests, prices
+
+    requests, prices = asyncio.run(run())
+
+    assert requests == [("latest", ["aa", "bb", "cc"])]
+    assert abs(prices["AVAX/USD"]["price"] - 35.12345678) < 1e-9
+    assert abs(prices["BTC/USD"]["price"] - 65000.0) < 1e-6
+    assert prices["ETH/USD"]["feed_id"] == "cc"
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
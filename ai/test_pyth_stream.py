@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the Pyth Hermes SSE subscriber against a local SSE stand-in server
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+from aiohttp import web
+
+from config import Config
+from pyth_feeds import PythFeedRegistry
+from pyth_stream import PythPriceStream
+from test_pyth_feeds import HermesStandIn, PRICES
+
+class StreamingHermesStandIn(HermesStandIn):
+    """Hermes stand-in that also serves a short SSE price stream per connection"""
+
+    def __init__(self, events_per_connection: int = 2):
+        super().__init__()
+        self.events_per_connection = events_per_connection
+        self.stream_connections = 0
+        self.app.router.add_get("/v2/updates/price/stream", self.stream)
+
+    async def stream(self, request):
+        ids = request.query.getall("ids[]", [])
+        self.stream_connections += 1
+        connection = self.stream_connections
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        for i in range(self.events_per_connection):
+            parsed = []
+            for feed_id in ids:
+                price = dict(PRICES[feed_id])
+                # Encode the connection and event number in the price so the test can see progress
+                price["price"] = str(int(price["price"]) + connection * 100 + i)
+                parsed.append({"id": feed_id, "price": price})
+            await response.write(f"data: {json.dumps({'parsed': parsed})}\n\n".encode())
+            await asyncio.sleep(0.01)
+
+        # Close the connection to force the subscriber to reconnect
+        return response
+
+def test_stream_updates_latest_prices_and_reconnects(monkeypatch, local_server):
+    """Pushed events update the latest-price table and dropped streams are re-established"""
+    updates = []
+
+    async def run(path):
+        hermes = StreamingHermesStandIn()
+        async with local_server(hermes.app) as url:
+            monkeypatch.setattr(Config, "PYTH_HERMES_URL", url)
+            registry = PythFeedRegistry(path=path)
+            stream = PythPriceStream(["AVAX/USD", "BTC/USD"], registry=registry, max_age=5, max_backoff=0.05)
+            stream.add_listener(lambda symbol, data: updates.append(symbol))
+
+            stream.start()
+            for _ in range(200):
+                if hermes.stream_connections >= 2 and stream.stats["messages"] >= 8:
+                    break
+                await asyncio.sleep(0.02)
+            await stream.stop()
+            return hermes, stream
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hermes, stream = asyncio.run(run(os.path.join(tmp, "pyth_feeds.json")))
+
+    assert hermes.stream_connections >= 2
+    assert stream.stats["connects"] >= 2
+    assert not stream.running
+
+    avax = stream.get_price("avax/usd")
+    assert avax is not None
+    assert avax["data_source"] == "pyth_stream"
+    assert avax["price"] > 35.12345678
+    assert stream.get_price("BTC/USD") is not None
+    assert updates.count("AVAX/USD") >= 4
+
+def test_stale_stream_prices_are_not_served():
+    """Prices older than max_age are treated as missing"""
+    stream = PythPriceStream(["AVAX/USD"], max_age=0)
+    stream.latest["AVAX/USD"] = {"price": 1.0}
+    stream.updated_at["AVAX/USD"] = 0.0
+
+    assert stream.get_price("AVAX/USD") is None
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
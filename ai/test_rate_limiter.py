@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-upstream rate limiter and request scheduler
+"""
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from rate_limiter import (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RequestScheduler,
+                          UpstreamLimiter, background_priority, parse_retry_after)
+
+def test_interactive_requests_jump_ahead_of_background():
+    """Queued interactive waiters are served before background waiters queued earlier"""
+    order = []
+
+    async def run():
+        limiter = UpstreamLimiter("test", rate=50, burst=1)
+        await limiter.acquire()  # drain the bucket so everything below queues
+
+        async def waiter(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        background = [asyncio.create_task(waiter(f"bg{i}", PRIORITY_BACKGROUND)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(waiter("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.gather(*background, interactive)
+        return limiter.get_stats()
+
+    stats = asyncio.run(run())
+
+    assert order[0] == "interactive"
+    assert stats["granted"] == 5
+    assert stats["max_queue_depth"] == 4
+    assert stats["avg_wait_ms"]["background"] > stats["avg_wait_ms"]["interactive"] > 0
+
+def test_background_priority_context_is_inherited():
+    """Tasks created inside background_priority() queue as background work"""
+    async def run():
+        limiter = UpstreamLimiter("test", rate=100, burst=1)
+        await limiter.acquire()
+        with background_priority():
+            await asyncio.create_task(limiter.acquire())
+        return limiter.stats["waits"]
+
+    waits = asyncio.run(run())
+    assert waits == {"interactive": 1, "background": 1}
+
+def test_throttling_halves_rate_and_recovers():
+    """A 429 halves the refill rate; successes recover it additively"""
+    limiter = UpstreamLimiter("test", rate=10, burst=5)
+    delay = limiter.on_throttled(retry_after=None)
+
+    assert limiter.rate == 5
+    assert delay == 2.0
+    assert limiter.blocked_until > time.monotonic()
+
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 10
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_request_retries_after_retry_after(local_server):
+    """A 429 with a short Retry-After is retried once the upstream allows it"""
+    async def run():
+        calls = []
+
+        async def handler(request):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return web.Response(status=429, headers={"Retry-After": "0.2"})
+            return web.json_response({"ok": True})
+
+        app = web.Application()
+        app.router.add_get("/", handler)
+
+        scheduler = RequestScheduler(limits={"upstream": 100}, bursts={"upstream": 5}, enabled=True)
+        async with local_server(app) as url:
+            async with aiohttp.ClientSession() as session:
+                async with scheduler.request(session, "upstream", "GET", url) as response:
+                    status = response.status
+                    body = await response.json()
+        return calls, status, body, scheduler.get_stats()
+
+    calls, status, body, stats = asyncio.run(run())
+
+    assert status == 200 and body == {"ok": True}
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.19
+    assert stats["upstreams"]["upstream"]["throttled"] == 1
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched JSON-RPC client and network stats against a local RPC stand-in
+"""
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+from config import Config
+from data_pipeline import OracleDataPipeline, cache
+from rpc_client import JsonRpcBatchClient, JsonRpcError
+
+RESULTS = {
+    "eth_blockNumber": "0x10",
+    "eth_gasPrice": "0x5d21dba00",  # 25 gwei
+    "eth_feeHistory": {
+        "oldestBlock": "0xe",
+        "baseFeePerGas": ["0x3b9aca00", "0x3b9aca00", "0x77359400"],  # 1, 1, 2 gwei
+        "gasUsedRatio": [0.5, 0.7],
+        "reward": [["0x1", "0x3b9aca00", "0x77359400"], ["0x1", "0x3b9aca00", "0xb2d05e00"]]
+    },
+    "eth_getBlockByNumber": {"number": "0x10", "gasUsed": "0x7a1200", "gasLimit": "0xf42400"}  # 8M / 16M
+}
+
+class RpcStandIn:
+    """Minimal local JSON-RPC node that records every HTTP request body"""
+
+    def __init__(self, failing_methods=()):
+        self.requests = []
+        self.failing_methods = set(failing_methods)
+        self.app = web.Application()
+        self.app.router.add_post("/", self.rpc)
+
+    async def rpc(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        replies = []
+        # Answer in reverse order to check replies are matched by id
+        for call in reversed(body):
+            if call["method"] in self.failing_methods:
+                replies.append({"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32601, "message": "method not found"}})
+            else:
+                replies.append({"jsonrpc": "2.0", "id": call["id"], "result": RESULTS[call["method"]]})
+        return web.json_response(replies)
+
+def test_batch_returns_results_in_call_order(local_server):
+    """All calls go out in one POST and per-call errors stay in their slot"""
+    async def run():
+        node = RpcStandIn(failing_methods=["eth_feeHistory"])
+        async with local_server(node.app) as url:
+            async with aiohttp.ClientSession() as session:
+                client = JsonRpcBatchClient(session, url=url)
+                results = await client.batch([("eth_blockNumber", []), ("eth_feeHistory", [1, "latest", []]), ("eth_gasPrice", [])])
+            return node.requests, results
+
+    requests, results = asyncio.run(run())
+
+    assert len(requests) == 1
+    assert [call["method"] for call in requests[0]] == ["eth_blockNumber", "eth_feeHistory", "eth_gasPrice"]
+    assert results[0] == "0x10"
+    assert isinstance(results[1], JsonRpcError)
+    assert results[2] == "0x5d21dba00"
+
+def test_network_stats_from_single_batch(monkeypatch, local_server):
+    """Network stats carry fee history and utilization metrics from one round trip"""
+    async def run():
+        node = RpcStandIn()
+        async with local_server(node.app) as url:
+            monkeypatch.setattr(Config, "AVALANCHE_RPC_URL", url)
+            async with OracleDataPipeline() as pipeline:
+                stats = await pipeline._fetch_avalanche_network_stats("test_avalanche_stats")
+            return node.requests, stats
+
+    requests, stats = asyncio.run(run())
+    cache.clear()
+
+    assert len(requests) == 1
+    assert stats["block_number"] == 16
+    assert stats["gas_price_gwei"] == 25
+    assert stats["base_fee_gwei"] == 2
+    assert abs(stats["avg_gas_used_ratio"] - 0.6) < 1e-9
+    assert stats["block_utilization"] == 0.5
+    assert stats["priority_fee_percentiles_gwei"]["p50"] == 1
+    assert stats["priority_fee_percentiles_gwei"]["p75"] == 3
+    # 0.6 * 0.6 + 0.2 * 0.5 + 0.2 * 1.0 (base fee doubled)
+    assert stats["congestion_score"] == 66.0
+    assert stats["network_congestion"] == "high"
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite shared cache backend used across worker processes
+"""
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from data_pipeline import DataCache, OracleDataPipeline
+from shared_cache import SQLiteCacheBackend
+
+def make_workers(path, count=2, **kwargs):
+    """Caches that only share the SQLite file, like separate gunicorn workers"""
+    return [DataCache(backend=SQLiteCacheBackend(path=path), **kwargs) for _ in range(count)]
+
+def test_one_workers_set_serves_the_other():
+    with tempfile.TemporaryDirectory() as tmp:
+        worker_a, worker_b = make_workers(os.path.join(tmp, "cache.db"))
+
+        worker_a.set("coingecko:avalanche-2", {"price_usd": 35.1})
+
+        assert worker_b.get("coingecko:avalanche-2") == {"price_usd": 35.1}
+        assert worker_b.get_stats()["namespaces"]["coingecko"]["shared_hits"] == 1
+        # Second read is served from the worker's own LRU
+        assert worker_b.get("coingecko:avalanche-2") == {"price_usd": 35.1}
+        assert worker_b.backend.stats["read_hits"] == 1
+
+def test_expired_local_copy_picks_up_newer_shared_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        worker_a, worker_b = make_workers(os.path.join(tmp, "cache.db"), ttl=0.05)
+
+        worker_b.set("pyth:AVAX/USD", {"price": 1})
+        time.sleep(0.06)
+        worker_a.set("pyth:AVAX/USD", {"price": 2})
+
+        assert worker_b.get("pyth:AVAX/USD") == {"price": 2}
+
+def test_older_write_does_not_replace_newer_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteCacheBackend(path=os.path.join(tmp, "cache.db"))
+        backend.set("avalanche_stats", '{"block_number": 2}', stored_at=200.0)
+        backend.set("avalanche_stats", '{"block_number": 1}', stored_at=100.0)
+
+        assert backend.get("avalanche_stats") == ('{"block_number": 2}', 200.0)
+
+def test_leases_are_exclusive_until_released_or_expired():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        backend_a = SQLiteCacheBackend(path=path, lease_ttl=0.1)
+        backend_b = SQLiteCacheBackend(path=path, lease_ttl=0.1)
+
+        assert backend_a.try_lease("coingecko_global")
+        assert not backend_b.try_lease("coingecko_global")
+        backend_a.release_lease("coingecko_global")
+        assert backend_b.try_lease("coingecko_global")
+
+        # A crashed holder's lease is taken over once it expires
+        time.sleep(0.15)
+        assert backend_a.try_lease("coingecko_global")
+
+def test_slow_shared_read_does_not_block_local_hits():
+    with tempfile.TemporaryDirectory() as tmp:
+        release = threading.Event()
+
+        class SlowBackend(SQLiteCacheBackend):
+            def get(self, key):
+                release.wait(5)
+                return super().get(key)
+
+        cache = DataCache(backend=SlowBackend(path=os.path.join(tmp, "cache.db")))
+        cache.set("pyth:AVAX/USD", {"price": 35})
+        reader = threading.Thread(target=cache.get, args=("coingecko:avalanche-2",))
+        reader.start()
+        time.sleep(0.05)  # the reader is now inside the backend read
+
+        started = time.perf_counter()
+        local = cache.get("pyth:AVAX/USD")
+        elapsed = time.perf_counter() - started
+        release.set()
+        reader.join()
+
+        assert local == {"price": 35}
+        assert elapsed < 0.5
+
+def test_busy_database_is_waited_on_briefly():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        backend = SQLiteCacheBackend(path=path, busy_timeout=0.05)
+        backend.set("avalanche_stats", '{"block_number": 1}', stored_at=100.0)
+        other_worker = sqlite3.connect(path, isolation_level=None)
+        other_worker.execute("BEGIN IMMEDIATE")  # holds the write lock
+
+        started = time.perf_counter()
+        backend.set("avalanche_stats", '{"block_number": 2}', stored_at=200.0)
+        elapsed = time.perf_counter() - started
+        other_worker.rollback()
+        other_worker.close()
+
+        assert elapsed < 1
+        assert backend.stats["errors"] == 1
+        # WAL readers are not blocked by the writer
+        assert backend.get("avalanche_stats") == ('{"block_number": 1}', 100.0)
+
+def test_lease_under_write_contention_is_denied_not_granted():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        backend = SQLiteCacheBackend(path=path, busy_timeout=0.05)
+        backend.get("coingecko_global")  # creates the tables
+        other_worker = sqlite3.connect(path, isolation_level=None)
+        other_worker.execute("BEGIN IMMEDIATE")
+
+        granted = backend.try_lease("coingecko_global")
+        other_worker.rollback()
+        other_worker.close()
+
+        assert granted is False
+        assert backend.stats["leases_denied"] == 1 and backend.stats["errors"] == 0
+        assert backend.try_lease("coingecko_global")
+
+def test_backend_sweep_runs_outside_the_cache_lock():
+    with tempfile.TemporaryDirectory() as tmp:
+        lock_free_during_sweep = []
+
+        class RecordingBackend(SQLiteCacheBackend):
+            def delete_older_than(self, cutoff):
+                # Another thread can take the cache lock while the backend is swept
+                acquired = []
+                def probe():
+                    if cache._lock.acquire(timeout=0.5):
+                        cache._lock.release()
+                        acquired.append(True)
+                thread = threading.Thread(target=probe)
+                thread.start()
+                thread.join()
+                lock_free_during_sweep.append(bool(acquired))
+                return super().delete_older_than(cutoff)
+
+        cache = DataCache(backend=RecordingBackend(path=os.path.join(tmp, "cache.db")), sweep_interval=0)
+        cache.set("pyth:AVAX/USD", {"price": 35})
+        cache.get("coingecko:avalanche-2")
+        cache.sweep()
+
+        assert lock_free_during_sweep and all(lock_free_during_sweep)
+
+def test_waiting_worker_uses_lease_holders_result(monkeypatch):
+    """A worker that cannot take the lease returns the holder's result instead of fetching"""
+    import data_pipeline
+
+    with tempfile.TemporaryDirectory() as tmp:
+        worker_a, worker_b = make_workers(os.path.join(tmp, "cache.db"))
+        monkeypatch.setattr(data_pipeline, "cache", worker_b)
+        upstream_calls = []
+
+        async def fetcher(cache_key):
+            upstream_calls.append(cache_key)
+            return {"fetched_by": "b"}
+
+        async def worker_a_fetch():
+            assert worker_a.try_lease("coingecko_global")
+            await asyncio.sleep(0.2)
+            worker_a.set("coingecko_global", {"fetched_by": "a"})
+            worker_a.release_lease("coingecko_global")
+
+        async def run():
+            holder = asyncio.create_task(worker_a_fetch())
+            await asyncio.sleep(0.01)
+            result = await OracleDataPipeline()._cached_fetch("coingecko_global", fetcher)
+            await holder
+            return result
+
+        result = asyncio.run(run())
+
+    assert result == {"fetched_by": "a"}
+    assert upstream_calls == []
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
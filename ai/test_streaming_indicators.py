@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental streaming indicators
+"""
+import numpy as np
+
+from benchmark_indicators import make_sparklines
+from indicators import compute_indicators
+from streaming_indicators import IndicatorTracker, RollingVolatility, StreamingIndicators
+
+HOUR = 3600.0
+NOW = 1_700_000_000.0  # on an hour boundary
+
+def test_rolling_volatility_matches_numpy_over_window():
+    rng = np.random.default_rng(3)
+    values = rng.normal(0, 1, size=300)
+    rolling = RollingVolatility(window=50)
+    for value in values:
+        rolling.update(value)
+
+    assert abs(rolling.value() - np.std(values[-50:])) < 1e-9
+    assert abs(rolling.value(pending=2.5) - np.std(np.append(values[-49:], 2.5))) < 1e-9
+
+def test_seeded_tracker_matches_batch_indicators():
+    """Right after seeding, live values equal a full recompute over the same sparkline"""
+    sparkline = make_sparklines(coins=1, points=168)["coin-0"]
+    tracker = IndicatorTracker("AVAX", bucket_seconds=HOUR, window=167)
+    tracker.seed(sparkline, now=NOW)
+
+    live = tracker.snapshot()
+    batch = compute_indicators({"AVAX": sparkline})["AVAX"]
+
+    for key in ("price_volatility_7d", "rsi_14", "rsi_14_wilder", "ema_24"):
+        assert abs(live[key] - batch[key]) < 1e-9, key
+    assert abs(live["volatility"] - abs((sparkline[-1] - sparkline[-25]) / sparkline[-25] * 100)) < 1e-9
+
+def test_ticks_roll_the_window_like_a_recompute():
+    """Ticks within a bucket move the provisional close; a new bucket commits it"""
+    sparkline = make_sparklines(coins=1, points=168)["coin-0"]
+    tracker = IndicatorTracker("AVAX", bucket_seconds=HOUR, window=167)
+    tracker.seed(sparkline, now=NOW)
+
+    tracker.update(sparkline[-1] * 1.01, timestamp=NOW + 60)
+    tracker.update(sparkline[-1] * 1.02, timestamp=NOW + 1800)  # close of the current bucket
+    tracker.update(sparkline[-1] * 0.99, timestamp=NOW + HOUR + 5)  # first tick of the next bucket
+
+    expected_series = sparkline[1:-1] + [sparkline[-1] * 1.02, sparkline[-1] * 0.99]
+    live = tracker.snapshot()
+    batch = compute_indicators({"AVAX": expected_series})["AVAX"]
+
+    assert abs(live["price_volatility_7d"] - batch["price_volatility_7d"]) < 1e-9
+    assert abs(live["rsi_14"] - batch["rsi_14"]) < 1e-9
+
+def test_registry_overlays_only_warm_symbols():
+    registry = StreamingIndicators(enabled=True)
+    sparkline = make_sparklines(coins=1, points=168)["coin-0"]
+
+    assert registry.overlay({"symbol": "AVAX", "rsi_14": 10.0})["rsi_14"] == 10.0
+
+    registry.observe("avax", sparkline[-1], sparkline)
+    registry.on_price_update("AVAX/USD", {"base": "AVAX", "price": sparkline[-1] * 1.05})
+
+    overlaid = registry.overlay({"symbol": "AVAX", "rsi_14": 10.0, "price_usd": 1.0})
+    assert overlaid["indicators_live"] is True
+    assert overlaid["rsi_14"] != 10.0
+    assert overlaid["price_usd"] == 1.0
+    assert registry.stats == {"ticks": 1, "seeds": 1}
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
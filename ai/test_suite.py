@@ -116,10 +116,11 @@ async def test_all_components():
     print("\n5️⃣ Testing API Logic...")
     try:
         # Test endpoint logic without HTTP
-        from main import market_data_cache, cache_timestamp
+        from main import snapshot_store
         
-        # Simulate cache test
-        print("✅ API cache logic working")
+        # Snapshot store is empty until the refresher publishes
+        print("✅ API snapshot logic working")
+        print(f"   - Snapshot status: {snapshot_store.get_status()['status']}")
         
         # Test configuration endpoint logic
         from config import Config
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory time-series ring buffers
+"""
+import numpy as np
+import pytest
+
+from timeseries import RingBuffer, TimeSeriesStore
+
+NOW = 1_700_000_100.0  # on a 5-minute boundary
+
+def test_running_sums_match_recomputed_windows():
+    rng = np.random.default_rng(2)
+    values = rng.lognormal(20, 1, size=500)  # volume-sized numbers
+    buffer = RingBuffer(capacity=100, windows=(12, 50, 100))
+
+    for value in values:
+        buffer.append(value)
+        buffer.replace_last(value * 1.5)
+        buffer.replace_last(value)
+
+    assert len(buffer) == 100
+    assert np.array_equal(buffer.to_numpy(), values[-100:])
+    for window in (12, 50, 100):
+        assert buffer.sum(window) == pytest.approx(values[-window:].sum(), rel=1e-12)
+    assert buffer.sum(7) == pytest.approx(values[-7:].sum(), rel=1e-12)
+    assert buffer.last(3) == values[-4]
+
+def test_series_carries_values_across_skipped_buckets():
+    store = TimeSeriesStore(resolution=300, retention=7 * 24 * 3600)
+
+    store.record("avax", timestamp=NOW, price=20.0, volume=100.0, volatility=2.0)
+    store.record("AVAX", timestamp=NOW + 120, price=21.0)  # same bucket, replaces the price
+    store.record("AVAX", timestamp=NOW + 3600, price=23.1, volume=200.0, volatility=4.0)
+    store.record("AVAX", timestamp=NOW + 60, price=1.0)  # late, ignored
+
+    series = store.get("avax")
+    assert len(series.buffers["price"]) == 13
+    assert series.history_seconds("volume") == 3600
+    assert series.change_pct("price", 3600) == pytest.approx(10.0)
+    assert series.change_pct("price", 7200) is None
+    # Twelve buckets at 100 carried forward, then 200
+    assert series.mean("volume", 3600) == pytest.approx((12 * 100 + 200) / 13)
+    assert series.mean("volatility", 7 * 24 * 3600) == pytest.approx((12 * 2 + 4) / 13)
+    assert len(series.buffers["gas"]) == 0
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        TimeSeriesStore().record("AVAX", price=1.0, liquidity=2.0)
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
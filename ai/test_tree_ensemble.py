@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the array-based tree ensemble evaluator
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
+from tree_ensemble import TreeEnsemble, compile_ensembles
+
+def make_data(rows, seed):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.lognormal(3, 2, rows),        # volume-like, wide range
+        rng.normal(0, 5, rows),           # price changes
+        rng.uniform(0, 24, rows).round(), # hour of day
+        rng.normal(size=(rows, 3))
+    ])
+    y = 0.3 + 0.01 * X[:, 1] + 0.001 * np.log(X[:, 0]) + 0.05 * np.sin(X[:, 2]) + rng.normal(0, 0.01, rows)
+    return X, y
+
+@pytest.fixture(scope="module")
+def fitted():
+    X, y = make_data(3000, seed=0)
+    return {
+        "random_forest": RandomForestRegressor(n_estimators=40, max_depth=12, min_samples_leaf=2,
+                                               max_features="sqrt", random_state=42, n_jobs=1).fit(X, y),
+        "gradient_boosting": GradientBoostingRegressor(n_estimators=40, max_depth=6, learning_rate=0.1,
+                                                       subsample=0.8, random_state=42).fit(X, y)
+    }
+
+@pytest.mark.parametrize("name", ["random_forest", "gradient_boosting"])
+def test_predictions_match_sklearn_bit_for_bit(fitted, name):
+    model = fitted[name]
+    ensemble = TreeEnsemble.from_sklearn(model)
+    X_held_out, _ = make_data(2000, seed=1)
+
+    expected = model.predict(X_held_out)
+    np.testing.assert_array_equal(ensemble.predict(X_held_out), expected)
+    # The single-row path accumulates in Python floats and must agree too
+    single = np.array([ensemble.predict(row)[0] for row in X_held_out[:100]])
+    np.testing.assert_array_equal(single, expected[:100])
+
+@pytest.mark.parametrize("name", ["random_forest", "gradient_boosting"])
+def test_inputs_on_and_next_to_split_thresholds(fitted, name):
+    """Rows sitting exactly on a threshold, and one float32 step either side, take sklearn's branch"""
+    model = fitted[name]
+    ensemble = TreeEnsemble.from_sklearn(model)
+    base, _ = make_data(1, seed=2)
+
+    rows = []
+    for estimator in (model.estimators_.ravel() if name == "gradient_boosting" else model.estimators_)[:5]:
+        tree = estimator.tree_
+        for node in np.flatnonzero(tree.children_left >= 0)[:20]:
+            at = np.float32(tree.threshold[node])
+            for value in (np.nextafter(at, np.float32(-np.inf)), at, np.nextafter(at, np.float32(np.inf))):
+                row = base[0].copy()
+                row[tree.feature[node]] = value
+                rows.append(row)
+    X_edges = np.array(rows)
+
+    np.testing.assert_array_equal(ensemble.predict(X_edges), model.predict(X_edges))
+
+def test_compile_skips_models_that_are_not_fitted(fitted):
+    compiled = compile_ensembles({**fitted, "unfitted": RandomForestRegressor(), "neural_network": None})
+    assert sorted(compiled) == ["gradient_boosting", "random_forest"]
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
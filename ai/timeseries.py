@@ -0,0 +1,197 @@
+"""
+In-memory time-series store for Aura AI Backend
+Fixed-resolution ring buffers per symbol with O(1) rolling sums for price, volume, volatility and gas
+"""
+import logging
+import time
+from array import array
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("price", "volume", "volatility", "gas")
+
+class RingBuffer:
+    """Fixed-capacity float ring buffer keeping running sums over a few window lengths
+
+    ``append`` and ``replace_last`` adjust every registered window sum in
+    O(1); the sums are recomputed from the stored values once per wrap of
+    the buffer so floating-point drift cannot accumulate.
+    """
+    __slots__ = ("capacity", "windows", "_values", "_head", "_count", "_sums")
+
+    def __init__(self, capacity: int, windows: Iterable[int] = ()):
+        self.capacity = capacity
+        self.windows = tuple(sorted({min(int(window), capacity) for window in windows if window > 0}))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0  # slot the next value is written to
+        self._count = 0
+        self._sums = dict.fromkeys(self.windows, 0.0)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slot(self, offset: int) -> int:
+        """Storage index of the value ``offset`` steps back from the newest"""
+        return (self._head - 1 - offset) % self.capacity
+
+    def last(self, offset: int = 0) -> Optional[float]:
+        """Newest value (``offset`` 0) or the one ``offset`` steps before it"""
+        if offset >= self._count:
+            return None
+        return self._values[self._slot(offset)]
+
+    def append(self, value: float):
+        for window in self.windows:
+            if self._count >= window:
+                self._sums[window] -= self._values[self._slot(window - 1)]
+            self._sums[window] += value
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        if self._head == 0:
+            self._resync()
+
+    def replace_last(self, value: float):
+        """Overwrite the newest value (the still-open bucket)"""
+        if not self._count:
+            self.append(value)
+            return
+        slot = self._slot(0)
+        delta = value - self._values[slot]
+        for window in self.windows:
+            self._sums[window] += delta
+        self._values[slot] = value
+
+    def _resync(self):
+        values = self.to_numpy()
+        for window in self.windows:
+            self._sums[window] = float(values[-window:].sum())
+
+    def sum(self, window: int) -> float:
+        """Sum of the newest ``window`` values (O(1) for registered windows)"""
+        window = min(window, self.capacity)
+        if window in self._sums:
+            return self._sums[window]
+        return float(self.to_numpy(window).sum())
+
+    def mean(self, window: int) -> Optional[float]:
+        count = min(window, self._count)
+        return self.sum(window) / count if count else None
+
+    def to_numpy(self, n: Optional[int] = None) -> np.ndarray:
+        """The newest ``n`` values (all by default), oldest first"""
+        n = self._count if n is None else min(n, self._count)
+        if not n:
+            return np.empty(0)
+        values = np.frombuffer(self._values, dtype=np.float64)
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return values[start:start + n].copy()
+        return np.concatenate((values[start:], values[:self._head]))
+
+class SymbolSeries:
+    """One ring buffer per field on a shared bucket grid
+
+    Observations inside the current bucket overwrite its value; moving to a
+    later bucket carries every field's last value forward across any skipped
+    buckets, so offsets from the newest value always map to the same times.
+    """
+    __slots__ = ("resolution", "buffers", "_bucket", "updated_at")
+
+    def __init__(self, resolution: float, capacity: int, windows: Iterable[int] = ()):
+        self.resolution = resolution
+        windows = tuple(windows)
+        self.buffers = {field: RingBuffer(capacity, windows) for field in FIELDS}
+        self._bucket: Optional[int] = None
+        self.updated_at = 0.0
+
+    def buckets(self, seconds: float) -> int:
+        return max(1, int(round(seconds / self.resolution)))
+
+    def record(self, timestamp: float, values: Dict[str, float]):
+        bucket = int(timestamp // self.resolution)
+        if self._bucket is not None and bucket < self._bucket:
+            return  # late observation for a bucket that is already closed
+        if self._bucket is not None and bucket > self._bucket:
+            for buffer in self.buffers.values():
+                if len(buffer):
+                    carried = buffer.last()
+                    for _ in range(min(bucket - self._bucket, buffer.capacity)):
+                        buffer.append(carried)
+        self._bucket = bucket
+
+        for field, value in values.items():
+            if value is None:
+                continue
+            buffer = self.buffers[field]
+            if len(buffer):
+                buffer.replace_last(float(value))
+            else:
+                buffer.append(float(value))
+        self.updated_at = timestamp
+
+    def history_seconds(self, field: str) -> float:
+        """Span covered by ``field``'s stored values"""
+        return max(len(self.buffers[field]) - 1, 0) * self.resolution
+
+    def mean(self, field: str, seconds: float) -> Optional[float]:
+        """Mean of ``field`` over the last ``seconds``, or over all history if shorter"""
+        return self.buffers[field].mean(self.buckets(seconds) + 1)
+
+    def change_pct(self, field: str, seconds: float) -> Optional[float]:
+        """Percentage change of ``field`` over ``seconds``; None without that much history"""
+        buffer = self.buffers[field]
+        previous = buffer.last(self.buckets(seconds))
+        if not previous:
+            return None
+        return (buffer.last() - previous) / previous * 100
+
+class TimeSeriesStore:
+    """Per-symbol recent history kept in memory so features never touch SQLite"""
+
+    def __init__(self, resolution: float = Config.TIMESERIES_RESOLUTION,
+                 retention: float = Config.TIMESERIES_RETENTION):
+        self.resolution = resolution
+        self.capacity = max(2, int(retention // resolution) + 1)
+        # O(1) rolling sums for the feature windows: 1h, 24h and the full retention
+        self.windows = tuple(int(round(seconds / resolution)) + 1 for seconds in (3600, 86400, retention))
+        self.series: Dict[str, SymbolSeries] = {}
+
+    def record(self, symbol: str, timestamp: Optional[float] = None, **values: Optional[float]):
+        """Record observations such as ``price=..., volume=...`` for ``symbol``"""
+        if not symbol:
+            return
+        unknown = set(values) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown time-series fields: {sorted(unknown)}")
+        symbol = symbol.upper()
+        series = self.series.get(symbol)
+        if series is None:
+            series = self.series[symbol] = SymbolSeries(self.resolution, self.capacity, self.windows)
+        series.record(time.time() if timestamp is None else timestamp, values)
+
+    def get(self, symbol: str) -> Optional[SymbolSeries]:
+        return self.series.get(symbol.upper()) if symbol else None
+
+    def on_price_update(self, symbol: str, price_data: Dict):
+        """Pyth stream listener: ``AVAX/USD`` ticks move the ``AVAX`` price series"""
+        self.record(price_data.get("base") or symbol.split("/")[0], price_data.get("publish_time"),
+                    price=price_data.get("price"))
+
+    def get_stats(self) -> Dict:
+        return {
+            "resolution": self.resolution,
+            "capacity": self.capacity,
+            "symbols": {
+                symbol: {field: len(buffer) for field, buffer in series.buffers.items()}
+                for symbol, series in self.series.items()
+            }
+        }
+
+# Global in-memory time-series store
+timeseries_store = TimeSeriesStore()
@@ -0,0 +1,159 @@
+"""
+Array-based tree ensemble evaluation for Aura AI Backend
+Flattens fitted RandomForestRegressor / GradientBoostingRegressor trees into contiguous node
+arrays and scores them without sklearn's per-call overhead, giving the same results bit for bit
+"""
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class TreeEnsemble:
+    """All trees of an ensemble as one set of node arrays
+
+    Node ``i`` splits on ``feature[i]`` at ``threshold[i]`` and continues to
+    ``children[2 * i]`` (x <= threshold) or ``children[2 * i + 1]``. Leaves
+    point to themselves, so walking every tree a fixed number of levels (the
+    deepest tree's depth) lands each row on its leaf.
+
+    sklearn casts inputs to float32 and compares them with float64
+    thresholds; the thresholds here are rounded down to float32, which
+    gives the same decision for every float32 input. Leaf values are
+    accumulated tree by tree in estimator order, so results match
+    ``predict`` bit for bit.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, depth: int, n_features: int,
+                 baseline: float = 0.0, average: bool = False):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+        self.baseline = baseline  # added before the first tree (the boosting init prediction)
+        self.average = average  # divide the sum by the number of trees (random forest)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "TreeEnsemble":
+        """Flatten a fitted single-output RandomForestRegressor or GradientBoostingRegressor"""
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output ensembles are supported")
+
+        if hasattr(model, "learning_rate"):
+            estimators = [stage[0] for stage in model.estimators_]
+            scale = model.learning_rate
+            baseline = _boosting_baseline(model)
+            average = False
+        else:
+            estimators = list(model.estimators_)
+            scale = None
+            baseline = 0.0
+            average = True
+
+        features, thresholds, children, values, roots = [], [], [], [], []
+        depth, offset = 0, 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left < 0
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            pairs = np.empty(2 * tree.node_count, dtype=np.int64)
+            pairs[0::2] = np.where(is_leaf, nodes, tree.children_left) + offset
+            pairs[1::2] = np.where(is_leaf, nodes, tree.children_right) + offset
+            children.append(pairs)
+            leaf_values = tree.value[:, 0, 0].astype(np.float64)
+            # sklearn adds ``learning_rate * value`` per stage; precomputing the product rounds the same way
+            values.append(scale * leaf_values if scale is not None else leaf_values)
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=_round_down_to_float32(np.concatenate(thresholds)),
+            children=np.concatenate(children).astype(np.int32),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            depth=depth,
+            n_features=model.n_features_in_,
+            baseline=baseline,
+            average=average
+        )
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node of every (tree, row), by level-wise traversal of all trees at once"""
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offsets = np.arange(n_rows, dtype=np.int32) * n_features
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.depth):
+            go_right = flat[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+        return nodes
+
+    def predict(self, X) -> np.ndarray:
+        """Predictions for every row of ``X``, equal to the sklearn model's ``predict``"""
+        X = self._validate(X)
+        leaf_values = self.value[self.leaves(X)]
+
+        if X.shape[0] == 1:
+            # Plain float additions in tree order: same rounding as sklearn, less overhead than NumPy for one row
+            total = self.baseline
+            for value in leaf_values[:, 0].tolist():
+                total += value
+            out = np.array([total])
+        else:
+            out = np.full(X.shape[0], self.baseline, dtype=np.float64)
+            for tree_values in leaf_values:
+                out += tree_values
+
+        if self.average:
+            out /= self.n_trees
+        return out
+
+    def _validate(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if not np.isfinite(X).all():
+            raise ValueError("Input contains NaN or infinity")
+        return X
+
+def _round_down_to_float32(threshold: np.ndarray) -> np.ndarray:
+    """Largest float32 <= each threshold: for float32 x, ``x <= t`` iff ``x <= result``"""
+    rounded = threshold.astype(np.float32)
+    over = rounded.astype(np.float64) > threshold
+    rounded[over] = np.nextafter(rounded[over], np.float32(-np.inf))
+    return rounded
+
+def _boosting_baseline(model) -> float:
+    """Raw prediction before the first stage (the ``init`` estimator's prediction, identity link)"""
+    if model.init_ == "zero":
+        return 0.0
+    baseline = np.ravel(model.init_.predict(np.zeros((1, model.n_features_in_), dtype=np.float32)))
+    return float(baseline[0])
+
+def compile_ensembles(models: dict, names: Optional[List[str]] = None) -> dict:
+    """TreeEnsemble for each fitted tree ensemble in ``models`` that can be flattened"""
+    compiled = {}
+    for name, model in models.items():
+        if (names is not None and name not in names) or model is None or not hasattr(model, "estimators_"):
+            continue
+        try:
+            compiled[name] = TreeEnsemble.from_sklearn(model)
+        except Exception as e:
+            logger.warning(f"Could not compile {name} for array evaluation, using sklearn predict: {e}")
+    return compiled